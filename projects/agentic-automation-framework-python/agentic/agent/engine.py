@@ -10,23 +10,27 @@ def load_workflow(file_path: str):
     return json.loads(Path(file_path).read_text())
 
 
+def notify_result(result: dict):
+    text = (
+        f"✅ [{result['name']}] Passed in {result['durationMs']}ms\nURL: {result.get('finalUrl','')}"
+        if result.get("ok")
+        else f"❌ [{result['name']}] Failed in {result['durationMs']}ms\nError: {result.get('error','')}"
+    )
+    try:
+        send_tg(CONFIG["telegram"]["token"], CONFIG["telegram"]["chat_id"], text)
+    except Exception:
+        pass
+    try:
+        send_wa(CONFIG["whatsapp"]["token"], CONFIG["whatsapp"]["phone_number_id"], CONFIG["whatsapp"]["to"], text)
+    except Exception:
+        pass
+
+
 def execute_workflow_file(file_path: str, notify=False):
     wf = load_workflow(file_path)
     result = run_workflow(wf, headless=CONFIG["headless"])
 
     if notify:
-        text = (
-            f"✅ [{result['name']}] Passed in {result['durationMs']}ms\nURL: {result.get('finalUrl','')}"
-            if result.get("ok")
-            else f"❌ [{result['name']}] Failed in {result['durationMs']}ms\nError: {result.get('error','')}"
-        )
-        try:
-            send_tg(CONFIG["telegram"]["token"], CONFIG["telegram"]["chat_id"], text)
-        except Exception:
-            pass
-        try:
-            send_wa(CONFIG["whatsapp"]["token"], CONFIG["whatsapp"]["phone_number_id"], CONFIG["whatsapp"]["to"], text)
-        except Exception:
-            pass
+        notify_result(result)
 
     return result
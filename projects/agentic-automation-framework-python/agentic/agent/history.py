@@ -1,4 +1,5 @@
 import json
+import time
 from pathlib import Path
 
 REPORTS = Path("reports")
@@ -48,3 +49,16 @@ def build_dashboard():
     """
     DASHBOARD.write_text(html)
     return str(DASHBOARD)
+
+
+def record_run(result: dict) -> str:
+    """Append one workflow result to the run history and rebuild the dashboard."""
+    append_history({
+        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "name": result.get("name"),
+        "ok": bool(result.get("ok")),
+        "durationMs": result.get("durationMs"),
+        "finalUrl": result.get("finalUrl", ""),
+        "error": result.get("error", ""),
+    })
+    return build_dashboard()
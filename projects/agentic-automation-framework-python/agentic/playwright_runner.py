@@ -4,43 +4,83 @@ from pathlib import Path
 from playwright.sync_api import sync_playwright
 
 
+def _run_step(page, step: dict):
+    action = step["action"]
+    if action == "click":
+        page.locator(step["selector"]).click()
+    elif action == "type":
+        page.locator(step["selector"]).fill(step.get("text", ""))
+    elif action == "waitFor":
+        page.locator(step["selector"]).wait_for(state=step.get("state", "visible"), timeout=step.get("timeout", 10000))
+    elif action == "expectUrlContains":
+        cur = page.url
+        if step["value"] not in cur:
+            raise AssertionError(f"URL assertion failed: expected '{step['value']}' in '{cur}'")
+    elif action == "screenshot":
+        out = Path(step.get("path", "reports/screenshot.png"))
+        out.parent.mkdir(parents=True, exist_ok=True)
+        page.screenshot(path=str(out), full_page=True)
+    else:
+        raise ValueError(f"Unsupported action: {action}")
+
+
+def run_workflow_on(browser, workflow: dict):
+    """Run a workflow in a fresh context of an already launched browser.
+
+    Lets callers keep one browser warm across many workflows; every step's
+    duration is reported under ``steps``.
+    """
+    started = time.time()
+    steps = []
+    context = None
+    try:
+        context = browser.new_context()
+        page = context.new_page()
+        for step in [{"action": "goto", "url": workflow["url"]}] + list(workflow.get("steps", [])):
+            t0 = time.perf_counter()
+            timing = {"action": step["action"], "target": step.get("selector") or step.get("url") or step.get("value"), "ok": False}
+            steps.append(timing)
+            if step["action"] == "goto":
+                page.goto(step["url"], wait_until="domcontentloaded")
+            else:
+                _run_step(page, step)
+            timing["ok"] = True
+            timing["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+
+        return {
+            "ok": True,
+            "name": workflow.get("name", "workflow"),
+            "durationMs": int((time.time() - started) * 1000),
+            "finalUrl": page.url,
+            "steps": steps,
+        }
+    except Exception as e:
+        if steps and "ms" not in steps[-1]:
+            steps[-1]["ms"] = round((time.perf_counter() - t0) * 1000, 1)
+        return {
+            "ok": False,
+            "name": workflow.get("name", "workflow"),
+            "durationMs": int((time.time() - started) * 1000),
+            "error": str(e),
+            "steps": steps,
+        }
+    finally:
+        if context is not None:
+            try:
+                context.close()
+            except Exception:
+                pass
+
+
 def run_workflow(workflow: dict, headless=True):
     started = time.time()
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=headless)
-            context = browser.new_context()
-            page = context.new_page()
-            page.goto(workflow["url"], wait_until="domcontentloaded")
-
-            for step in workflow.get("steps", []):
-                action = step["action"]
-                if action == "click":
-                    page.locator(step["selector"]).click()
-                elif action == "type":
-                    page.locator(step["selector"]).fill(step.get("text", ""))
-                elif action == "waitFor":
-                    page.locator(step["selector"]).wait_for(state=step.get("state", "visible"), timeout=step.get("timeout", 10000))
-                elif action == "expectUrlContains":
-                    cur = page.url
-                    if step["value"] not in cur:
-                        raise AssertionError(f"URL assertion failed: expected '{step['value']}' in '{cur}'")
-                elif action == "screenshot":
-                    out = Path(step.get("path", "reports/screenshot.png"))
-                    out.parent.mkdir(parents=True, exist_ok=True)
-                    page.screenshot(path=str(out), full_page=True)
-                else:
-                    raise ValueError(f"Unsupported action: {action}")
-
-            final_url = page.url
-            context.close()
-            browser.close()
-            return {
-                "ok": True,
-                "name": workflow.get("name", "workflow"),
-                "durationMs": int((time.time() - started) * 1000),
-                "finalUrl": final_url,
-            }
+            try:
+                return run_workflow_on(browser, workflow)
+            finally:
+                browser.close()
     except Exception as e:
         return {
             "ok": False,
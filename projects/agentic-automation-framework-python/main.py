@@ -9,7 +9,7 @@ from agentic.utils.logger import log, err
 from agentic.agent.engine import execute_workflow_file
 from agentic.agent.planner import generate_workflow
 from agentic.agent.claude_mode import run_claude_like
-from agentic.agent.history import build_dashboard, append_history
+from agentic.agent.history import build_dashboard, record_run
 from agentic.agent.queue import RunQueue
 from agentic.agent.memory import recent, relevant_lexical
 from agentic.agent.semantic_memory import relevant_semantic
@@ -25,15 +25,7 @@ def save_generated(wf, out):
 
 def run_once(workflow, notify=False):
     result = execute_workflow_file(workflow, notify=notify)
-    append_history({
-        "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-        "name": result.get("name"),
-        "ok": bool(result.get("ok")),
-        "durationMs": result.get("durationMs"),
-        "finalUrl": result.get("finalUrl", ""),
-        "error": result.get("error", ""),
-    })
-    d = build_dashboard()
+    d = record_run(result)
     log("Result", json.dumps(result, indent=2))
     log("Dashboard", d)
     return result
@@ -47,15 +39,7 @@ def listener():
         return execute_workflow_file(job["workflow"], notify=True)
 
     def on_result(result, job):
-        append_history({
-            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-            "name": result.get("name"),
-            "ok": bool(result.get("ok")),
-            "durationMs": result.get("durationMs"),
-            "finalUrl": result.get("finalUrl", ""),
-            "error": result.get("error", ""),
-        })
-        build_dashboard()
+        record_run(result)
         text = f"✅ {result.get('name')} passed in {result.get('durationMs')}ms" if result.get("ok") else f"❌ {result.get('name')} failed: {result.get('error')}"
         try:
             send_message(CONFIG["telegram"]["token"], job["chat_id"], text)
@@ -235,11 +235,13 @@ Action:
 
 
 def cmd_run(args):
-    env = None
+    import os
+    env = os.environ.copy()
     if args.email_mode:
-        import os
-        env = os.environ.copy()
         env["EMAIL_MODE"] = args.email_mode
+    env["ETLQ_RUNNER"] = args.runner
+    if args.workers:
+        env["ETLQ_WORKERS"] = str(args.workers)
 
     test_res = run_cmd(["python3", "scripts/run_and_email.py"], env=env)
 
@@ -276,6 +278,8 @@ def main():
     run.add_argument("--brand", default="ETLQ")
     run.add_argument("--pdf", action="store_true", help="Try exporting executive report to PDF")
     run.add_argument("--cio-email", action="store_true", help="Generate one-page CIO summary artifact")
+    run.add_argument("--runner", default="native", choices=["native", "pytest"], help="In-process parallel runner or pytest subprocess")
+    run.add_argument("--workers", type=int, default=None, help="Parallel adapter connections for the native runner (default: CPU count)")
     run.set_defaults(func=cmd_run)
 
     args = ap.parse_args()
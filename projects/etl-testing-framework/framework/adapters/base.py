@@ -1,8 +1,12 @@
+import re
 from abc import ABC, abstractmethod
 from typing import Any, List, Dict
 
 
 class DBAdapter(ABC):
+    # Engine-specific SQL whose result depends on the clock or chance, never served from the query cache.
+    VOLATILE_SQL: re.Pattern | None = None
+
     @abstractmethod
     def scalar(self, sql: str) -> Any:
         raise NotImplementedError
@@ -14,3 +18,13 @@ class DBAdapter(ABC):
     @abstractmethod
     def table_schema(self, table: str) -> List[Dict[str, Any]]:
         raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # Query result caching (framework/adapters/query_cache.py) needs both of these.
+    def cache_identity(self) -> str | None:
+        return None
+
+    def data_version(self) -> str | None:
+        return None
@@ -0,0 +1,102 @@
+import glob
+import hashlib
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .base import DBAdapter
+
+_READERS = {
+    "parquet": "read_parquet('{path}', hive_partitioning = true, union_by_name = true)",
+    "csv": "read_csv_auto('{path}', hive_partitioning = true, union_by_name = true)",
+}
+
+
+def _source_spec(name: str, spec) -> Dict[str, str]:
+    if isinstance(spec, str):
+        spec = {"path": spec}
+    path = spec["path"]
+    fmt = spec.get("format") or ("csv" if path.lower().endswith((".csv", ".tsv", ".csv.gz")) else "parquet")
+    if fmt not in _READERS:
+        raise ValueError(f"Unsupported source format for {name}: {fmt} (expected parquet or csv)")
+    return {"path": path, "format": fmt}
+
+
+class DuckDBAdapter(DBAdapter):
+    """DuckDB connection with local Parquet/CSV globs attached as views.
+
+    ``sources`` maps a view name to a glob (format from the extension) or to
+    ``{path, format}``. Queries run on DuckDB's parallel vectorized engine;
+    ``threads`` caps its worker threads per connection.
+    """
+
+    VOLATILE_SQL = re.compile(
+        r"\b(now|today|get_current_timestamp|get_current_time|current_localtimestamp|current_localtime"
+        r"|transaction_timestamp|uuid|gen_random_uuid|setseed|nextval|currval)\s*\(",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, database_path: str = ":memory:", sources: Dict[str, Any] | None = None, read_only: bool = False, threads: int | None = None):
+        try:
+            import duckdb
+        except ImportError as e:
+            raise ImportError("adapter.kind duckdb requires the duckdb package (pip install duckdb)") from e
+
+        self.database_path = database_path
+        self.sources = {name: _source_spec(name, spec) for name, spec in (sources or {}).items()}
+        in_memory = database_path in ("", ":memory:")
+        # A read-only database file still accepts TEMP views, so the pool never takes a write lock.
+        self.conn = duckdb.connect(":memory:" if in_memory else database_path, read_only=read_only and not in_memory)
+        if threads:
+            self.conn.execute(f"SET threads = {int(threads)}")
+        view = "TEMP VIEW" if read_only and not in_memory else "VIEW"
+        for name, spec in self.sources.items():
+            reader = _READERS[spec["format"]].format(path=spec["path"].replace("'", "''"))
+            self.conn.execute(f'CREATE OR REPLACE {view} "{name}" AS SELECT * FROM {reader}')
+
+    def scalar(self, sql: str) -> Any:
+        row = self.conn.execute(sql).fetchone()
+        return None if row is None else row[0]
+
+    def rows(self, sql: str, limit: int = 20) -> List[Dict[str, Any]]:
+        cur = self.conn.execute(f"SELECT * FROM ({sql}) LIMIT {int(limit)}")
+        cols = [d[0] for d in cur.description]
+        return [dict(zip(cols, r)) for r in cur.fetchall()]
+
+    def table_schema(self, table: str) -> List[Dict[str, Any]]:
+        out = []
+        for name, col_type, null, key, *_ in self.conn.execute(f'DESCRIBE "{table}"').fetchall():
+            pk = key == "PRI"
+            out.append({"name": name, "type": col_type, "nullable": null == "YES" and not pk, "pk": pk})
+        return out
+
+    def close(self):
+        self.conn.close()
+
+    def _files(self) -> List[str]:
+        files = []
+        if self.database_path not in ("", ":memory:"):
+            files += [self.database_path, f"{self.database_path}.wal"]
+        for spec in self.sources.values():
+            files += sorted(glob.glob(spec["path"], recursive=True))
+        return files
+
+    def cache_identity(self) -> str:
+        spec = repr((str(Path(self.database_path).resolve()) if self.database_path not in ("", ":memory:") else ":memory:",
+                     sorted((n, s["path"], s["format"]) for n, s in self.sources.items())))
+        return f"duckdb:{hashlib.sha256(spec.encode()).hexdigest()}"
+
+    def data_version(self) -> str | None:
+        if self.database_path in ("", ":memory:") and not self.sources:
+            return None  # nothing on disk to version
+        if any("://" in s["path"] for s in self.sources.values()):
+            return None  # remote objects: no cheap change detection, never cache
+        h = hashlib.sha256()
+        for f in self._files():
+            try:
+                st = os.stat(f)
+            except FileNotFoundError:
+                continue
+            h.update(f"{f}:{st.st_mtime_ns}:{st.st_size}\n".encode())
+        return h.hexdigest()
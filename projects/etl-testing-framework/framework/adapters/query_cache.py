@@ -0,0 +1,146 @@
+"""Persistent query result cache for DB adapters.
+
+Results of ``scalar``/``rows`` are stored in a small SQLite file keyed on
+(normalized SQL, database identity, data version). An adapter opts in by
+implementing ``cache_identity()`` and ``data_version()`` (a None version means
+"do not cache"); as long as the data version is unchanged a re-run of the same
+SQL is served from disk, across processes (``etlq`` runs, the MCP server, the
+agent). Least recently used entries are evicted beyond ``max_entries``.
+
+SQL that is not a pure function of the data (``'now'``, ``random()``, ...) is
+never cached; each adapter lists its engine's clock and random functions in
+``VOLATILE_SQL``.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+DEFAULT_PATH = os.getenv("ETLQ_QUERY_CACHE", "reports/query_cache.sqlite")
+DEFAULT_MAX_ENTRIES = int(os.getenv("ETLQ_QUERY_CACHE_MAX_ENTRIES", "10000"))
+
+# Clock and random reads every engine spells this way; adapters add their own (``VOLATILE_SQL``).
+_VOLATILE = re.compile(r"'now'|\bcurrent_(timestamp|date|time)\b|\brandom\s*\(", re.IGNORECASE)
+_LITERAL_OR_SPACE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|\s+")
+
+
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside string literals and drop a trailing semicolon."""
+    out = _LITERAL_OR_SPACE.sub(lambda m: m.group(1) or " ", sql.strip())
+    return out.rstrip(";").strip()
+
+
+def is_cacheable(sql: str, volatile: re.Pattern | None = None) -> bool:
+    """False for SQL whose result can change without the data changing (``volatile``: the adapter's own calls)."""
+    return not _VOLATILE.search(sql) and not (volatile is not None and volatile.search(sql))
+
+
+class QueryCache:
+    _shared: Dict[str, "QueryCache"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("create table if not exists entries (key text primary key, value blob, last_used real)")
+        self.conn.execute("create index if not exists entries_last_used on entries(last_used)")
+        self.conn.commit()
+        self.hits = self.misses = self.bypassed = 0
+
+    @classmethod
+    def shared(cls, path: str = DEFAULT_PATH, max_entries: int = DEFAULT_MAX_ENTRIES) -> "QueryCache":
+        """One instance per cache file, so every adapter of a run shares the stats."""
+        key = str(Path(path).resolve())
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(path, max_entries)
+            return cls._shared[key]
+
+    @staticmethod
+    def key(kind: str, sql: str, identity: str, version: str) -> str:
+        return hashlib.sha256("\x1f".join([kind, normalize_sql(sql), identity, version]).encode()).hexdigest()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self.conn.execute("select value from entries where key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self.conn.execute("update entries set last_used = ? where key = ?", (time.time(), key))
+            self.conn.commit()
+        return True, pickle.loads(row[0])
+
+    def put(self, key: str, value: Any):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self.conn.execute("insert or replace into entries values (?, ?, ?)", (key, blob, time.time()))
+            (count,) = self.conn.execute("select count(*) from entries").fetchone()
+            if count > self.max_entries:
+                self.conn.execute(
+                    "delete from entries where key in (select key from entries order by last_used limit ?)",
+                    (count - self.max_entries,),
+                )
+            self.conn.commit()
+
+    def bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def clear(self):
+        with self._lock:
+            self.conn.execute("delete from entries")
+            self.conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            (entries,) = self.conn.execute("select count(*) from entries").fetchone()
+            hits, misses, bypassed = self.hits, self.misses, self.bypassed
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "bypassed": bypassed,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+            "path": str(self.path),
+        }
+
+
+class CachedAdapter:
+    """Adapter wrapper serving ``scalar``/``rows`` from a QueryCache while the data version is unchanged."""
+
+    def __init__(self, adapter, cache: QueryCache):
+        self.adapter = adapter
+        self.cache = cache
+
+    def _cached(self, kind: str, sql: str, compute):
+        version = self.adapter.data_version() if is_cacheable(sql, getattr(self.adapter, "VOLATILE_SQL", None)) else None
+        if version is None:
+            self.cache.bypass()
+            return compute()
+        key = self.cache.key(kind, sql, self.adapter.cache_identity(), version)
+        found, value = self.cache.get(key)
+        if not found:
+            value = compute()
+            self.cache.put(key, value)
+        return value
+
+    def scalar(self, sql: str) -> Any:
+        return self._cached("scalar", sql, lambda: self.adapter.scalar(sql))
+
+    def rows(self, sql: str, limit: int = 20) -> List[Dict[str, Any]]:
+        return self._cached(f"rows:{limit}", sql, lambda: self.adapter.rows(sql, limit=limit))
+
+    def __getattr__(self, name):
+        return getattr(self.adapter, name)
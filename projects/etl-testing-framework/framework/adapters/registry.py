@@ -1,8 +1,24 @@
+from .query_cache import DEFAULT_MAX_ENTRIES, DEFAULT_PATH, CachedAdapter, QueryCache
 from .sqlite_adapter import SQLiteAdapter
 
 
-def create_adapter(cfg: dict):
+def create_adapter(cfg: dict, read_only: bool = False):
     kind = cfg.get("kind")
     if kind == "sqlite":
-        return SQLiteAdapter(cfg["database_path"])
-    raise ValueError(f"Unsupported adapter kind: {kind}")
+        adapter = SQLiteAdapter(cfg["database_path"], read_only=read_only)
+    elif kind == "duckdb":
+        from .duckdb_adapter import DuckDBAdapter  # optional dependency
+
+        adapter = DuckDBAdapter(
+            cfg.get("database_path", ":memory:"),
+            sources=cfg.get("sources"),
+            read_only=read_only,
+            threads=cfg.get("threads"),
+        )
+    else:
+        raise ValueError(f"Unsupported adapter kind: {kind}")
+    cache_cfg = cfg.get("cache") or {}
+    if cache_cfg.get("enabled"):
+        cache = QueryCache.shared(cache_cfg.get("path", DEFAULT_PATH), int(cache_cfg.get("max_entries", DEFAULT_MAX_ENTRIES)))
+        return CachedAdapter(adapter, cache)
+    return adapter
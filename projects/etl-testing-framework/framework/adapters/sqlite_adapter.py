@@ -1,11 +1,30 @@
+import re
 import sqlite3
+from pathlib import Path
 from typing import Any, List, Dict
 from .base import DBAdapter
 
 
 class SQLiteAdapter(DBAdapter):
-    def __init__(self, database_path: str):
-        self.conn = sqlite3.connect(database_path)
+    # date()/time()/datetime()/julianday()/unixepoch() without arguments and strftime(fmt) read the clock.
+    VOLATILE_SQL = re.compile(
+        r"\b(randomblob|changes|total_changes|last_insert_rowid)\s*\("
+        r"|\b(date|time|datetime|julianday|unixepoch)\s*\(\s*\)"
+        r"|\bstrftime\s*\(\s*'(?:[^']|'')*'\s*\)",
+        re.IGNORECASE,
+    )
+
+    def __init__(self, database_path: str, read_only: bool = False):
+        self.database_path = database_path
+        self._pragma_version = None
+        self._stamp = None
+        self._bump = 0
+        if read_only:
+            # URI mode=ro: concurrent readers never take write locks on the file
+            uri = Path(database_path).resolve().as_uri() + "?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        else:
+            self.conn = sqlite3.connect(database_path)
         self.conn.row_factory = sqlite3.Row
 
     def scalar(self, sql: str) -> Any:
@@ -19,6 +38,33 @@ class SQLiteAdapter(DBAdapter):
         cur.execute(f"SELECT * FROM ({sql}) LIMIT {limit}")
         return [dict(r) for r in cur.fetchall()]
 
+    def close(self):
+        self.conn.close()
+
+    def cache_identity(self) -> str:
+        p = Path(self.database_path).resolve()
+        st = p.stat()
+        return f"sqlite:{p}:{st.st_dev}:{st.st_ino}"
+
+    def data_version(self) -> str:
+        # File stamps (main db + WAL) carry the version across processes. PRAGMA data_version
+        # changes whenever another connection commits; if that happens within one mtime tick
+        # the stamp looks unchanged, so bump a local counter rather than serve stale results.
+        p = Path(self.database_path)
+        stamp = []
+        for f in (p, Path(f"{p}-wal")):
+            try:
+                st = f.stat()
+                stamp.append(f"{st.st_mtime_ns}:{st.st_size}")
+            except FileNotFoundError:
+                stamp.append("-")
+        stamp = "/".join(stamp)
+        pragma = (self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes)
+        if self._pragma_version is not None and pragma != self._pragma_version and stamp == self._stamp:
+            self._bump += 1
+        self._pragma_version, self._stamp = pragma, stamp
+        return f"{stamp}+{self._bump}" if self._bump else stamp
+
     def table_schema(self, table: str) -> List[Dict[str, Any]]:
         cur = self.conn.cursor()
         cur.execute(f"PRAGMA table_info({table})")
@@ -1,20 +1,34 @@
+import dataclasses
+import hashlib
+import json
 import os
+import pickle
 import re
+import threading
 from pathlib import Path
 import yaml
 from .models import TestCase
 
 
 _PATTERN = re.compile(r"\{\{\s*([a-zA-Z0-9_\.]+)\s*\}\}")
+_MAX_DEPTH = 5  # nested placeholder passes, as before
+
+# Files a compiled suite depends on (besides the suite file itself).
+CONTEXT_FILES = ["entities.yaml", "business_rules.yaml", "profiles.yaml"]
+# On-disk compiled suites; set ETLQ_SUITE_CACHE to "" to disable.
+SUITE_CACHE_DIR = os.getenv("ETLQ_SUITE_CACHE", "reports/suite_cache")
+_CACHE_VERSION = 2
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)  # libyaml when available
+
+_compiled = {}
+_compiled_lock = threading.Lock()
 
 
 def _load_yaml_if_exists(path: Path) -> dict:
     if not path.exists():
         return {}
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
-
-
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
 
 
 def _load_profile_context(config_dir: Path, base_context: dict) -> dict:
@@ -27,7 +41,8 @@ def _load_profile_context(config_dir: Path, base_context: dict) -> dict:
     ctx = dict(base_context)
     for k, v in overrides.items():
         ctx[f"entity.{k}"] = v
-    return _load_profile_context(config_dir, ctx)
+    return ctx
+
 
 def _build_context(config_dir: Path) -> dict:
     # supports config/entities.yaml + config/business_rules.yaml
@@ -41,25 +56,42 @@ def _build_context(config_dir: Path) -> dict:
     return ctx
 
 
-def _render_str(value: str, context: dict) -> str:
-    # multi-pass to support nested placeholders
-    out = value
-    for _ in range(5):
-        changed = False
+def _tokenize(value: str):
+    """Split a template into literal text and (key, placeholder) pairs."""
+    parts, pos = [], 0
+    for m in _PATTERN.finditer(value):
+        if m.start() > pos:
+            parts.append(value[pos:m.start()])
+        parts.append((m.group(1), m.group(0)))
+        pos = m.end()
+    if pos < len(value):
+        parts.append(value[pos:])
+    return parts
+
 
-        def repl(m):
-            nonlocal changed
-            key = m.group(1)
-            if key in context:
-                changed = True
-                return str(context[key])
-            return m.group(0)
+def _render_tokens(parts, context: dict) -> str:
+    return "".join(p if isinstance(p, str) else str(context[p[0]]) if p[0] in context else p[1] for p in parts)
 
-        out2 = _PATTERN.sub(repl, out)
-        out = out2
+
+def _resolve_context(context: dict) -> dict:
+    """Expand placeholders inside context values once, so templates render in a single pass."""
+    resolved = dict(context)
+    for _ in range(_MAX_DEPTH - 1):
+        changed = False
+        for k, v in resolved.items():
+            if isinstance(v, str) and "{{" in v:
+                out = _render_tokens(_tokenize(v), resolved)
+                changed |= out != v
+                resolved[k] = out
         if not changed:
             break
-    return out
+    return resolved
+
+
+def _render_str(value: str, context: dict) -> str:
+    if "{{" not in value:
+        return value
+    return _render_tokens(_tokenize(value), context)
 
 
 def _render_obj(obj, context: dict):
@@ -72,13 +104,12 @@ def _render_obj(obj, context: dict):
     return obj
 
 
-def load_suite(path: str) -> dict:
-    p = Path(path)
+def _compile(p: Path) -> dict:
     with open(p, "r", encoding="utf-8") as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YAML_LOADER)
 
-    context = _build_context(p.parent)
-    raw = _render_obj(raw, context)
+    context = _load_profile_context(p.parent, _build_context(p.parent))
+    raw = _render_obj(raw, _resolve_context(context))
 
     tests = []
     for t in raw.get("tests", []):
@@ -94,3 +125,73 @@ def load_suite(path: str) -> dict:
     raw["tests"] = tests
     raw["_context"] = context
     return raw
+
+
+def _cache_key(p: Path) -> str:
+    stamps = []
+    for f in [p] + [p.parent / name for name in CONTEXT_FILES]:
+        try:
+            st = f.stat()
+            stamps.append(f"{f.resolve()}:{st.st_mtime_ns}:{st.st_size}")
+        except FileNotFoundError:
+            stamps.append(f"{f}:missing")
+    stamps.append(f"profile={os.getenv('ETLQ_PROFILE', '').strip()}")
+    stamps.append(f"v{_CACHE_VERSION}")
+    return hashlib.sha256("\n".join(stamps).encode()).hexdigest()
+
+
+def load_suite(path: str) -> dict:
+    """Rendered suite for ``path``, compiled once per (file mtimes, ETLQ_PROFILE).
+
+    Compiled suites are kept in memory and stored as JSON under ``SUITE_CACHE_DIR``
+    so a new process skips YAML parsing and rendering while the config files are
+    unchanged. Every call returns a fresh copy that callers may modify.
+    """
+    p = Path(path)
+    key = _cache_key(p)
+    with _compiled_lock:
+        blob = _compiled.get(key)
+    if blob is not None:
+        return pickle.loads(blob)
+
+    disk = Path(SUITE_CACHE_DIR) / f"{key}.json" if SUITE_CACHE_DIR else None
+    suite = _read_cached(disk, key) if disk is not None else None
+    if suite is None:
+        suite = _compile(p)
+        if disk is not None:
+            _write_cached(disk, key, suite)
+    # Only suites compiled or validated by this process are pickled, and only in memory.
+    blob = pickle.dumps(suite, protocol=pickle.HIGHEST_PROTOCOL)
+    with _compiled_lock:
+        _compiled[key] = blob
+    return pickle.loads(blob)
+
+
+def _read_cached(disk: Path, key: str):
+    """The suite stored at ``disk``, or None when it is missing, corrupt or not for ``key``."""
+    try:
+        doc = json.loads(disk.read_text(encoding="utf-8"))
+        if doc.get("key") != key or doc.get("version") != _CACHE_VERSION:
+            return None
+        suite = doc["suite"]
+        suite["tests"] = [TestCase(**t) for t in suite["tests"]]
+        return suite
+    except (OSError, ValueError, TypeError, KeyError, AttributeError):
+        return None  # truncated, hand-edited or from an older layout: recompile
+
+
+def _write_cached(disk: Path, key: str, suite: dict) -> None:
+    doc = dict(suite, tests=[dataclasses.asdict(t) for t in suite["tests"]])
+    try:
+        text = json.dumps({"key": key, "version": _CACHE_VERSION, "suite": doc})
+    except (TypeError, ValueError):
+        return  # e.g. YAML dates in params: keep the in-memory copy only
+    if json.loads(text)["suite"] != doc:
+        return  # non-string mapping keys would not survive the round trip
+    try:
+        disk.parent.mkdir(parents=True, exist_ok=True)
+        tmp = disk.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(text, encoding="utf-8")
+        tmp.replace(disk)
+    except OSError:
+        pass  # read-only checkout: keep the in-memory copy only
@@ -0,0 +1,169 @@
+"""Query fusion: answer many scalar checks on the same table with one scan.
+
+Scalar check SQL of the form ``select count(*) from <from> [where <cond>]`` (or an
+aggregate expression over ``<from>`` without a where clause) is grouped by its
+FROM clause, and each group is rewritten into a single query:
+
+    SELECT COUNT(CASE WHEN (<cond1>) THEN 1 END) AS c0,
+           COUNT(CASE WHEN (<cond2>) THEN 1 END) AS c1,
+           COUNT(*) AS c2, ...
+    FROM <from>
+
+The results are handed to checks through ``FusedAdapter``, which answers
+``scalar(sql)`` from the prefetched values and passes everything else to the
+real adapter, so each TestCase and its assertion run unchanged. SQL that does not
+fit the pattern (top-level GROUP BY/HAVING/LIMIT, UNION, ...) runs on its own.
+Comments are dropped before the SQL is split, so a ``-- where`` note neither
+becomes a clause nor comments out the rest of a fused query.
+"""
+
+import re
+from typing import Any, Dict, List
+
+from .models import TestCase
+
+# params holding scalar SQL, per test type
+SCALAR_PARAMS = {
+    "business_rule": ["sql"],
+    "scd2": ["sql"],
+    "incremental": ["sql"],
+    "rowcount_recon": ["source_sql", "target_sql"],
+}
+
+_SELECT = re.compile(r"^\s*select\s+(?P<expr>.+?)\s+from\s+(?P<rest>.+?)\s*;?\s*$", re.IGNORECASE | re.DOTALL)
+_WHERE = re.compile(r"\swhere\s", re.IGNORECASE)
+_COUNT_STAR = re.compile(r"^count\s*\(\s*\*\s*\)$", re.IGNORECASE)
+_AGGREGATE = re.compile(r"\b(count|sum|min|max|avg|total)\s*\(", re.IGNORECASE)
+_NOT_FUSIBLE = re.compile(r"\b(group\s+by|having|order\s+by|limit|offset|union|intersect|except|window|distinct|select)\b", re.IGNORECASE)
+
+
+def _strip_comments(sql: str) -> str:
+    """``sql`` with ``-- ...`` and ``/* ... */`` comments outside string literals replaced by a space."""
+    out, i, quote = [], 0, None
+    while i < len(sql):
+        ch = sql[i]
+        if quote:
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+        elif sql.startswith("--", i) or sql.startswith("/*", i):
+            end = sql.find("\n", i) if ch == "-" else sql.find("*/", i + 2)
+            i = len(sql) if end == -1 else end + (0 if ch == "-" else 2)
+            out.append(" ")
+            continue
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _mask(sql: str) -> str:
+    """Same-length copy of ``sql`` with string literals and parenthesised text replaced by NULs."""
+    out, depth, quote = [], 0, None
+    for ch in sql:
+        if quote:
+            out.append("\0")
+            if ch == quote:
+                quote = None
+        elif ch in ("'", '"'):
+            quote = ch
+            out.append("\0")
+        elif ch == "(":
+            depth += 1
+            out.append("(")
+        elif ch == ")":
+            depth -= 1
+            out.append(")")
+        else:
+            out.append("\0" if depth else ch)
+    return "".join(out)
+
+
+def scalar_parts(sql: str):
+    """(FROM clause, fused select expression) for a fusible scalar query, else None."""
+    sql = _strip_comments(sql)
+    masked = _mask(sql)
+    m = _SELECT.match(masked)
+    if not m or _NOT_FUSIBLE.search(masked[m.end("expr"):]) or _NOT_FUSIBLE.search(m.group("expr")):
+        return None
+    expr = sql[m.start("expr"):m.end("expr")].strip()
+    rest_start = m.start("rest")
+    where = _WHERE.search(masked, rest_start)
+    if where:
+        from_clause = sql[rest_start:where.start()]
+        cond = sql[where.end():m.end("rest")].strip()
+    else:
+        from_clause, cond = sql[rest_start:m.end("rest")], None
+    from_key = " ".join(from_clause.split())
+    if cond is not None:
+        if not _COUNT_STAR.match(expr):
+            return None
+        return from_key, f"COUNT(CASE WHEN ({cond}) THEN 1 END)"
+    if _COUNT_STAR.match(expr):
+        return from_key, "COUNT(*)"
+    if "," in _mask(expr) or not _AGGREGATE.search(expr):
+        return None  # several columns, or a bare column that would pick an arbitrary row once fused
+    return from_key, expr
+
+
+def scalar_sqls(tests: List[TestCase]) -> List[str]:
+    out = []
+    for t in tests:
+        for key in SCALAR_PARAMS.get(t.type, []):
+            sql = t.params.get(key)
+            if isinstance(sql, str):
+                out.append(sql.strip())
+    return list(dict.fromkeys(out))
+
+
+def plan(tests: List[TestCase]) -> List[Dict[str, Any]]:
+    """Fused queries for every FROM clause shared by two or more distinct scalar checks."""
+    groups: Dict[str, Dict[str, str]] = {}
+    for sql in scalar_sqls(tests):
+        parts = scalar_parts(sql)
+        if parts:
+            groups.setdefault(parts[0], {})[sql] = parts[1]
+    fused = []
+    for from_clause, members in groups.items():
+        if len(members) < 2:
+            continue
+        exprs = list(dict.fromkeys(members.values()))
+        alias = {e: f"c{i}" for i, e in enumerate(exprs)}
+        select = ",\n       ".join(f"{e} AS {alias[e]}" for e in exprs)
+        fused.append({
+            "sql": f"SELECT {select}\nFROM {from_clause}",
+            "from": from_clause,
+            "columns": {sql: alias[e] for sql, e in members.items()},
+        })
+    return fused
+
+
+def prefetch(adapter, fused: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run each fused query once; a group whose fused query fails is left to run unfused."""
+    values = {}
+    for q in fused:
+        try:
+            row = adapter.rows(q["sql"], limit=1)
+        except Exception:
+            continue
+        if row:
+            for sql, col in q["columns"].items():
+                values[sql] = row[0][col]
+    return values
+
+
+class FusedAdapter:
+    """Adapter view that answers prefetched scalar SQL and delegates the rest."""
+
+    def __init__(self, adapter, values: Dict[str, Any]):
+        self.adapter = adapter
+        self.values = values
+
+    def scalar(self, sql: str) -> Any:
+        key = sql.strip()
+        if key in self.values:
+            return self.values[key]
+        return self.adapter.scalar(sql)
+
+    def __getattr__(self, name):
+        return getattr(self.adapter, name)
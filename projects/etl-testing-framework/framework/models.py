@@ -9,3 +9,13 @@ class TestCase:
     severity: str
     params: Dict[str, Any]
     tags: List[str]
+
+
+@dataclass
+class CaseResult:
+    id: str
+    type: str
+    severity: str
+    status: str  # passed | failed | error | skipped
+    message: str
+    elapsed: float
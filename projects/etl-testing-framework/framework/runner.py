@@ -0,0 +1,213 @@
+"""In-process suite runner: executes TestCases on a thread pool of read-only adapters and writes JUnit XML."""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List
+
+from . import fusion
+from .adapters.registry import create_adapter
+from .assertions import assert_equal, assert_schema_columns, assert_within_pct, assert_zero
+from .models import CaseResult, TestCase
+from .planner import select_tests
+from .runner_context import RunnerContext
+
+
+class UnsupportedTestType(Exception):
+    pass
+
+
+def run_check(a, test_case: TestCase):
+    """Execute one configured check against adapter ``a``; raises AssertionError on failure."""
+    p = test_case.params
+    ttype = test_case.type
+
+    if ttype == "schema":
+        actual = a.table_schema(p["table"])
+        assert_schema_columns(test_case.id, actual, p["expected_columns"])
+
+    elif ttype == "rowcount_recon":
+        src = float(a.scalar(p["source_sql"]))
+        tgt = float(a.scalar(p["target_sql"]))
+        assert_within_pct(
+            test_case.id,
+            actual=tgt,
+            expected=src,
+            tolerance_pct=float(p["tolerance_pct"]),
+            context={"source_sql": p["source_sql"], "target_sql": p["target_sql"]},
+        )
+
+    elif ttype == "business_rule":
+        violations = int(a.scalar(p["sql"]))
+        assert_equal(test_case.id, violations, int(p["expected"]), context={"sql": p["sql"]})
+
+    elif ttype == "incremental":
+        lag = float(a.scalar(p["sql"]))
+        if lag > float(p["max_lag_minutes"]):
+            sample = a.rows("select * from target_orders order by updated_at desc", limit=5)
+            raise AssertionError(
+                f"[{test_case.id}] watermark lag too high: {lag:.2f} min > {p['max_lag_minutes']} | "
+                f"sql={p['sql']} | sample_rows={sample}"
+            )
+
+    elif ttype == "scd2":
+        broken_keys = int(a.scalar(p["sql"]))
+        assert_zero(test_case.id, broken_keys, context={"sql": p["sql"]})
+
+    else:
+        raise UnsupportedTestType(f"Unsupported test type in starter kit: {ttype}")
+
+
+class AdapterPool:
+    """One read-only adapter per worker thread, opened on first use."""
+
+    def __init__(self, adapter_cfg: dict):
+        self.adapter_cfg = adapter_cfg
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all = []
+
+    def get(self):
+        a = getattr(self._local, "adapter", None)
+        if a is None:
+            a = self._local.adapter = create_adapter(self.adapter_cfg, read_only=True)
+            with self._lock:
+                self._all.append(a)
+        return a
+
+    def cache_stats(self):
+        caches = {id(a.cache): a.cache for a in self._all if getattr(a, "cache", None) is not None}
+        return next(iter(caches.values())).stats() if caches else None
+
+    def close(self):
+        for a in self._all:
+            a.close()
+        self._all.clear()
+
+
+def _run_one(ctx: RunnerContext, pool: AdapterPool, values: dict, test_case: TestCase) -> CaseResult:
+    t0 = time.perf_counter()
+    status, message = "passed", ""
+    try:
+        run_check(fusion.FusedAdapter(pool.get(), values), test_case)
+    except UnsupportedTestType as e:
+        status, message = "skipped", str(e)
+    except AssertionError as e:
+        hint = ctx.ai.triage_failure(test_case.id, str(e), {"type": test_case.type, "params": test_case.params})
+        status, message = "failed", f"{e}\nAI_TRIAGE: {hint}"
+    except Exception as e:
+        status, message = "error", f"{type(e).__name__}: {e}"
+    return CaseResult(test_case.id, test_case.type, test_case.severity, status, message, time.perf_counter() - t0)
+
+
+def write_junit(path: str, suite_name: str, results: List[CaseResult], elapsed: float):
+    counts = {s: sum(1 for r in results if r.status == s) for s in ("failed", "error", "skipped")}
+    root = ET.Element("testsuites")
+    suite = ET.SubElement(
+        root,
+        "testsuite",
+        name=suite_name,
+        tests=str(len(results)),
+        failures=str(counts["failed"]),
+        errors=str(counts["error"]),
+        skipped=str(counts["skipped"]),
+        time=f"{elapsed:.3f}",
+    )
+    for r in results:
+        case = ET.SubElement(suite, "testcase", classname=f"{suite_name}.{r.severity}", name=r.id, time=f"{r.elapsed:.3f}")
+        if r.status == "failed":
+            ET.SubElement(case, "failure", message=r.message.splitlines()[0]).text = r.message
+        elif r.status == "error":
+            ET.SubElement(case, "error", message=r.message.splitlines()[0]).text = r.message
+        elif r.status == "skipped":
+            ET.SubElement(case, "skipped", message=r.message)
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    ET.ElementTree(root).write(out, encoding="utf-8", xml_declaration=True)
+
+
+def run_suite(
+    cfg_path: str = "config/tests.yaml",
+    include_tags=None,
+    severities=None,
+    workers: int | None = None,
+    junit_path: str | None = "reports/junit.xml",
+    fuse: bool = True,
+) -> dict:
+    t0 = time.perf_counter()
+    ctx = RunnerContext(cfg_path)
+    tests = select_tests(ctx.tests, include_tags=include_tags, severities=severities)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tests) or 1))
+    pool = AdapterPool(ctx.suite["adapter"])
+    fused = fusion.plan(tests) if fuse and ctx.suite.get("fusion", True) else []
+    values = {}
+    try:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etlq") as ex:
+            for v in ex.map(lambda q: fusion.prefetch(pool.get(), [q]), fused):
+                values.update(v)
+            results = list(ex.map(lambda t: _run_one(ctx, pool, values, t), tests))
+        cache_stats = pool.cache_stats()
+    finally:
+        pool.close()
+    elapsed = time.perf_counter() - t0
+
+    if junit_path:
+        write_junit(junit_path, ctx.suite.get("suite", "etlq"), results, elapsed)
+    counts = {s: sum(1 for r in results if r.status == s) for s in ("passed", "failed", "error", "skipped")}
+    return {
+        "ok": counts["failed"] == 0 and counts["error"] == 0,
+        "total": len(results),
+        **counts,
+        "workers": workers,
+        "fused_queries": len(fused),
+        "fused_checks": len(values),
+        "query_cache": cache_stats,
+        "elapsed_s": round(elapsed, 3),
+        "junit_path": junit_path,
+        "results": results,
+    }
+
+
+def summary_line(summary: dict) -> str:
+    # same shape as pytest's last line, which etlq parses for the executive report
+    parts = [f"{summary[k]} {k}" for k in ("failed", "passed", "skipped") if summary[k]]
+    if summary["error"]:
+        parts.append(f"{summary['error']} error")
+    return f"{', '.join(parts) or 'no tests ran'} in {summary['elapsed_s']:.2f}s"
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Run an ETLQ suite in-process")
+    ap.add_argument("--config", default="config/tests.yaml")
+    ap.add_argument("--junit", default="reports/junit.xml")
+    ap.add_argument("--workers", type=int, default=None, help="parallel adapter connections (default: CPU count)")
+    ap.add_argument("--severity", action="append", help="run only this severity (repeatable)")
+    ap.add_argument("--tag", action="append", help="run only tests with this tag (repeatable)")
+    ap.add_argument("--no-fusion", action="store_true", help="run every scalar check as its own query")
+    args = ap.parse_args(argv)
+
+    summary = run_suite(
+        args.config,
+        include_tags=args.tag,
+        severities=args.severity,
+        workers=args.workers,
+        junit_path=args.junit,
+        fuse=not args.no_fusion,
+    )
+    for r in summary["results"]:
+        if r.status in ("failed", "error"):
+            print(f"{r.status.upper()} {r.id} - {r.message}")
+    if summary["query_cache"]:
+        c = summary["query_cache"]
+        print(f"query cache: hits={c['hits']} misses={c['misses']} bypassed={c['bypassed']} entries={c['entries']}")
+    print(summary_line(summary))
+    return 0 if summary["ok"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,7 @@ import subprocess
 from pathlib import Path
 
 ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
 VENV_PY = ROOT / ".venv" / "bin" / "python"
 PY = str(VENV_PY) if VENV_PY.exists() else sys.executable
 
@@ -17,9 +18,15 @@ def seed_demo_db() -> int:
 def run_tests() -> int:
     reports = ROOT / "reports"
     reports.mkdir(exist_ok=True)
-    cmd = [PY, "-m", "pytest", "-q", "--junitxml=reports/junit.xml"]
-    p = subprocess.run(cmd, cwd=ROOT)
-    return p.returncode
+    if os.getenv("ETLQ_RUNNER", "native").lower() == "pytest":
+        cmd = [PY, "-m", "pytest", "-q", "--junitxml=reports/junit.xml"]
+        p = subprocess.run(cmd, cwd=ROOT)
+        return p.returncode
+    from framework import runner
+
+    workers = os.getenv("ETLQ_WORKERS")
+    os.chdir(ROOT)
+    return runner.main(["--junit", "reports/junit.xml"] + (["--workers", workers] if workers else []))
 
 
 def send_email() -> int:
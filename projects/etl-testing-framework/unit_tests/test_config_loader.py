@@ -0,0 +1,148 @@
+import json
+import os
+
+import pytest
+import yaml
+
+from framework import config_loader
+from framework.config_loader import load_suite
+
+ENTITIES = {"entity": {"source_orders": "src_orders", "target_orders": "{{ entity.schema }}.orders", "schema": "{{ entity.db }}_dw", "db": "prod"}}
+RULES = {"rules": {"max_lag_hours": 24, "lag_sql": "select max(lag) from {{ entity.target_orders }} where lag > {{ rules.max_lag_hours }}"}}
+PROFILES = {"profiles": {"qa": {"entity_overrides": {"target_orders": "qa_orders", "db": "qa"}}}}
+TESTS = [
+    {"id": "lag", "type": "business_rule", "tags": ["freshness"], "params": {"sql": "{{ rules.lag_sql }}", "expected": 0}},
+    {"id": "recon", "type": "rowcount_recon", "severity": "high",
+     "params": {"source_sql": "select count(*) from {{ entity.source_orders }}", "target_sql": "select count(*) from {{ entity.target_orders }}",
+                "keep": "{{ entity.unknown }}", "limits": [1, "{{ rules.max_lag_hours }}"]}},
+]
+
+
+@pytest.fixture
+def suite(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader, "SUITE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(config_loader, "_compiled", {})
+    monkeypatch.delenv("ETLQ_PROFILE", raising=False)
+    cfg = tmp_path / "config"
+    cfg.mkdir()
+    for name, doc in [("entities.yaml", ENTITIES), ("business_rules.yaml", RULES), ("profiles.yaml", PROFILES)]:
+        (cfg / name).write_text(yaml.safe_dump(doc), encoding="utf-8")
+    path = cfg / "tests.yaml"
+    path.write_text(yaml.safe_dump({"suite": "loader", "tests": TESTS}), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def compiles(monkeypatch):
+    calls = []
+    real = config_loader._compile
+
+    def counting(p):
+        calls.append(p)
+        return real(p)
+
+    monkeypatch.setattr(config_loader, "_compile", counting)
+    return calls
+
+
+def _old_render(value, context):
+    """The loader's original multi-pass renderer, kept here as the reference."""
+    out = value
+    for _ in range(5):
+        out = config_loader._PATTERN.sub(lambda m: str(context[m.group(1)]) if m.group(1) in context else m.group(0), out)
+    return out
+
+
+def _old_render_obj(obj, context):
+    if isinstance(obj, str):
+        return _old_render(obj, context)
+    if isinstance(obj, list):
+        return [_old_render_obj(x, context) for x in obj]
+    if isinstance(obj, dict):
+        return {k: _old_render_obj(v, context) for k, v in obj.items()}
+    return obj
+
+
+def _touch(path, text):
+    st = path.stat()
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_nested_placeholders_render_like_the_multi_pass_loop(suite):
+    out = load_suite(str(suite))
+    context = config_loader._build_context(suite.parent)
+    assert [t.params for t in out["tests"]] == [_old_render_obj(t["params"], context) for t in TESTS]
+    assert out["tests"][0].params["sql"] == "select max(lag) from prod_dw.orders where lag > 24"
+    assert out["tests"][1].params["keep"] == "{{ entity.unknown }}"  # unknown keys stay as written
+    assert (out["tests"][0].severity, out["tests"][1].tags) == ("medium", [])
+
+
+def test_profile_overrides_apply_without_recursing(suite, monkeypatch):
+    monkeypatch.setenv("ETLQ_PROFILE", "qa")
+    out = load_suite(str(suite))
+    assert out["_context"]["entity.target_orders"] == "qa_orders"
+    assert out["tests"][1].params["target_sql"] == "select count(*) from qa_orders"
+    assert out["tests"][0].params["sql"] == "select max(lag) from qa_orders where lag > 24"
+
+    monkeypatch.setenv("ETLQ_PROFILE", "missing")
+    assert load_suite(str(suite))["tests"][1].params["target_sql"] == "select count(*) from prod_dw.orders"
+
+
+def test_memory_cache_skips_recompiling_and_returns_copies(suite, compiles):
+    first = load_suite(str(suite))
+    first["tests"][0].params["sql"] = "mutated"
+    second = load_suite(str(suite))
+    assert len(compiles) == 1
+    assert second["tests"][0].params["sql"] != "mutated"
+    assert second is not first
+
+
+def test_changed_config_file_invalidates_the_cache(suite, compiles, monkeypatch):
+    load_suite(str(suite))
+    rules = suite.parent / "business_rules.yaml"
+    _touch(rules, rules.read_text(encoding="utf-8").replace("24", "48"))
+    assert load_suite(str(suite))["tests"][0].params["sql"].endswith("lag > 48")
+
+    monkeypatch.setenv("ETLQ_PROFILE", "qa")
+    load_suite(str(suite))
+    assert len(compiles) == 3
+
+
+def test_new_process_loads_the_json_disk_cache(suite, compiles, monkeypatch):
+    expected = load_suite(str(suite))
+    files = list((suite.parent.parent / "cache").iterdir())
+    assert [f.suffix for f in files] == [".json"]
+    assert json.loads(files[0].read_text(encoding="utf-8"))["key"] == files[0].stem
+
+    monkeypatch.setattr(config_loader, "_compiled", {})  # as if in a fresh process
+    assert load_suite(str(suite)) == expected
+    assert len(compiles) == 1
+
+
+@pytest.mark.parametrize("payload", [
+    b"\x80\x04\x95 not json at all",
+    b'{"key": "someone-else", "version": 2, "suite": {"tests": []}}',
+    b'{"key": "KEY", "version": 1, "suite": {"tests": []}}',
+    b'{"key": "KEY", "version": 2, "suite": {"tests": [{"id": "x", "bogus": 1}]}}',
+])
+def test_foreign_or_corrupt_cache_files_are_recompiled(suite, compiles, payload):
+    disk = suite.parent.parent / "cache" / f"{config_loader._cache_key(suite)}.json"
+    disk.parent.mkdir()
+    disk.write_bytes(payload.replace(b"KEY", disk.stem.encode()))
+
+    out = load_suite(str(suite))
+    assert [t.id for t in out["tests"]] == ["lag", "recon"]
+    assert len(compiles) == 1
+    assert json.loads(disk.read_text(encoding="utf-8"))["suite"]["tests"][0]["id"] == "lag"  # rewritten
+
+
+@pytest.mark.parametrize("params", ["{since: 2026-01-01}", "{by_id: {1: a}}"])
+def test_suites_that_json_cannot_hold_stay_in_memory(suite, compiles, params):
+    suite.write_text(f"suite: odd\ntests:\n  - {{id: d, type: business_rule, params: {params}}}\n", encoding="utf-8")
+    out = load_suite(str(suite))
+    assert out["tests"][0].params == yaml.safe_load(params)
+    assert not (suite.parent.parent / "cache").exists()
+    load_suite(str(suite))
+    assert len(compiles) == 1
+
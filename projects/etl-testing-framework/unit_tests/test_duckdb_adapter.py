@@ -0,0 +1,97 @@
+import pytest
+
+duckdb = pytest.importorskip("duckdb")
+
+from framework.adapters.duckdb_adapter import DuckDBAdapter  # noqa: E402
+from framework.adapters.registry import create_adapter  # noqa: E402
+
+
+@pytest.fixture
+def lake(tmp_path):
+    """orders/region=<r>/*.parquet written by DuckDB's hive-partitioned COPY, plus a CSV extract."""
+    root = tmp_path / "orders"
+    con = duckdb.connect()
+    con.execute(
+        f"""
+        COPY (SELECT i AS order_id, i * 1.5 AS amount, CASE WHEN i % 3 = 0 THEN 'eu' ELSE 'us' END AS region
+              FROM range(1, 31) t(i))
+        TO '{root}' (FORMAT parquet, PARTITION_BY (region))
+        """
+    )
+    con.close()
+    (tmp_path / "customers.csv").write_text("customer_id,name\n1,ada\n2,bob\n", encoding="utf-8")
+    return tmp_path
+
+
+def _adapter(lake, **kwargs):
+    return DuckDBAdapter(sources={"orders": f"{lake}/orders/**/*.parquet", "customers": str(lake / "customers.csv")}, **kwargs)
+
+
+def test_parquet_and_csv_globs_attach_as_views(lake):
+    a = _adapter(lake)
+    assert a.scalar("select count(*) from orders") == 30
+    assert a.scalar("select count(*) from orders where region = 'eu'") == 10  # hive partition column
+    assert a.rows("select order_id, region from orders order by order_id", limit=2) == [
+        {"order_id": 1, "region": "us"},
+        {"order_id": 2, "region": "us"},
+    ]
+    assert a.scalar("select name from customers where customer_id = 2") == "bob"
+    schema = {c["name"]: c for c in a.table_schema("orders")}
+    assert set(schema) == {"order_id", "amount", "region"}
+    assert schema["order_id"]["type"] == "BIGINT" and schema["order_id"]["pk"] is False
+    a.close()
+
+
+def test_read_only_database_gets_temp_views_and_stays_untouched(lake):
+    db = lake / "warehouse.duckdb"
+    con = duckdb.connect(str(db))
+    con.execute("create table targets as select 1 as order_id")
+    con.close()
+    before = db.stat().st_mtime_ns
+
+    readers = [_adapter(lake, database_path=str(db), read_only=True) for _ in range(2)]
+    for a in readers:
+        assert a.scalar("select count(*) from orders o join targets t using (order_id)") == 1
+        assert a.scalar("select count(*) from duckdb_views() where view_name = 'orders' and temporary") == 1
+        with pytest.raises(duckdb.Error):
+            a.scalar("create table scratch (x int)")
+        a.close()
+    assert db.stat().st_mtime_ns == before
+
+
+def test_data_version_changes_when_a_partition_file_is_added(lake):
+    a = _adapter(lake)
+    version, identity = a.data_version(), a.cache_identity()
+    assert a.data_version() == version
+
+    (lake / "orders" / "region=apac").mkdir()
+    con = duckdb.connect()
+    con.execute(f"COPY (SELECT 99 AS order_id, 1.0 AS amount) TO '{lake}/orders/region=apac/extra.parquet' (FORMAT parquet)")
+    con.close()
+    assert a.data_version() != version
+    assert a.scalar("select count(*) from orders where region = 'apac'") == 1
+    assert a.cache_identity() == identity
+    assert DuckDBAdapter().data_version() is None  # nothing on disk to version
+    a.sources["remote"] = {"path": "s3://bucket/orders/*.parquet", "format": "parquet"}
+    assert a.data_version() is None  # remote objects are never cached
+    a.close()
+
+
+def test_registry_builds_a_cached_duckdb_adapter(lake, tmp_path):
+    cfg = {
+        "kind": "duckdb",
+        "sources": {"orders": {"path": f"{lake}/orders/**/*.parquet", "format": "parquet"}},
+        "threads": 2,
+        "cache": {"enabled": True, "path": str(tmp_path / "cache.sqlite")},
+    }
+    a = create_adapter(cfg, read_only=True)
+    sql = "select sum(amount) from orders"
+    assert a.scalar(sql) == a.scalar(sql) == pytest.approx(697.5)
+    assert a.cache.hits >= 1
+    before = a.cache.bypassed
+    a.scalar("select count(*) from orders where today() > date '2000-01-01'")
+    assert a.cache.bypassed == before + 1
+    a.close()
+
+    with pytest.raises(ValueError, match="Unsupported source format"):
+        DuckDBAdapter(sources={"x": {"path": "x.json", "format": "json"}})
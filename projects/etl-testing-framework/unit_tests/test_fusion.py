@@ -0,0 +1,87 @@
+import sqlite3
+
+import pytest
+
+from framework import models
+from framework.adapters.sqlite_adapter import SQLiteAdapter
+from framework.fusion import FusedAdapter, plan, prefetch, scalar_parts
+
+
+def _case(sql, type_="business_rule"):
+    return models.TestCase(id=sql, type=type_, severity="high", params={"sql": sql}, tags=[])
+
+
+@pytest.fixture
+def adapter(tmp_path):
+    db = tmp_path / "t.db"
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        """
+        create table orders (id integer, customer_id integer, amount real, note text);
+        create table customers (id integer, status text);
+        insert into orders values (1, 1, 10, 'where'), (2, 1, -5, null), (3, 2, 7, 'x'), (4, 9, 0, 'where to');
+        insert into customers values (1, 'active'), (2, 'closed');
+        """
+    )
+    conn.commit()
+    conn.close()
+    a = SQLiteAdapter(str(db))
+    yield a
+    a.close()
+
+
+@pytest.mark.parametrize("sql, expected", [
+    ("select count(*) from orders where note = 'a where b'", ("orders", "COUNT(CASE WHEN (note = 'a where b') THEN 1 END)")),
+    ("select count(*) from orders where customer_id not in (select id from customers where status = 'active')",
+     ("orders", "COUNT(CASE WHEN (customer_id not in (select id from customers where status = 'active')) THEN 1 END)")),
+    ("select count(*) from orders o join customers c on c.id = o.customer_id where c.status = 'closed'",
+     ("orders o join customers c on c.id = o.customer_id", "COUNT(CASE WHEN (c.status = 'closed') THEN 1 END)")),
+    ("select count(*) from (select id from orders where amount > 0) t", ("(select id from orders where amount > 0) t", "COUNT(*)")),
+    ("select count(*) from orders -- where amount < 0", ("orders", "COUNT(*)")),
+    ("select count(*) from orders /* where */ where amount < 0 -- negative", ("orders", "COUNT(CASE WHEN (amount < 0) THEN 1 END)")),
+    ("select sum(amount) from orders", ("orders", "sum(amount)")),
+])
+def test_scalar_parts_splits_on_the_top_level_where(sql, expected):
+    assert scalar_parts(sql) == expected
+
+
+@pytest.mark.parametrize("sql", [
+    "select distinct count(*) from orders",
+    "select count(*) from orders group by customer_id",
+    "select count(*) from orders where amount > 0 group by customer_id having count(*) > 1",
+    "select count(*) from orders union all select count(*) from customers",
+    "select sum(amount) from orders where amount > 0",
+    "select id from orders",
+    "select min(id), max(id) from orders",
+])
+def test_scalar_parts_rejects_queries_that_do_not_fuse(sql):
+    assert scalar_parts(sql) is None
+
+
+def test_fused_values_match_the_individual_queries(adapter):
+    sqls = [
+        "select count(*) from orders where amount < 0",
+        "select count(*) from orders where note like '%where%' -- notes mentioning where",
+        "select count(*) from orders",
+        "select sum(amount) from orders",
+        "select count(*) from orders where customer_id not in (select id from customers)",
+        "select count(*) from customers",
+    ]
+    fused = plan([_case(s) for s in sqls])
+    assert [q["from"] for q in fused] == ["orders"]
+    values = prefetch(adapter, fused)
+    assert set(values) == set(sqls[:5])
+    view = FusedAdapter(adapter, values)
+    assert [view.scalar(s) for s in sqls] == [adapter.scalar(s) for s in sqls] == [1, 2, 4, 12, 1, 2]
+
+
+def test_failed_fused_query_falls_back_to_individual_queries(adapter):
+    sqls = ["select count(*) from orders where amount < 0", "select count(*) from orders where no_such_column > 0"]
+    fused = plan([_case(s) for s in sqls])
+    assert len(fused) == 1
+    values = prefetch(adapter, fused)
+    assert values == {}
+    view = FusedAdapter(adapter, values)
+    assert view.scalar(sqls[0]) == 1
+    with pytest.raises(sqlite3.OperationalError):
+        view.scalar(sqls[1])  # the broken check fails on its own, as it would unfused
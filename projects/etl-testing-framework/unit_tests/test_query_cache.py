@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from framework.adapters.duckdb_adapter import DuckDBAdapter
+from framework.adapters.query_cache import CachedAdapter, QueryCache, is_cacheable
+from framework.adapters.sqlite_adapter import SQLiteAdapter
+
+LAG_SQL = "select cast((julianday() - julianday(max(loaded_at))) * 24 as integer) from loads"
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "w.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("create table loads (id integer, loaded_at text); insert into loads values (1, '2026-01-01 00:00:00');")
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def cached(db, tmp_path):
+    cache = QueryCache(str(tmp_path / "cache.sqlite"))
+    adapter = CachedAdapter(SQLiteAdapter(str(db)), cache)
+    yield adapter
+    adapter.adapter.close()
+    cache.conn.close()
+
+
+@pytest.mark.parametrize("adapter, sql", [
+    (SQLiteAdapter, LAG_SQL),
+    (SQLiteAdapter, "select count(*) from loads where loaded_at >= date()"),
+    (SQLiteAdapter, "select count(*) from loads where loaded_at < datetime( )"),
+    (SQLiteAdapter, "select unixepoch() - max(unixepoch(loaded_at)) from loads"),
+    (SQLiteAdapter, "select strftime('%s') - 1 from loads"),
+    (SQLiteAdapter, "select count(*) from loads where loaded_at > datetime('now', '-1 day')"),
+    (DuckDBAdapter, "select count(*) from loads where loaded_at > now() - interval 1 day"),
+    (DuckDBAdapter, "select today() - max(loaded_at::date) from loads"),
+    (DuckDBAdapter, "select get_current_timestamp() - max(loaded_at) from loads"),
+    (DuckDBAdapter, "select count(*) from loads where id::varchar <> uuid()::varchar"),
+    (DuckDBAdapter, "select count(*) from loads where loaded_at < current_timestamp"),
+])
+def test_clock_and_random_sql_is_not_cacheable(adapter, sql):
+    assert not is_cacheable(sql, adapter.VOLATILE_SQL)
+
+
+@pytest.mark.parametrize("adapter, sql", [
+    (SQLiteAdapter, "select count(*) from loads where date(loaded_at) = '2026-01-01'"),
+    (SQLiteAdapter, "select max(strftime('%Y', loaded_at)) from loads"),
+    (DuckDBAdapter, "select count(*) from loads where nowhere_flag = 0"),
+])
+def test_data_only_sql_is_cacheable(adapter, sql):
+    assert is_cacheable(sql, adapter.VOLATILE_SQL)
+
+
+def test_lag_query_bypasses_the_cache(cached):
+    cached.scalar(LAG_SQL)
+    cached.scalar(LAG_SQL)
+    stats = cached.cache.stats()
+    assert (stats["bypassed"], stats["hits"], stats["misses"], stats["entries"]) == (2, 0, 0, 0)
+
+
+def test_write_invalidates_cached_result(cached, db):
+    sql = "select count(*) from loads"
+    assert cached.scalar(sql) == 1
+    assert cached.scalar(sql) == 1
+    assert cached.cache.hits == 1
+
+    conn = sqlite3.connect(db)
+    conn.execute("insert into loads values (2, '2026-01-02 00:00:00')")
+    conn.commit()
+    conn.close()
+    assert cached.scalar(sql) == 2
+    assert cached.cache.misses == 2
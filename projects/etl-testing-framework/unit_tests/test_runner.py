@@ -0,0 +1,102 @@
+import sqlite3
+import xml.etree.ElementTree as ET
+
+import pytest
+import yaml
+
+from framework import config_loader
+from framework.runner import main, run_suite
+
+TESTS = [
+    {"id": "schema_orders", "type": "schema", "severity": "critical", "tags": ["schema"],
+     "params": {"table": "orders", "expected_columns": [{"name": "id", "type": "INTEGER", "nullable": False}]}},
+    {"id": "rowcount_orders", "type": "rowcount_recon", "severity": "high", "tags": ["recon"],
+     "params": {"source_sql": "select count(*) from staging", "target_sql": "select count(*) from orders", "tolerance_pct": 0}},
+    {"id": "amount_positive", "type": "business_rule", "severity": "critical", "tags": ["rule"],
+     "params": {"sql": "select count(*) from orders where amount <= 0", "expected": 0}},
+    {"id": "broken_sql", "type": "business_rule", "severity": "medium", "tags": ["rule"],
+     "params": {"sql": "select count(*) from no_such_table", "expected": 0}},
+    {"id": "row_hash", "type": "checksum", "severity": "medium", "tags": ["recon"], "params": {}},
+]
+
+
+@pytest.fixture
+def suite(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_loader, "SUITE_CACHE_DIR", "")
+    db = tmp_path / "w.db"
+    conn = sqlite3.connect(db)
+    conn.executescript(
+        """
+        create table orders (id integer not null, amount real);
+        create table staging (id integer);
+        insert into orders values (1, 10), (2, -1), (3, 5);
+        insert into staging values (1), (2), (3);
+        """
+    )
+    conn.commit()
+    conn.close()
+    cfg = tmp_path / "tests.yaml"
+    cfg.write_text(yaml.safe_dump({
+        "suite": "unit_suite",
+        "ai": {"enabled": False},
+        "adapter": {"kind": "sqlite", "database_path": str(db)},
+        "tests": TESTS,
+    }))
+    return cfg
+
+
+def _junit(path):
+    suite = ET.parse(path).getroot().find("testsuite")
+    cases = {c.get("name"): c for c in suite.findall("testcase")}
+    outcome = {name: next((child.tag for child in c), "passed") for name, c in cases.items()}
+    return suite, cases, outcome
+
+
+def test_parallel_run_maps_outcomes_into_junit(suite, tmp_path):
+    junit = tmp_path / "out" / "junit.xml"
+    summary = run_suite(str(suite), workers=3, junit_path=str(junit))
+
+    assert (summary["total"], summary["passed"], summary["failed"], summary["error"], summary["skipped"]) == (5, 2, 1, 1, 1)
+    assert summary["ok"] is False and summary["workers"] == 3
+    assert [r.id for r in summary["results"]] == [t["id"] for t in TESTS]  # config order, whatever finishes first
+
+    root, cases, outcome = _junit(junit)
+    assert root.get("name") == "unit_suite"
+    assert (root.get("tests"), root.get("failures"), root.get("errors"), root.get("skipped")) == ("5", "1", "1", "1")
+    assert outcome == {
+        "schema_orders": "passed",
+        "rowcount_orders": "passed",
+        "amount_positive": "failure",
+        "broken_sql": "error",
+        "row_hash": "skipped",
+    }
+    assert cases["amount_positive"].get("classname") == "unit_suite.critical"
+    assert "AI_TRIAGE" in cases["amount_positive"].find("failure").text
+    assert "OperationalError" in cases["broken_sql"].find("error").get("message")
+    assert "checksum" in cases["row_hash"].find("skipped").get("message")
+
+
+@pytest.mark.parametrize("tags, severities, expected", [
+    (["rule"], None, ["amount_positive", "broken_sql"]),
+    (None, ["critical"], ["schema_orders", "amount_positive"]),
+    (["recon", "rule"], ["medium"], ["broken_sql", "row_hash"]),
+])
+def test_tag_and_severity_selection(suite, tags, severities, expected):
+    summary = run_suite(str(suite), include_tags=tags, severities=severities, workers=2, junit_path=None)
+    assert [r.id for r in summary["results"]] == expected
+
+
+def test_fused_and_unfused_runs_agree(suite):
+    fused = run_suite(str(suite), workers=2, junit_path=None)
+    plain = run_suite(str(suite), workers=2, junit_path=None, fuse=False)
+    assert fused["fused_queries"] == 1 and plain["fused_queries"] == 0
+    assert [(r.id, r.status) for r in fused["results"]] == [(r.id, r.status) for r in plain["results"]]
+
+
+def test_cli_exit_code_and_summary_line(suite, tmp_path, capsys):
+    assert main(["--config", str(suite), "--junit", str(tmp_path / "j.xml"), "--tag", "schema"]) == 0
+    assert capsys.readouterr().out.startswith("1 passed in ")
+    assert main(["--config", str(suite), "--junit", str(tmp_path / "j.xml"), "--workers", "2"]) == 1
+    out = capsys.readouterr().out
+    assert "FAILED amount_positive" in out and "ERROR broken_sql" in out
+    assert "1 failed, 2 passed, 1 skipped, 1 error in " in out
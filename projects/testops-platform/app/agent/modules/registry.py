@@ -3,6 +3,7 @@ from app.agent.modules.non_functional_agent import NonFunctionalAgent
 from app.agent.modules.security_agent import SecurityAgent
 from app.agent.modules.api_agent import APIAgent
 from app.agent.modules.accessibility_agent import AccessibilityAgent
+from app.jobs import cancellation_requested
 
 
 class AgentRegistry:
@@ -24,5 +25,7 @@ class AgentRegistry:
     def run_all(self, cfg: dict):
         out = []
         for name in self.list():
+            if cancellation_requested():
+                break
             out.append(self._agents[name].run(cfg))
         return out
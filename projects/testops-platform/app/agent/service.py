@@ -2,7 +2,7 @@ import json
 import subprocess
 from pathlib import Path
 
-from app.core.config import load_config
+from app.core.config import ConfigBoundCache, load_config
 from app.core.orchestrator import run_product_suite
 from app.channels.base import ChannelMessage
 from app.agent.modules.registry import AgentRegistry
@@ -121,3 +121,10 @@ class AgentService:
             return f"Agent goal failed. tail: {(p.stderr or p.stdout)[-600:]}"
 
         return "Unknown command. Use /help"
+
+
+_services = ConfigBoundCache(AgentService)
+
+
+def get_agent_service(config_path: str = "config/product.yaml") -> AgentService:
+    return _services.get(config_path)
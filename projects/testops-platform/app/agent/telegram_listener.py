@@ -1,18 +1,14 @@
 import time
-from app.agent.service import AgentService
-from app.channels.registry import ChannelRegistry
+from app.agent.service import get_agent_service
+from app.channels.registry import get_channel_registry
 
 
 def run_telegram_listener(config_path: str = "config/product.yaml"):
-    from app.core.config import load_config
-
-    cfg = load_config(config_path)
-    reg = ChannelRegistry(cfg)
-    tg = reg.get("telegram")
+    tg = get_channel_registry(config_path).get("telegram")
     if not tg or not tg.token:
         raise RuntimeError("Telegram bot token not configured")
 
-    agent = AgentService(config_path=config_path)
+    agent = get_agent_service(config_path)
     while True:
         messages = tg.poll()
         for m in messages:
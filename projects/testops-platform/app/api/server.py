@@ -1,18 +1,19 @@
-from fastapi import FastAPI, Request, Depends, WebSocket
-from fastapi.responses import HTMLResponse, RedirectResponse, PlainTextResponse
+from fastapi import FastAPI, Request, Depends, WebSocket, HTTPException
+from fastapi.responses import HTMLResponse, RedirectResponse, PlainTextResponse, JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from pathlib import Path
+from datetime import datetime, timedelta, timezone
 import json
 import os
-import subprocess
 import sys
+import time
 import asyncio
 
 from app.core.config import load_config
 from app.core.orchestrator import run_product_suite
-from app.agent.service import AgentService
+from app.agent.service import get_agent_service
 from app.channels.base import ChannelMessage
-from app.channels.registry import ChannelRegistry
+from app.channels.registry import get_channel_registry
 from app.api.schemas import AgentMessageRequest, RunAgentRequest, RunWorkflowRequest
 from app.api.workflows import list_workflows
 from app.api.artifacts_io import list_artifacts, read_artifact
@@ -21,6 +22,7 @@ from app.testdata.manager import list_profiles, seed_profile, load_profile, gene
 from app.mobile.runner import list_devices as mobile_list_devices, run_mobile_checks, last_report as mobile_last_report
 from app.auth.rbac import get_role, require_role
 from app.state.logbus import logbus
+from app.jobs import TERMINAL, jobs, JobNotCancellable, JobQueueFull, cancellation_requested, run_subprocess
 from app.channels.config.store import list_tenants, get_tenant, upsert_tenant
 from app.worldclass.strategy_planner import plan_agents_from_goal
 from app.worldclass.policy_engine import evaluate_release
@@ -31,6 +33,7 @@ from app.v3.eval.harness import evaluate_run, persist_benchmark
 from app.v3.remediation.governance import propose_remediation, apply_remediation
 from app.v31.queue.backend import queue_backend_status
 from app.v31.observability.exporters import prometheus_text
+from app.core.http_client import http_metrics
 from app.v31.governance.audit import log_approval, list_audit
 from app.integrations.jira import create_jira_issue
 from app.integrations.testrail import create_test_run
@@ -71,7 +74,9 @@ from app.wave32.promotion.gates import evaluate_promotion
 from app.wave32.visual.regression import compare_snapshot
 from app.wave32.performance.percentiles import compute_percentiles
 from app.wave32.chaos.scenarios import run_chaos_scenario
+from app.etl.batch import run_etl_profiles
 from app.etl.engine import run_etl_profile, list_profiles as list_etl_profiles, load_last_report as load_last_etl_report
+from app.etl.history import BUCKETS as ETL_HISTORY_BUCKETS, pass_rate as etl_pass_rate, violation_trend as etl_violation_trend
 from app.wave4.contract.executor import execute_contract
 from app.wave4.drift.analyzer import analyze_drift, list_drift_reports
 from app.wave4.security.fuzzer import run_fuzz, list_fuzz_reports
@@ -92,6 +97,23 @@ app = FastAPI(title="TestOps Platform API", version="1.4.0")
 templates = Jinja2Templates(directory="app/ui/templates")
 
 
+def _run_or_submit(kind: str, work, wait: bool, params: dict | None = None, cancellable: bool = True):
+    """Run ``work`` inline (wait=true, the legacy behaviour) or queue it as a job and return 202.
+
+    Pass ``cancellable=False`` when ``work`` never checks ``cancellation_requested()``.
+    """
+    if wait:
+        return work()
+    try:
+        job = jobs.submit(kind, work, params, cancellable=cancellable)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    return JSONResponse(
+        status_code=202,
+        content={"ok": True, "job_id": job.id, "status": job.status, "status_url": f"/jobs/{job.id}", "events_url": f"/jobs/{job.id}/events"},
+    )
+
+
 @app.get("/health")
 def health():
     etl_cfg_ok = Path("etl/profiles.yaml").exists()
@@ -129,41 +151,64 @@ def ui_home(request: Request):
 
 
 @app.websocket("/ws/logs")
-async def ws_logs(ws: WebSocket):
+async def ws_logs(ws: WebSocket, since: int | None = None, level: str | None = None, msg: str | None = None):
     await ws.accept()
-    last = 0
+    levels = [x for x in (level or "").split(",") if x.strip()] or None
+    gap = since is not None and since + 1 < logbus.oldest_seq()
+    sub, replay = logbus.subscribe(since=since, levels=levels, msg=msg)
+    receiver = asyncio.create_task(ws.receive())
     try:
+        await ws.send_json({"events": replay, "seq": logbus.seq, "replay": True, "gap": gap})
         while True:
-            data = logbus.tail(200)
-            if len(data) != last:
-                await ws.send_json({"events": data[-50:]})
-                last = len(data)
-            await asyncio.sleep(1)
+            getter = asyncio.create_task(sub.get())
+            done, _ = await asyncio.wait({getter, receiver}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                events = [getter.result()] + sub.drain()
+                await ws.send_json({"events": events, "seq": events[-1]["seq"], "dropped": sub.dropped})
+            else:
+                getter.cancel()
+            if receiver in done:
+                if receiver.result().get("type") == "websocket.disconnect":
+                    break
+                receiver = asyncio.create_task(ws.receive())
     except Exception:
-        await ws.close()
+        pass
+    finally:
+        receiver.cancel()
+        sub.close()
+        try:
+            await ws.close()
+        except Exception:
+            pass
 
 
 @app.post("/ui/run")
-def ui_run(config_path: str = "config/product.yaml", role: str = Depends(get_role)):
+def ui_run(config_path: str = "config/product.yaml", wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    cfg = load_config(config_path)
-    findings, report = run_product_suite(cfg)
-    logbus.push("info", "suite_run", {"status": "PASS" if report["counts"]["fail"] == 0 and report["counts"]["error"] == 0 else "FAIL", "counts": report["counts"]})
+
+    def _work():
+        cfg = load_config(config_path)
+        _, report = run_product_suite(cfg, collect=False)
+        logbus.push("info", "suite_run", {"status": "PASS" if report["counts"]["fail"] == 0 and report["counts"]["error"] == 0 else "FAIL", "counts": report["counts"]})
+        return {"counts": report["counts"]}
+
+    if wait:
+        _work()
+    else:
+        _run_or_submit("ui_run", _work, False, {"config_path": config_path})
     return RedirectResponse(url="/", status_code=303)
 
 
 @app.get("/channels")
 def channels(config_path: str = "config/product.yaml", role: str = Depends(get_role)):
     require_role(role, ["admin", "operator", "viewer"])
-    cfg = load_config(config_path)
-    reg = ChannelRegistry(cfg)
-    return {"supported": reg.SUPPORTED_CHANNELS}
+    return {"supported": get_channel_registry(config_path).SUPPORTED_CHANNELS}
 
 
 @app.get("/agents")
 def agents(config_path: str = "config/product.yaml", role: str = Depends(get_role)):
     require_role(role, ["admin", "operator", "viewer"])
-    a = AgentService(config_path)
+    a = get_agent_service(config_path)
     return {"agents": a.registry.list()}
 
 
@@ -174,60 +219,72 @@ def workflows(role: str = Depends(get_role)):
 
 
 @app.post("/workflows/run")
-def run_workflow(req: RunWorkflowRequest, role: str = Depends(get_role)):
+def run_workflow(req: RunWorkflowRequest, wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    env = os.environ.copy()
-    env["PYTHONPATH"] = str(Path("../agentic-automation-framework-python").resolve())
-    cmd = [sys.executable, "../agentic-automation-framework-python/main.py", "--workflow", req.workflow_path]
-    if req.notify:
-        cmd.append("--notify")
-    p = subprocess.run(cmd, capture_output=True, text=True, env=env)
-    payload = {
-        "ok": p.returncode == 0,
-        "returncode": p.returncode,
-        "stdout_tail": p.stdout[-1200:],
-        "stderr_tail": p.stderr[-1200:],
-    }
-    logbus.push("info", "workflow_run", {"workflow": req.workflow_path, "ok": payload["ok"]})
-    return payload
+
+    def _work():
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(Path("../agentic-automation-framework-python").resolve())
+        cmd = [sys.executable, "../agentic-automation-framework-python/main.py", "--workflow", req.workflow_path]
+        if req.notify:
+            cmd.append("--notify")
+        p = run_subprocess(cmd, env=env)  # killed if the job is cancelled
+        payload = {
+            "ok": p.returncode == 0,
+            "returncode": p.returncode,
+            "stdout_tail": p.stdout[-1200:],
+            "stderr_tail": p.stderr[-1200:],
+        }
+        logbus.push("info", "workflow_run", {"workflow": req.workflow_path, "ok": payload["ok"]})
+        return payload
+
+    return _run_or_submit("workflow_run", _work, wait, {"workflow_path": req.workflow_path})
 
 
 @app.post("/run")
-def run_all(config_path: str = "config/product.yaml", role: str = Depends(get_role)):
+def run_all(config_path: str = "config/product.yaml", wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    cfg = load_config(config_path)
-    findings, report = run_product_suite(cfg)
-    payload = {
-        "status": "PASS" if report["counts"]["fail"] == 0 and report["counts"]["error"] == 0 else "FAIL",
-        "counts": report["counts"],
-        "reports": report,
-        "findings": [f.__dict__ for f in findings],
-    }
-    logbus.push("info", "suite_run", {"status": payload["status"], "counts": payload["counts"]})
-    if payload["counts"].get("error", 0) > 0:
-        payload["wave5_alert"] = notify_critical_failure("/run", payload["counts"])
-    return payload
+
+    def _work():
+        cfg = load_config(config_path)
+        findings, report = run_product_suite(cfg)
+        payload = {
+            "status": "PASS" if report["counts"]["fail"] == 0 and report["counts"]["error"] == 0 else "FAIL",
+            "counts": report["counts"],
+            "reports": report,
+            "findings": [f.__dict__ for f in findings],
+        }
+        logbus.push("info", "suite_run", {"status": payload["status"], "counts": payload["counts"]})
+        if payload["counts"].get("error", 0) > 0:
+            payload["wave5_alert"] = notify_critical_failure("/run", payload["counts"])
+        return payload
+
+    return _run_or_submit("suite_run", _work, wait, {"config_path": config_path})
 
 
 @app.post("/agent/run")
-def agent_run(req: RunAgentRequest, role: str = Depends(get_role)):
+def agent_run(req: RunAgentRequest, wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    agent = AgentService(config_path=req.config_path)
-    if req.agent:
-        r = agent.run_one_agent(req.agent)
-        if not r:
-            return {"ok": False, "error": f"Unknown agent: {req.agent}"}
-        logbus.push("info", "agent_run", {"agent": req.agent, "status": r.status})
-        return {"ok": True, "result": r.__dict__}
-    all_result = agent.run_all_agents()
-    logbus.push("info", "agent_run_all", {"status": all_result.get("status")})
-    return {"ok": True, "result": all_result}
+    agent = get_agent_service(req.config_path)
+    if req.agent and not agent.registry.get(req.agent):
+        return {"ok": False, "error": f"Unknown agent: {req.agent}"}
+
+    def _work():
+        if req.agent:
+            r = agent.run_one_agent(req.agent)
+            logbus.push("info", "agent_run", {"agent": req.agent, "status": r.status})
+            return {"ok": True, "result": r.__dict__}
+        all_result = agent.run_all_agents()
+        logbus.push("info", "agent_run_all", {"status": all_result.get("status")})
+        return {"ok": True, "result": all_result}
+
+    return _run_or_submit("agent_run", _work, wait, {"config_path": req.config_path, "agent": req.agent})
 
 
 @app.post("/agent/message")
 def agent_message(req: AgentMessageRequest, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator", "viewer"])
-    agent = AgentService(config_path=req.config_path)
+    agent = get_agent_service(req.config_path)
     response = agent.handle(
         ChannelMessage(
             channel=req.channel,
@@ -247,7 +304,7 @@ def webhook(channel: str, payload: dict):
     user_id = str(payload.get("user_id") or payload.get("from") or "unknown")
     chat_id = str(payload.get("chat_id") or payload.get("conversation_id") or user_id)
 
-    agent = AgentService(config_path="config/product.yaml")
+    agent = get_agent_service("config/product.yaml")
     response = agent.handle(ChannelMessage(channel=channel, user_id=user_id, chat_id=chat_id, text=text, raw=payload))
     logbus.push("info", "webhook_message", {"channel": channel, "text": text[:120]})
     return {"ok": True, "channel": channel, "response": response}
@@ -256,11 +313,10 @@ def webhook(channel: str, payload: dict):
 @app.post('/channels/send')
 def channels_send(payload: dict, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    cfg = load_config(str(payload.get('config_path', 'config/product.yaml')))
+    reg = get_channel_registry(str(payload.get('config_path', 'config/product.yaml')))
     channel = str(payload.get('channel', 'telegram'))
     chat_id = str(payload.get('chat_id', ''))
     text = str(payload.get('text', '')).strip()
-    reg = ChannelRegistry(cfg)
     adapter = reg.get(channel)
     if not adapter:
         return {"ok": False, "error": f"unsupported channel: {channel}"}
@@ -298,14 +354,21 @@ def worldclass_plan(payload: dict, role: str = Depends(get_role)):
 
 
 @app.post("/worldclass/run-goal")
-def worldclass_run_goal(payload: dict, role: str = Depends(get_role)):
+def worldclass_run_goal(payload: dict, wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
     goal = str(payload.get("goal", ""))
+    config_path = str(payload.get("config_path", "config/product.yaml"))
+    return _run_or_submit("worldclass_run_goal", lambda: _worldclass_run_goal(goal, config_path), wait, {"goal": goal})
+
+
+def _worldclass_run_goal(goal: str, config_path: str):
     agents = plan_agents_from_goal(goal)
-    svc = AgentService(config_path=str(payload.get("config_path", "config/product.yaml")))
+    svc = get_agent_service(config_path)
 
     results = []
     for a in agents:
+        if cancellation_requested():
+            break
         r = svc.run_one_agent(a)
         if r:
             results.append(r.__dict__)
@@ -340,7 +403,7 @@ def worldclass_maturity(role: str = Depends(get_role)):
 
 @instrument("v3_run_distributed")
 def _run_one_agent_task(config_path: str, agent_name: str):
-    svc = AgentService(config_path=config_path)
+    svc = get_agent_service(config_path)
     r = svc.run_one_agent(agent_name)
     return r.__dict__ if r else {"agent": agent_name, "status": "ERROR", "summary": "unknown agent", "details": {}}
 
@@ -395,6 +458,12 @@ def v31_metrics(role: str = Depends(get_role)):
     return prometheus_text()
 
 
+@app.get("/v3.1/http/metrics")
+def v31_http_metrics(role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    return http_metrics()
+
+
 @app.post("/v3.1/remediation/apply")
 def v31_remediation_apply(payload: dict, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
@@ -661,12 +730,33 @@ def etl_profiles(role: str = Depends(get_role)):
 
 
 @app.post('/etl/run')
-def etl_run(payload: dict, role: str = Depends(get_role)):
+def etl_run(payload: dict, wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
     profile = payload.get('profile')
-    report = run_etl_profile(profile)
-    logbus.push("info", "etl_run", {"profile": report.get("profile"), "status": report.get("status")})
-    return report
+    full_rebuild = bool(payload.get('full_rebuild', False))
+
+    def _work():
+        report = run_etl_profile(profile, full_rebuild=full_rebuild)
+        logbus.push("info", "etl_run", {"profile": report.get("profile"), "status": report.get("status")})
+        return report
+
+    # A single profile is one pass over its files with no step boundary to stop at.
+    return _run_or_submit("etl_run", _work, wait, {"profile": profile, "full_rebuild": full_rebuild}, cancellable=False)
+
+
+@app.post('/etl/run-batch')
+def etl_run_batch(payload: dict, wait: bool = True, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator"])
+    profiles = payload.get('profiles') or None
+    workers = payload.get('workers')
+    full_rebuild = bool(payload.get('full_rebuild', False))
+
+    def _work():
+        report = run_etl_profiles(profiles, workers=workers, full_rebuild=full_rebuild)
+        logbus.push("info", "etl_run_batch", {"profiles": report["summary"]["profiles"], "status": report["status"]})
+        return report
+
+    return _run_or_submit("etl_run_batch", _work, wait, {"profiles": profiles, "workers": workers})
 
 
 @app.get('/etl/last-report')
@@ -675,6 +765,28 @@ def etl_last_report(role: str = Depends(get_role)):
     return load_last_etl_report()
 
 
+def _history_bucket(bucket: str) -> str:
+    if bucket not in ETL_HISTORY_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Unknown bucket: {bucket} (expected one of {sorted(ETL_HISTORY_BUCKETS)})")
+    return bucket
+
+
+@app.get('/etl/history/pass-rate')
+def etl_history_pass_rate(profile: str, days: int = 30, bucket: str = "day", check: str | None = None, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    bucket = _history_bucket(bucket)
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return {"profile": profile, "bucket": bucket, "trend": etl_pass_rate(profile, since, bucket=bucket, check=check)}
+
+
+@app.get('/etl/history/violations')
+def etl_history_violations(profile: str, days: int = 30, bucket: str = "day", check: str | None = None, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    bucket = _history_bucket(bucket)
+    since = datetime.now(timezone.utc) - timedelta(days=days)
+    return {"profile": profile, "bucket": bucket, "trend": etl_violation_trend(profile, check, since, bucket=bucket)}
+
+
 @app.get('/wave1/auth/jwt/verify')
 def wave1_jwt_verify(claims: dict = Depends(get_claims)):
     return {"ok": True, "claims": claims, "role": role_from_claims(claims)}
@@ -920,13 +1032,70 @@ def wave4_security_fuzz_reports(limit: int = 20, role: str = Depends(get_role)):
 
 
 @app.post('/wave4/performance/soak')
-def wave4_performance_soak(payload: dict, role: str = Depends(get_role)):
+def wave4_performance_soak(payload: dict, wait: bool = True, role: str = Depends(get_role)):
     require_role(role, ["admin", "operator"])
-    return run_soak(
-        duration_seconds=int(payload.get('duration_seconds', 60)),
-        interval_ms=int(payload.get('interval_ms', 200)),
-        jitter_ms=int(payload.get('jitter_ms', 25)),
-    )
+    params = {
+        "duration_seconds": int(payload.get('duration_seconds', 60)),
+        "interval_ms": int(payload.get('interval_ms', 200)),
+        "jitter_ms": int(payload.get('jitter_ms', 25)),
+    }
+    return _run_or_submit("wave4_soak", lambda: run_soak(**params), wait, params)
+
+
+@app.get('/jobs')
+def jobs_list(limit: int = 50, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    return {"jobs": jobs.list(limit=limit)}
+
+
+@app.get('/jobs/{job_id}')
+async def jobs_get(job_id: str, wait_s: float = 0, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+    if wait_s > 0:
+        # Long-poll on the event loop, so a waiting client holds no worker thread.
+        until = time.monotonic() + min(wait_s, 60)
+        while job.status not in TERMINAL and (left := until - time.monotonic()) > 0:
+            await jobs.next_change(job, job.version, timeout=left)
+    return job.as_dict()
+
+
+@app.post('/jobs/{job_id}/cancel')
+def jobs_cancel(job_id: str, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator"])
+    try:
+        job = jobs.cancel(job_id)
+    except JobNotCancellable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not job:
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+    return job.as_dict(include_result=False)
+
+
+@app.get('/jobs/{job_id}/events')
+async def jobs_events(job_id: str, role: str = Depends(get_role)):
+    require_role(role, ["admin", "operator", "viewer"])
+    job = jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail=f"unknown job: {job_id}")
+
+    async def _stream():
+        seen = -1
+        while True:
+            if job.version == seen:
+                await jobs.next_change(job, seen)
+                if job.version == seen:
+                    yield ": keep-alive\n\n"
+                    continue
+            seen = job.version
+            done = job.status in ("SUCCEEDED", "FAILED", "CANCELLED")
+            yield f"event: {'result' if done else 'status'}\ndata: {json.dumps(job.as_dict(include_result=done), default=str)}\n\n"
+            if done:
+                return
+
+    return StreamingResponse(_stream(), media_type="text/event-stream")
 
 
 @app.get('/wave4/performance/soak/reports')
@@ -1,4 +1,4 @@
-import requests
+from app.core.http_client import http
 from app.channels.base import ChannelAdapter
 
 
@@ -11,7 +11,7 @@ class DiscordAdapter(ChannelAdapter):
     def send(self, chat_id: str, text: str):
         if not self.bot_token or not chat_id:
             return None
-        r = requests.post(
+        r = http.post(
             f"https://discord.com/api/v10/channels/{chat_id}/messages",
             headers={"Authorization": f"Bot {self.bot_token}", "Content-Type": "application/json"},
             json={"content": text},
@@ -1,3 +1,4 @@
+from app.core.config import ConfigBoundCache, load_config
 from app.channels.telegram import TelegramAdapter
 from app.channels.slack import SlackAdapter
 from app.channels.discord import DiscordAdapter
@@ -55,3 +56,10 @@ class ChannelRegistry:
         if name == "signal":
             return self.signal
         return None
+
+
+_registries = ConfigBoundCache(lambda path: ChannelRegistry(load_config(path)))
+
+
+def get_channel_registry(config_path: str = "config/product.yaml") -> ChannelRegistry:
+    return _registries.get(config_path)
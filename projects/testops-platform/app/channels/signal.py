@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 from app.channels.base import ChannelAdapter
 
@@ -13,7 +13,7 @@ class SignalAdapter(ChannelAdapter):
     def send(self, chat_id: str, text: str):
         if not self.bridge_url or not chat_id:
             return None
-        r = requests.post(
+        r = http.post(
             self.bridge_url,
             json={"recipient": chat_id, "message": text},
             timeout=20,
@@ -1,4 +1,4 @@
-import requests
+from app.core.http_client import http
 from app.channels.base import ChannelAdapter
 
 
@@ -11,7 +11,7 @@ class SlackAdapter(ChannelAdapter):
     def send(self, chat_id: str, text: str):
         if not self.bot_token or not chat_id:
             return None
-        r = requests.post(
+        r = http.post(
             "https://slack.com/api/chat.postMessage",
             headers={"Authorization": f"Bearer {self.bot_token}", "Content-Type": "application/json"},
             json={"channel": chat_id, "text": text},
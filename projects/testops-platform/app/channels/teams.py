@@ -1,4 +1,4 @@
-import requests
+from app.core.http_client import http
 
 from app.channels.base import ChannelAdapter
 
@@ -14,7 +14,7 @@ class TeamsAdapter(ChannelAdapter):
         target = chat_id if chat_id.startswith("http") else self.webhook_url
         if not target:
             return None
-        r = requests.post(target, json={"text": text}, timeout=30)
+        r = http.post(target, json={"text": text}, timeout=30)
         if r.status_code >= 300:
             raise RuntimeError(f"Teams send failed: {r.status_code} {r.text[:200]}")
         return {"ok": True, "status_code": r.status_code, "body": r.text[:200]}
@@ -1,4 +1,4 @@
-import requests
+from app.core.http_client import http
 from typing import List
 from app.channels.base import ChannelAdapter, ChannelMessage
 
@@ -14,7 +14,7 @@ class TelegramAdapter(ChannelAdapter):
     def send(self, chat_id: str, text: str):
         if not self.token or not chat_id:
             return None
-        r = requests.post(
+        r = http.post(
             f"{self.base}/sendMessage",
             json={"chat_id": chat_id, "text": text, "disable_web_page_preview": True},
             timeout=30,
@@ -27,7 +27,7 @@ class TelegramAdapter(ChannelAdapter):
     def poll(self) -> List[ChannelMessage]:
         if not self.token:
             return []
-        r = requests.post(f"{self.base}/getUpdates", json={"offset": self.offset, "timeout": 25}, timeout=40)
+        r = http.post(f"{self.base}/getUpdates", json={"offset": self.offset, "timeout": 25}, timeout=40)
         data = r.json()
         if not data.get("ok"):
             return []
@@ -1,4 +1,4 @@
-import requests
+from app.core.http_client import http
 
 from app.channels.base import ChannelAdapter
 
@@ -15,7 +15,7 @@ class WhatsAppAdapter(ChannelAdapter):
         if not self.token or not self.phone_number_id or not chat_id:
             return None
         url = f"https://graph.facebook.com/{self.api_version}/{self.phone_number_id}/messages"
-        r = requests.post(
+        r = http.post(
             url,
             headers={"Authorization": f"Bearer {self.token}", "Content-Type": "application/json"},
             json={
@@ -1,7 +1,10 @@
+from collections import Counter
+
 from app.core.models import Finding
 
 
-def evaluate_best_practices(cfg: dict, findings: list[Finding]) -> list[Finding]:
+def evaluate_best_practices(cfg: dict, statuses: dict[str, Counter]) -> list[Finding]:
+    """Governance findings from the config and per-domain status counts (``StreamingReportWriter.by_domain``)."""
     out: list[Finding] = []
 
     # 1) Mandatory domains enabled
@@ -20,7 +23,8 @@ def evaluate_best_practices(cfg: dict, findings: list[Finding]) -> list[Finding]
     )
 
     # 2) Critical security gate
-    security_fails = [f for f in findings if f.domain == "security" and f.status in ("FAIL", "ERROR")]
+    security = statuses.get("security", Counter())
+    security_fails = security["FAIL"] + security["ERROR"]
     out.append(
         Finding(
             domain="quality_governance",
@@ -28,7 +32,7 @@ def evaluate_best_practices(cfg: dict, findings: list[Finding]) -> list[Finding]
             severity="critical",
             status="PASS" if not security_fails else "FAIL",
             summary="Security gate" if not security_fails else "Security gate blocked by findings",
-            details={"security_fail_count": len(security_fails)},
+            details={"security_fail_count": security_fails},
         )
     )
 
@@ -1,8 +1,78 @@
+import os
+import threading
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
 import yaml
 
+_LOCK = threading.Lock()
+_CACHE: dict[str, tuple[tuple[int, int], Mapping]] = {}
+
+
+def _freeze(v: Any) -> Any:
+    if isinstance(v, dict):
+        return MappingProxyType({k: _freeze(x) for k, x in v.items()})
+    if isinstance(v, list):
+        return tuple(_freeze(x) for x in v)
+    return v
+
+
+def _validate(cfg: Any, path: Path) -> dict:
+    if cfg is None:
+        cfg = {}
+    if not isinstance(cfg, dict):
+        raise ValueError(f"Invalid config {path}: top level must be a mapping")
+    for section in ("product", "execution", "features", "agent", "reporting"):
+        if not isinstance(cfg.get(section, {}), dict):
+            raise ValueError(f"Invalid config {path}: '{section}' must be a mapping")
+    for name, feat in cfg.get("features", {}).items():
+        if not isinstance(feat, dict):
+            raise ValueError(f"Invalid config {path}: feature '{name}' must be a mapping")
+    return cfg
+
+
+def config_stamp(path: str = "config/product.yaml") -> tuple[int, int]:
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
 
-def load_config(path: str = "config/product.yaml") -> dict:
+
+def load_config(path: str = "config/product.yaml") -> Mapping:
+    """Return the parsed config as a read-only mapping, reparsed only when the file changes."""
     p = Path(path)
+    key = str(p.resolve())
+    stamp = config_stamp(key)
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit and hit[0] == stamp:
+            return hit[1]
     with open(p, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        cfg = _freeze(_validate(yaml.safe_load(f), p))
+    with _LOCK:
+        _CACHE[key] = (stamp, cfg)
+    return cfg
+
+
+def clear_config_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+
+class ConfigBoundCache:
+    """Keeps one object per config path and rebuilds it when that file changes."""
+
+    def __init__(self, factory: Callable[[str], Any]):
+        self.factory = factory
+        self._lock = threading.Lock()
+        self._items: dict[str, tuple[tuple[int, int], Any]] = {}
+
+    def get(self, path: str = "config/product.yaml"):
+        stamp = config_stamp(path)
+        with self._lock:
+            hit = self._items.get(path)
+            if hit and hit[0] == stamp:
+                return hit[1]
+        obj = self.factory(path)
+        with self._lock:
+            self._items[path] = (stamp, obj)
+        return obj
@@ -0,0 +1,61 @@
+import os
+import signal
+import subprocess
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_deadline: ContextVar[float | None] = ContextVar("testops_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextmanager
+def deadline(at: float | None):
+    """Bound the work in this context (and contexts copied from it) by ``time.monotonic()`` value ``at``."""
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the current deadline, or None when there is none."""
+    at = _deadline.get()
+    return None if at is None else max(0.0, at - time.monotonic())
+
+
+def check():
+    """Raise ``DeadlineExceeded`` once the current deadline has passed; in-process work calls this between steps."""
+    if remaining() == 0.0:
+        raise DeadlineExceeded("domain deadline passed")
+
+
+def bounded(timeout_s: float | None) -> float | None:
+    """``timeout_s`` capped by the current deadline."""
+    left = remaining()
+    if left is None:
+        return timeout_s
+    return left if timeout_s is None else min(timeout_s, left)
+
+
+def run_bounded(cmd: list[str], **kwargs) -> subprocess.CompletedProcess:
+    """``subprocess.run(cmd, capture_output=True, text=True)`` that stops at the current deadline.
+
+    The child runs in its own process group, and the whole group (e.g. the
+    browsers or scanners a script starts) is killed when the deadline passes.
+    """
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, start_new_session=True, **kwargs) as p:
+        try:
+            out, err = p.communicate(timeout=remaining())
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(p.pid, signal.SIGKILL)
+            except (AttributeError, ProcessLookupError):
+                p.kill()
+            p.communicate()
+            raise DeadlineExceeded(f"{cmd[0]} killed at the domain deadline")
+    return subprocess.CompletedProcess(cmd, p.returncode, out, err)
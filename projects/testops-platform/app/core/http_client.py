@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+
+class _NoCookies(DefaultCookiePolicy):
+    """Never store or replay cookies: a pooled session is shared by every caller for a host."""
+
+    def set_ok(self, cookie, request):
+        return False
+
+    def return_ok(self, cookie, request):
+        return False
+
+
+def _has_idempotency_key(headers) -> bool:
+    return bool(headers) and any(k.lower() == "idempotency-key" for k in headers)
+
+
+def _retryable(resp: requests.Response, idempotent: bool) -> bool:
+    if resp.status_code == 429 or (resp.status_code == 503 and resp.headers.get("Retry-After")):
+        return True  # not processed: safe to send again whatever the method
+    return idempotent and resp.status_code in RETRY_STATUSES
+
+
+class _HostMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.status_counts: dict[str, int] = {}
+
+    def as_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "avg_ms": round(self.total_ms / self.requests, 2) if self.requests else 0,
+            "max_ms": round(self.max_ms, 2),
+            "status_counts": dict(self.status_counts),
+        }
+
+
+class PooledHttpClient:
+    """Process-wide HTTP client for outbound integrations.
+
+    One ``requests.Session`` per host keeps connections alive between calls,
+    a per-host semaphore bounds concurrency, and retries use full-jitter
+    exponential backoff (or the server's ``Retry-After``):
+
+    - 429, and 503 with ``Retry-After``, are retried for every method: the
+      server did not process the request and asks to come back later;
+    - other 5xx responses and connection errors are retried for idempotent
+      calls only, so a ticket or message is never created twice. A call is
+      idempotent when its method is, or when it carries an ``Idempotency-Key``
+      header; ``idempotent=True`` opts in for APIs that dedupe another way.
+
+    Sessions keep no cookie jar, so a cookie set for one caller is never sent
+    with another caller's request. Pass ``retry=False`` when the status code
+    itself is the answer (health probes).
+    """
+
+    def __init__(self, max_per_host: int = 10, max_retries: int = 3, backoff_base_s: float = 0.2, backoff_max_s: float = 5.0):
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self._lock = threading.Lock()
+        self._sessions: dict[str, requests.Session] = {}
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._metrics: dict[str, _HostMetrics] = {}
+
+    def _host(self, url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def _for_host(self, host: str):
+        with self._lock:
+            if host not in self._sessions:
+                s = requests.Session()
+                s.cookies.set_policy(_NoCookies())
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_per_host)
+                s.mount("http://", adapter)
+                s.mount("https://", adapter)
+                self._sessions[host] = s
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                self._metrics[host] = _HostMetrics()
+            return self._sessions[host], self._slots[host], self._metrics[host]
+
+    def _backoff(self, attempt: int, resp: requests.Response | None) -> float:
+        retry_after = resp.headers.get("Retry-After") if resp is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.backoff_max_s)
+        return random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * (2 ** attempt)))
+
+    def _record(self, m: _HostMetrics, elapsed_ms: float, status: str, error: bool):
+        with self._lock:
+            m.requests += 1
+            m.total_ms += elapsed_ms
+            m.max_ms = max(m.max_ms, elapsed_ms)
+            m.status_counts[status] = m.status_counts.get(status, 0) + 1
+            if error:
+                m.errors += 1
+
+    def request(self, method: str, url: str, retry: bool = True, idempotent: bool | None = None, **kwargs) -> requests.Response:
+        method = method.upper()
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        session, slot, m = self._for_host(self._host(url))
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS or _has_idempotency_key(kwargs.get("headers"))
+
+        attempt = 0
+        while True:
+            t0 = time.perf_counter()
+            resp = None
+            try:
+                with slot:
+                    resp = session.request(method, url, **kwargs)
+            except requests.RequestException as exc:
+                self._record(m, (time.perf_counter() - t0) * 1000, type(exc).__name__, True)
+                if not (retry and idempotent) or attempt >= self.max_retries:
+                    raise
+            else:
+                self._record(m, (time.perf_counter() - t0) * 1000, str(resp.status_code), resp.status_code >= 400)
+                if not retry or not _retryable(resp, idempotent) or attempt >= self.max_retries:
+                    return resp
+            with self._lock:
+                m.retries += 1
+            time.sleep(self._backoff(attempt, resp))
+            attempt += 1
+
+    def get(self, url: str, retry: bool = True, **kwargs) -> requests.Response:
+        return self.request("GET", url, retry=retry, **kwargs)
+
+    def post(self, url: str, retry: bool = True, idempotent: bool | None = None, **kwargs) -> requests.Response:
+        return self.request("POST", url, retry=retry, idempotent=idempotent, **kwargs)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            return {host: m.as_dict() for host, m in self._metrics.items()}
+
+    def close(self):
+        with self._lock:
+            for s in self._sessions.values():
+                s.close()
+            self._sessions.clear()
+            self._slots.clear()
+
+
+http = PooledHttpClient()
+
+
+def http_metrics() -> dict:
+    return {"hosts": http.metrics()}
@@ -1,22 +1,185 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+
+from app.core.deadline import DeadlineExceeded, deadline
+from app.core.models import Finding
 from app.features.functional.service import run_functional
 from app.features.non_functional.service import run_non_functional
 from app.features.security.service import run_security
-from app.reporting.reporters import write_reports
+from app.jobs import cancellation_requested
+from app.reporting.reporters import open_report_writer
 from app.core.best_practices import evaluate_best_practices
 
+# Findings are always emitted in this order, whatever order the domains finish in.
+DOMAIN_ORDER = ["functional", "non_functional", "security"]
+DEFAULT_DOMAIN_TIMEOUT_S = 1800
+CANCEL_POLL_S = 0.5  # how often a parallel run checks whether its job was cancelled
 
-def run_product_suite(cfg: dict):
-    findings = []
 
+class _Cancelled(Exception):
+    pass
+
+
+def _domain_runner(domain: str):
+    return {
+        "functional": run_functional,
+        "non_functional": run_non_functional,
+        "security": run_security,
+    }[domain]
+
+
+def _enabled_domains(cfg: dict) -> list[str]:
     feats = cfg.get("features", {})
-    if feats.get("functional", {}).get("enabled", False):
-        findings.extend(run_functional(cfg))
-    if feats.get("non_functional", {}).get("enabled", False):
-        findings.extend(run_non_functional(cfg))
-    if feats.get("security", {}).get("enabled", False):
-        findings.extend(run_security(cfg))
+    return [d for d in DOMAIN_ORDER if feats.get(d, {}).get("enabled", False)]
+
+
+def _domain_timeout(cfg: dict, domain: str) -> float:
+    execution = cfg.get("execution", {})
+    default = execution.get("domain_timeout_s", DEFAULT_DOMAIN_TIMEOUT_S)
+    return float(cfg.get("features", {}).get(domain, {}).get("timeout_s", default))
+
+
+def _timeout_finding(domain: str, timeout_s: float) -> Finding:
+    return Finding(
+        domain,
+        f"{domain}_timeout",
+        "high",
+        "ERROR",
+        f"Domain execution exceeded {int(timeout_s)}s; its subprocesses were killed and its results abandoned",
+        {"timeout_s": timeout_s},
+    )
+
+
+def _error_finding(domain: str, err: Exception) -> Finding:
+    return Finding(domain, f"{domain}_execution", "high", "ERROR", f"Domain execution error: {err}", {"error": str(err)})
+
+
+def _run_bounded(domain: str, cfg: dict, at: float):
+    # The deadline reaches the domain's subprocesses (deadline.run_bounded), which are killed when it passes,
+    # and its in-process work, which checks it between steps (deadline.check).
+    with deadline(at):
+        return _domain_runner(domain)(cfg)
+
+
+def _once(fn):
+    done = threading.Lock()
+
+    def call():
+        if done.acquire(blocking=False):
+            fn()
+
+    return call
 
-    findings.extend(evaluate_best_practices(cfg, findings))
 
-    report = write_reports(findings, cfg.get("reporting", {}).get("out_dir", "reports"))
+def _start(domain: str, cfg: dict, at: float, slots: threading.Semaphore) -> Future:
+    """Run a domain on a daemon thread, so a timed-out domain never holds up interpreter exit.
+
+    Its slot is given back at the deadline even if the thread is still winding
+    down, so an abandoned domain never keeps a waiting one from starting.
+    """
+    fut: Future = Future()
+    ctx = contextvars.copy_context()
+
+    def _target():
+        slots.acquire()
+        release = _once(slots.release)
+        timer = threading.Timer(max(0.0, at - time.monotonic()), release)
+        timer.daemon = True
+        timer.start()
+        try:
+            if not fut.set_running_or_notify_cancel():
+                return
+            try:
+                fut.set_result(ctx.run(_run_bounded, domain, cfg, at))
+            except BaseException as e:
+                fut.set_exception(e)
+        finally:
+            timer.cancel()
+            release()
+
+    threading.Thread(target=_target, name=f"testops-domain-{domain}", daemon=True).start()
+    return fut
+
+
+def _result(fut: Future, until: float):
+    """``fut.result()`` by ``until``, checking between polls whether the job running this suite was cancelled."""
+    while (left := until - time.monotonic()) > CANCEL_POLL_S:
+        try:
+            return fut.result(timeout=CANCEL_POLL_S)
+        except FuturesTimeoutError:
+            if cancellation_requested():
+                raise _Cancelled from None
+    return fut.result(timeout=max(0.0, left))
+
+
+def iter_domains(cfg: dict):
+    """Yield (domain, findings) in DOMAIN_ORDER as soon as each one is available.
+
+    When the job running the suite is cancelled, no further domain is started or
+    waited for and the iteration ends early.
+    """
+    domains = _enabled_domains(cfg)
+    if not domains:
+        return
+
+    execution = cfg.get("execution", {})
+    if not execution.get("parallel", True):
+        for d in domains:
+            if cancellation_requested():
+                return
+            timeout_s = _domain_timeout(cfg, d)
+            try:
+                yield d, _run_bounded(d, cfg, time.monotonic() + timeout_s)
+            except DeadlineExceeded:
+                yield d, [_timeout_finding(d, timeout_s)]
+            except Exception as e:
+                yield d, [_error_finding(d, e)]
+        return
+
+    slots = threading.Semaphore(int(execution.get("max_workers", len(domains))))
+    started = time.monotonic()
+    # Each domain's budget counts from submission, so collecting in order does not extend it.
+    futs = {d: _start(d, cfg, started + _domain_timeout(cfg, d), slots) for d in domains}
+    try:
+        for d in domains:
+            timeout_s = _domain_timeout(cfg, d)
+            try:
+                result = _result(futs[d], started + timeout_s)
+            except _Cancelled:
+                return
+            except (FuturesTimeoutError, DeadlineExceeded):
+                result = [_timeout_finding(d, timeout_s)]
+            except Exception as e:
+                result = [_error_finding(d, e)]
+            yield d, result
+    finally:
+        for fut in futs.values():
+            fut.cancel()  # domains still waiting for a slot never start
+
+
+def run_domains(cfg: dict) -> dict[str, list[Finding]]:
+    return dict(iter_domains(cfg))
+
+
+def run_product_suite(cfg: dict, collect: bool = True):
+    """Run every enabled domain plus governance, streaming findings into the reports.
+
+    Returns (findings, report); with ``collect=False`` findings are only written
+    to the reports and the returned list is empty.
+    """
+    findings = []
+    with open_report_writer(cfg.get("reporting", {})) as writer:
+        for _, domain_findings in iter_domains(cfg):
+            writer.extend(domain_findings)
+            if collect:
+                findings.extend(domain_findings)
+
+        # Dependent stage: governance works from the per-domain status counts.
+        governance = evaluate_best_practices(cfg, writer.by_domain)
+        writer.extend(governance)
+        if collect:
+            findings.extend(governance)
+        report = writer.close()
     return findings, report
@@ -0,0 +1,113 @@
+"""Run many ETL profiles as one batch with a bounded thread pool and a combined report."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any
+
+from app.etl import engine
+from app.jobs import cancellation_requested
+
+ETL_BATCH_REPORT_PATH = Path("reports/etl-batch-report.json")
+DEFAULT_WORKERS = int(os.getenv("TESTOPS_ETL_BATCH_WORKERS", "4"))
+CANCEL_POLL_S = 0.5  # how often a batch running as a job checks whether it was cancelled
+
+
+class SharedReads:
+    """Memo of per-file results for one batch; concurrent profiles asking for the same file wait for one read."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: dict[tuple, Future] = {}
+        self.reads = 0
+
+    def get(self, key: tuple, compute):
+        with self._lock:
+            fut = self._futures.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._futures[key] = Future()
+                self.reads += 1
+        if owner:
+            try:
+                fut.set_result(compute())
+            except BaseException as e:
+                fut.set_exception(e)
+        return fut.result()
+
+
+def select_profiles(names: list[str] | None = None) -> list[dict[str, Any]]:
+    """Profiles to run, from a single read of the profiles config; all of them when ``names`` is empty."""
+    profiles = engine._load_profiles_config().get("profiles", [])
+    if not profiles:
+        raise ValueError("No ETL profiles configured in etl/profiles.yaml")
+    if not names:
+        return profiles
+    by_name = {p.get("name"): p for p in profiles}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown ETL profiles: {unknown}")
+    return [by_name[n] for n in dict.fromkeys(names)]
+
+
+def _run_one(
+    selected: dict[str, Any], engine_name: str | None, full_rebuild: bool, sources: SharedReads, stop: threading.Event
+) -> dict[str, Any]:
+    if stop.is_set():
+        return {"profile": selected.get("name"), "status": "CANCELLED", "elapsed_ms": 0.0}
+    t0 = time.perf_counter()
+    try:
+        report = engine.profile_report(selected, engine_name, full_rebuild, sources)
+        out = {"profile": selected.get("name"), "status": report["status"], "report": report}
+    except Exception as e:  # one broken profile must not sink the nightly batch
+        out = {"profile": selected.get("name"), "status": "ERROR", "error": f"{type(e).__name__}: {e}"}
+    out["elapsed_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return out
+
+
+def run_etl_profiles(
+    profile_names: list[str] | None = None,
+    engine_name: str | None = None,
+    workers: int | None = None,
+    full_rebuild: bool = False,
+) -> dict[str, Any]:
+    if engine_name and engine_name not in engine.ENGINES:
+        raise ValueError(f"Unknown ETL engine: {engine_name} (expected one of {sorted(engine.ENGINES)})")
+    selected = select_profiles(profile_names)
+    workers = max(1, min(int(workers or DEFAULT_WORKERS), len(selected)))
+    sources = SharedReads()
+    stop = threading.Event()  # set when the job running this batch is cancelled: profiles not yet started are skipped
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etl-batch") as ex:
+        futures = [ex.submit(_run_one, p, engine_name, full_rebuild, sources, stop) for p in selected]
+        pending = set(futures)
+        while pending:
+            pending = wait(pending, timeout=CANCEL_POLL_S).not_done
+            if pending and cancellation_requested():
+                stop.set()
+        results = [f.result() for f in futures]
+
+    counts = {s: sum(1 for r in results if r["status"] == s) for s in ("PASS", "FAIL", "ERROR", "CANCELLED")}
+    report = {
+        "ok": True,
+        "status": "PASS" if counts["PASS"] == len(results) else "FAIL",
+        "generated_at": engine._now_iso(),
+        "summary": {
+            "profiles": len(results),
+            "pass": counts["PASS"],
+            "fail": counts["FAIL"],
+            "error": counts["ERROR"],
+            "cancelled": counts["CANCELLED"],
+            "workers": workers,
+            "source_reads": sources.reads,
+            "elapsed_ms": round((time.perf_counter() - t0) * 1000, 1),
+        },
+        "profiles": results,
+    }
+    ETL_BATCH_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    ETL_BATCH_REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return report
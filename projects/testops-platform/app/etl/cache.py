@@ -0,0 +1,89 @@
+"""On-disk LRU cache of ETL profile results.
+
+An entry is keyed on the profile definition (plus engine) and a content digest of
+the source and target files, so it stays valid exactly as long as none of them
+change. Entries are small JSON files; a hit refreshes the file's mtime and the
+oldest files are evicted once there are more than ``ETL_CACHE_MAX_ENTRIES``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+ETL_CACHE_DIR = Path("reports/etl-cache")
+ETL_CACHE_MAX_ENTRIES = int(os.getenv("TESTOPS_ETL_CACHE_MAX_ENTRIES", "256"))
+_BLOCK = 8 << 20
+
+_digest_lock = threading.Lock()
+_digests: dict[tuple, str] = {}  # (path, size, mtime_ns, inode) -> content digest
+
+
+def file_digest(path: str | Path) -> str:
+    """blake2b of the file content, memoised per (path, size, mtime, inode) so an unchanged file is hashed once."""
+    p = Path(path).resolve()
+    st = p.stat()
+    stamp = (str(p), st.st_size, st.st_mtime_ns, st.st_ino)
+    with _digest_lock:
+        known = _digests.get(stamp)
+    if known:
+        return known
+    h = hashlib.blake2b(digest_size=20)
+    with p.open("rb") as f:
+        while block := f.read(_BLOCK):
+            h.update(block)
+    digest = h.hexdigest()
+    with _digest_lock:
+        _digests[stamp] = digest
+    return digest
+
+
+def cache_key(profile: dict[str, Any], engine: str) -> str:
+    definition = json.dumps({"profile": profile, "engine": engine}, sort_keys=True, default=str)
+    parts = [hashlib.sha256(definition.encode()).hexdigest(), file_digest(profile["source"]["path"]), file_digest(profile["target"]["path"])]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def _entry_path(key: str) -> Path:
+    return ETL_CACHE_DIR / f"{key}.json"
+
+
+def lookup(key: str) -> dict[str, Any] | None:
+    p = _entry_path(key)
+    try:
+        entry = json.loads(p.read_text(encoding="utf-8"))
+        os.utime(p)  # recency for LRU eviction
+    except (OSError, ValueError):
+        return None
+    return entry
+
+
+def store(key: str, entry: dict[str, Any]):
+    ETL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    p = _entry_path(key)
+    tmp = p.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(entry), encoding="utf-8")
+    tmp.replace(p)
+    _evict()
+
+
+def _evict():
+    entries = []
+    for p in ETL_CACHE_DIR.glob("*.json"):
+        try:
+            entries.append((p.stat().st_mtime_ns, p))
+        except OSError:  # evicted concurrently
+            pass
+    if len(entries) <= ETL_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, p in entries[: len(entries) - ETL_CACHE_MAX_ENTRIES]:
+        p.unlink(missing_ok=True)
+
+
+def clear():
+    for p in ETL_CACHE_DIR.glob("*.json"):
+        p.unlink(missing_ok=True)
@@ -0,0 +1,495 @@
+"""Optional NumPy (+ Arrow reader) backend for ETL profile checks.
+
+Each CSV is still read once, in chunks, but every chunk is turned into typed
+column arrays and the checks run as vectorized operations on them. The result
+objects are ``app.etl.streaming.SideAggregates`` with vectorized aggregators
+plugged in, so the engine builds the report the same way. ``available()`` is False when NumPy
+is not installed and the engine then falls back to the pure-Python path.
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from app.etl.rules import CMP, ExprRule, is_expression
+from app.etl.sketches import options as sketch_options
+from app.etl.streaming import (
+    DEFAULT_CHUNK_ROWS,
+    SideAggregates,
+    SketchDuplicateKeys,
+    _safe_float,
+    csv_rows,
+    existing_csv,
+    needed_columns,
+    read_header,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional dependency
+    pa = pc = pa_csv = None
+
+MISSING = "\x01"  # short row (DictReader restval None); not whitespace, and NumPy keeps it (unlike a trailing NUL)
+
+
+def available() -> bool:
+    return np is not None
+
+
+def arrow_available() -> bool:
+    return pa_csv is not None
+
+
+class _ArrowFallback(Exception):
+    pass
+
+
+def _arrow_chunks(path: Path, header: list[str], columns: list[str], chunk_rows: int, byte_range: tuple[int, int]):
+    start, end = byte_range
+    try:
+        # Zero-copy view of just this byte range; the header is supplied, so every line is data.
+        source = pa.BufferReader(pa.memory_map(str(path)).read_at(end - start, start))
+        reader = pa_csv.open_csv(
+            source,
+            read_options=pa_csv.ReadOptions(column_names=header, block_size=max(1 << 20, chunk_rows * 64)),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={c: pa.string() for c in header},
+                include_columns=columns or header[:1],
+                strings_can_be_null=False,
+                quoted_strings_can_be_null=False,
+            ),
+        )
+        for batch in reader:
+            if batch.num_rows:
+                yield batch.num_rows, {c: batch.column(c) for c in columns}
+    except pa.ArrowInvalid as e:  # ragged rows etc.: let the caller redo the range with csv semantics
+        raise _ArrowFallback(str(e)) from e
+
+
+def _python_chunks(rows, header: list[str], columns: list[str], chunk_rows: int):
+    # Last occurrence wins for duplicate header names, like dict(zip(fieldnames, row)).
+    idx = {c: len(header) - 1 - header[::-1].index(c) for c in columns}
+    width = len(header)
+    rows = (r for r in rows if r)
+    while chunk := list(islice(rows, chunk_rows)):
+        if any(len(r) < width for r in chunk):
+            chunk = [r if len(r) >= width else r + [MISSING] * (width - len(r)) for r in chunk]
+        cols = list(zip(*chunk)) if idx else []
+        yield len(chunk), {c: np.array(cols[i], dtype=str) for c, i in idx.items()}
+
+
+def _column(cols: dict, n: int, column: str):
+    """Values of ``column`` for this chunk; a column absent from the header reads as ''."""
+    v = cols.get(column)
+    return v if v is not None else np.full(n, "", dtype=str)
+
+
+# Chunk columns are Arrow string arrays when the Arrow reader is used and NumPy
+# string arrays otherwise. The helpers below run the Arrow compute kernel when
+# they can and drop to NumPy when Arrow rejects a value Python would accept.
+
+
+def _is_arrow(v) -> bool:
+    return pa is not None and isinstance(v, pa.Array)
+
+
+def _as_numpy(v):
+    return v.to_numpy(zero_copy_only=False).astype(str) if _is_arrow(v) else v
+
+
+def _blank_count(v) -> int:
+    if _is_arrow(v):
+        return pc.sum(pc.equal(pc.utf8_trim_whitespace(v), "")).as_py() or 0
+    return int(np.count_nonzero((np.char.strip(v) == "") & (v != MISSING)))
+
+
+def _to_float(v):
+    """Return (float values, invalid mask); unparseable cells are invalid like _safe_float -> None."""
+    if _is_arrow(v):
+        try:
+            return pc.cast(v, pa.float64()).to_numpy(zero_copy_only=False), np.zeros(len(v), dtype=bool)
+        except pa.ArrowInvalid:  # e.g. " 5 " or "1_000", which float() accepts
+            v = _as_numpy(v)
+    try:
+        return v.astype(np.float64), np.zeros(v.shape, dtype=bool)
+    except ValueError:
+        parsed = [_safe_float(x) if x != MISSING else None for x in v.tolist()]
+        invalid = np.fromiter((x is None for x in parsed), dtype=bool, count=len(parsed))
+        return np.fromiter((np.nan if x is None else x for x in parsed), dtype=np.float64, count=len(parsed)), invalid
+
+
+def _parse_iso(text: str) -> datetime:
+    return datetime.fromisoformat(text.replace("Z", "+00:00"))
+
+
+def _max_timestamp_text(v) -> str | None:
+    """Original text of the first latest timestamp in ``v`` (empty cells ignored)."""
+    if _is_arrow(v):
+        v = pc.filter(v, pc.not_equal(v, ""))
+        if not len(v):
+            return None
+        try:
+            ts = pc.cast(v, pa.timestamp("us", tz="UTC"))
+            return v[pc.index(ts, pc.max(ts)).as_py()].as_py()
+        except pa.ArrowInvalid:  # naive timestamps or odd formats
+            v = _as_numpy(v)
+    v = v[(v != "") & (v != MISSING)]
+    if not v.size:
+        return None
+    utc_z, utc_off = np.char.endswith(v, "Z"), np.char.endswith(v, "+00:00")
+    if np.all(utc_z | utc_off):
+        bare = np.where(utc_z, np.char.rstrip(v, "Z"), np.char.replace(v, "+00:00", ""))
+        try:
+            return str(v[int(np.argmax(bare.astype("datetime64[us]")))])
+        except ValueError:
+            pass
+    best, best_s = None, None
+    for s in v.tolist():
+        ts = _parse_iso(s)
+        if best is None or ts > best:
+            best, best_s = ts, s
+    return best_s
+
+
+class NpBlankCount:
+    def __init__(self, columns: list[str]):
+        self.columns = list(columns)
+        self.count = 0
+
+    def update(self, n: int, cols: dict):
+        for c in self.columns:
+            self.count += _blank_count(_column(cols, n, c))
+
+    def merge(self, other: "NpBlankCount"):
+        self.count += other.count
+
+
+class NpDuplicateKeys:
+    """Keeps only the key column(s) of each chunk; duplicates are counted once at the end."""
+
+    def __init__(self, key_columns: list[str]):
+        self.key_columns = list(key_columns)
+        self.parts: list = []
+        self._dups: int | None = None
+
+    def update(self, n: int, cols: dict):
+        parts = [_column(cols, n, c) for c in self.key_columns] or [np.full(n, "", dtype=str)]
+        if pa is not None:
+            parts = [p if _is_arrow(p) else pa.array(p) for p in parts]
+            key = parts[0] if len(parts) == 1 else pc.binary_join_element_wise(*parts, "\x1f")
+        else:
+            key = parts[0]
+            for p in parts[1:]:
+                key = np.char.add(np.char.add(key, "\x1f"), p)
+        self.parts.append(key)
+        self._dups = None
+
+    def merge(self, other: "NpDuplicateKeys"):
+        self.parts += other.parts
+        self._dups = None
+
+    @property
+    def duplicate_keys(self) -> int:
+        if self._dups is None:
+            if not self.parts:
+                self._dups = 0
+            elif pa is not None:
+                counts = pc.value_counts(pa.chunked_array(self.parts, type=pa.string())).field("counts")
+                self._dups = pc.sum(pc.greater(counts, 1)).as_py() or 0
+            else:
+                self.parts = [np.concatenate(self.parts)]
+                _, counts = np.unique(self.parts[0], return_counts=True)
+                self._dups = int(np.count_nonzero(counts > 1))
+        return self._dups
+
+
+class NpMaxTimestamp:
+    def __init__(self, column: str):
+        self.column = column
+        self.latest: datetime | None = None
+
+    def update(self, n: int, cols: dict):
+        s = _max_timestamp_text(_column(cols, n, self.column))
+        if s is not None:
+            ts = _parse_iso(s)
+            if self.latest is None or ts > self.latest:
+                self.latest = ts
+
+    def merge(self, other: "NpMaxTimestamp"):
+        if other.latest is not None and (self.latest is None or other.latest > self.latest):
+            self.latest = other.latest
+
+
+# Vectorized 2x64-bit key hash for the sketch aggregator: a polynomial hash of each
+# key's UTF-8 bytes (prefix sums of b[i] * P**-i over the Arrow data buffer, so a
+# chunk is hashed without a Python loop), finished with splitmix64 and the length.
+_P1, _P2 = 0x100000001B3, 0xC2B2AE3D27D4EB4F
+_GOLDEN = 0x9E3779B97F4A7C15
+_POWERS: dict[int, tuple] = {}
+
+
+def _powers(p: int, n: int):
+    cached = _POWERS.get(p)
+    if cached is None or len(cached[0]) < n:
+        size = max(n, 1 << 20, 2 * len(cached[0]) if cached else 0)
+        pw = np.full(size, p, dtype=np.uint64)
+        inv = np.full(size, pow(p, -1, 1 << 64), dtype=np.uint64)
+        pw[0] = inv[0] = 1
+        np.multiply.accumulate(pw, out=pw)
+        np.multiply.accumulate(inv, out=inv)
+        cached = _POWERS[p] = (pw, inv)
+    return cached
+
+
+def _mix64(x):
+    x = x + np.uint64(_GOLDEN)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def _hash_pair(keys) -> tuple:
+    """(h1, h2) uint64 arrays for an Arrow string array; h2 is odd (Bloom double hashing)."""
+    bufs = keys.buffers()
+    offsets = np.frombuffer(bufs[1], dtype=np.int32)[keys.offset:keys.offset + len(keys) + 1].astype(np.int64)
+    lo, hi = int(offsets[0]), int(offsets[-1])
+    data = np.frombuffer(bufs[2], dtype=np.uint8)[lo:hi].astype(np.uint64) if bufs[2] is not None and hi > lo else np.zeros(0, np.uint64)
+    start, end = offsets[:-1] - lo, offsets[1:] - lo
+    length = (end - start).astype(np.uint64)
+    out = []
+    for p in (_P1, _P2):
+        pw, inv = _powers(p, hi - lo + 1)
+        prefix = np.zeros(hi - lo + 1, dtype=np.uint64)
+        np.cumsum(data * inv[:hi - lo], out=prefix[1:])
+        # sum(b[i] * P**(end-1-i)) == P**(end-1) * sum(b[i] * P**-i)
+        poly = (prefix[end] - prefix[start]) * pw[np.maximum(end - 1, 0)]
+        out.append(_mix64(poly ^ (length * np.uint64(_GOLDEN))))
+    return out[0], out[1] | np.uint64(1)
+
+
+def _bit_length(x):
+    n = np.zeros(x.shape, dtype=np.int64)
+    for s in (32, 16, 8, 4, 2, 1):
+        big = x >= np.uint64(1 << s)
+        x = np.where(big, x >> np.uint64(s), x)
+        n += big * s
+    return n + (x > 0)
+
+
+class NpSketchDuplicateKeys(SketchDuplicateKeys):
+    """``SketchDuplicateKeys`` with hashing, filter probes and register updates done per chunk in NumPy.
+
+    Keys are the joined key strings (as in ``NpDuplicateKeys``), so this state only
+    merges with other columnar sketches and verifies with the columnar reader.
+    """
+
+    def _key_array(self, n: int, cols: dict):
+        parts = [_column(cols, n, c) for c in self.key_columns] or [np.full(n, "", dtype=str)]
+        parts = [p if _is_arrow(p) else pa.array(p, type=pa.string()) for p in parts]
+        return parts[0] if len(parts) == 1 else pc.binary_join_element_wise(*parts, "\x1f")
+
+    def _probe(self, bloom, h1, h2):
+        i = np.arange(bloom.hashes, dtype=np.uint64)
+        pos = (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(bloom.size)
+        return (pos >> np.uint64(3)).astype(np.intp), (np.uint8(1) << (pos & np.uint64(7)).astype(np.uint8))
+
+    def update(self, n: int, cols: dict):
+        keys = self._key_array(n, cols)
+        h1, h2 = _hash_pair(keys)
+        shift = 64 - self.hll.p
+        registers = np.frombuffer(self.hll.registers, dtype=np.uint8)
+        rank = shift - _bit_length(h1 & np.uint64((1 << shift) - 1)) + 1
+        np.maximum.at(registers, (h1 >> np.uint64(shift)).astype(np.intp), rank.astype(np.uint8))
+
+        bits = np.frombuffer(self.bloom.bits, dtype=np.uint8)
+        byte, mask = self._probe(self.bloom, h1, h2)
+        seen = np.all(bits[byte] & mask, axis=1)
+        repeat = np.ones(len(h1), dtype=bool)
+        repeat[np.unique(h1, return_index=True)[1]] = False  # later occurrences within this chunk
+        np.bitwise_or.at(bits, byte.ravel(), mask.ravel())
+        hits = np.flatnonzero(seen | repeat)
+        if hits.size:
+            self.candidates.update(keys.take(pa.array(hits)).to_pylist())
+        self._dups = None
+
+    def _count_candidates(self, chunks) -> int:
+        cross = self._cross()
+        value_set = pa.array(list(self.candidates), type=pa.string())
+        counts: dict[str, int] = {}
+        for n, cols in chunks:
+            keys = self._key_array(n, cols)
+            hit = pc.is_in(keys, value_set=value_set).to_numpy(zero_copy_only=False)
+            if cross is not None:
+                byte, mask = self._probe(cross, *_hash_pair(keys))
+                hit |= np.all(np.frombuffer(cross.bits, dtype=np.uint8)[byte] & mask, axis=1)
+            if hit.any():
+                for k in keys.filter(pa.array(hit)).to_pylist():
+                    counts[k] = counts.get(k, 0) + 1
+        return sum(1 for c in counts.values() if c > 1)
+
+    def verify_file(self, path: str | Path, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        p = existing_csv(path)
+        header, data_start = read_header(p)
+        byte_range = (data_start, p.stat().st_size)
+        columns = [c for c in self.key_columns if c in header]
+        if arrow_available() and header and len(set(header)) == len(header):
+            try:
+                self._dups = self._count_candidates(_arrow_chunks(p, header, columns, chunk_rows, byte_range))
+                return
+            except _ArrowFallback:
+                pass
+        self._dups = self._count_candidates(_python_chunks(csv_rows(p, byte_range), header, columns, chunk_rows))
+
+
+_NP_OPS = {
+    "gte": lambda a, b: a >= b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "lt": lambda a, b: a < b,
+    "eq": lambda a, b: a == b,
+}
+
+
+class NpRuleViolations:
+    def __init__(self, rule: dict[str, Any]):
+        self.column = str(rule.get("column", ""))
+        self.op = str(rule.get("op", "gte"))
+        self.value = rule.get("value", 0)
+        self.name = str(rule.get("name", f"rule_{self.column}_{self.op}_{self.value}"))
+        self.threshold = _safe_float(self.value)
+        self.violations = 0
+
+    def update(self, n: int, cols: dict):
+        if self.threshold is None:
+            self.violations += n
+            return
+        values, invalid = _to_float(_column(cols, n, self.column))
+        cmp = _NP_OPS.get(self.op)
+        bad = invalid if cmp is None else invalid | ~cmp(values, self.threshold)
+        self.violations += int(np.count_nonzero(bad))
+
+    def merge(self, other: "NpRuleViolations"):
+        self.violations += other.violations
+
+
+class NpColumns:
+    """``rules.PyColumns`` over chunk arrays: every operation returns a boolean array for the chunk."""
+
+    def __init__(self, n: int, cols: dict):
+        self.n = n
+        self.cols = cols
+        self._text: dict = {}
+        self._num: dict = {}
+        self._null: dict = {}
+
+    def text(self, col: str):
+        if col not in self._text:
+            self._text[col] = _as_numpy(_column(self.cols, self.n, col))
+        return self._text[col]
+
+    def num(self, col: str):
+        """(float values, valid mask); an unparseable cell is invalid like ``_safe_float`` -> None."""
+        if col not in self._num:
+            values, invalid = _to_float(_column(self.cols, self.n, col))
+            self._num[col] = values, ~invalid
+        return self._num[col]
+
+    def null(self, col: str):
+        if col not in self._null:
+            v = self.text(col)
+            self._null[col] = (np.char.strip(v) == "") | (v == MISSING)
+        return self._null[col]
+
+    def const(self, value: bool):
+        return np.full(self.n, value, dtype=bool)
+
+    def and_(self, a, b):
+        return a & b
+
+    def or_(self, a, b):
+        return a | b
+
+    def not_(self, a):
+        return ~a
+
+    def cmp_num(self, op: str, col: str, value: float):
+        values, valid = self.num(col)
+        return CMP[op](values, value) & valid
+
+    def cmp_text(self, op: str, col: str, value: str):
+        return CMP[op](self.text(col), value) & ~self.null(col)
+
+    def cmp_cols(self, op: str, a: str, b: str):
+        f = CMP[op]
+        (xn, xvalid), (yn, yvalid) = self.num(a), self.num(b)
+        numeric = xvalid & yvalid
+        return np.where(numeric, f(xn, yn), f(self.text(a), self.text(b))) & ~self.null(a) & ~self.null(b)
+
+    def isin_num(self, col: str, values: frozenset):
+        nums, valid = self.num(col)
+        return np.isin(nums, list(values)) & valid
+
+    def isin_text(self, col: str, values: frozenset):
+        return np.isin(self.text(col), list(values)) & ~self.null(col)
+
+    def match(self, col: str, rx):
+        search = rx.search
+        hit = np.fromiter((search(x) is not None for x in self.text(col).tolist()), dtype=bool, count=self.n)
+        return hit & ~self.null(col)
+
+    def count_false(self, mask) -> int:
+        return int(self.n - np.count_nonzero(mask))
+
+
+class ColumnarSideAggregates(SideAggregates):
+    def _build(self, profile: dict[str, Any]):
+        keys = list(profile.get("key_columns", []))
+        ts_col = (profile.get("freshness") or {}).get("timestamp_column")
+        sketch = sketch_options(profile)
+        self.nulls = NpBlankCount(profile.get("required_columns", []))
+        if sketch:
+            self.dups = NpSketchDuplicateKeys(keys, **sketch) if pa is not None else SketchDuplicateKeys(keys, **sketch, missing=MISSING)
+        else:
+            self.dups = NpDuplicateKeys(keys)
+        self.pk = NpBlankCount(keys)
+        self.freshness = NpMaxTimestamp(ts_col) if ts_col else None
+        self.rules = [ExprRule(r) if is_expression(r) else NpRuleViolations(r) for r in profile.get("business_rules", [])]
+        self.aggs = [a for a in (self.nulls, self.dups, self.pk, self.freshness) if a is not None] + self._rule_aggs(NpColumns)
+
+
+def aggregate_file_columnar(
+    path: str | Path,
+    profile: dict[str, Any],
+    full: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    byte_range: tuple[int, int] | None = None,
+    header: list[str] | None = None,
+) -> ColumnarSideAggregates:
+    p = existing_csv(path)
+    if header is None or byte_range is None:
+        header, data_start = read_header(p)
+        byte_range = byte_range or (data_start, p.stat().st_size)
+    columns = [c for c in needed_columns(profile) if c in header] if full else []
+
+    if arrow_available() and header and len(set(header)) == len(header):
+        side = ColumnarSideAggregates(header, profile, full)
+        try:
+            for n, cols in _arrow_chunks(p, header, columns, chunk_rows, byte_range):
+                side.update(n, cols)
+            return side
+        except _ArrowFallback:
+            pass
+    side = ColumnarSideAggregates(header, profile, full)
+    for n, cols in _python_chunks(csv_rows(p, byte_range), header, columns, chunk_rows):
+        side.update(n, cols)
+    return side
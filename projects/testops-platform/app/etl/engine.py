@@ -2,23 +2,34 @@ from __future__ import annotations
 
 import csv
 import json
+import logging
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
 import yaml
 
+from app.etl import cache, columnar, history, incremental
+from app.etl.parallel import aggregate_parallel
+from app.etl.reconcile import Reconciliation, reconcile_files, settings as reconcile_settings
+from app.etl.rules import PyColumns, compile_expression, is_expression
+from app.etl.streaming import DEFAULT_CHUNK_ROWS, SketchDuplicateKeys, aggregate_file, freshness_latency_minutes
+
 ETL_CONFIG_PATH = Path("etl/profiles.yaml")
 ETL_REPORT_PATH = Path("reports/etl-report.json")
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CheckResult:
     name: str
     status: str
     detail: str
+    # What a time-dependent check measured (freshness: latest timestamp), so a cached result can be re-judged.
+    observed: str | None = field(default=None, compare=False)
 
     def as_dict(self) -> dict[str, str]:
         return {"name": self.name, "status": self.status, "detail": self.detail}
@@ -47,8 +58,7 @@ def _safe_float(v: Any) -> float | None:
         return None
 
 
-def _check_schema(rows: list[dict[str, str]], required_columns: list[str], side: str) -> CheckResult:
-    columns = set(rows[0].keys()) if rows else set()
+def _schema_result(columns: set[str], required_columns: list[str], side: str) -> CheckResult:
     missing = [c for c in required_columns if c not in columns]
     status = "PASS" if not missing else "FAIL"
     return CheckResult(
@@ -58,28 +68,86 @@ def _check_schema(rows: list[dict[str, str]], required_columns: list[str], side:
     )
 
 
-def _check_rowcount(source_rows: list[dict[str, str]], target_rows: list[dict[str, str]], tolerance: int = 0) -> CheckResult:
-    s, t = len(source_rows), len(target_rows)
+def _check_schema(rows: list[dict[str, str]], required_columns: list[str], side: str) -> CheckResult:
+    return _schema_result(set(rows[0].keys()) if rows else set(), required_columns, side)
+
+
+def _rowcount_result(s: int, t: int, tolerance: int = 0) -> CheckResult:
     delta = abs(s - t)
     status = "PASS" if delta <= tolerance else "FAIL"
     return CheckResult("rowcount_reconciliation", status, f"source={s}, target={t}, delta={delta}, tolerance={tolerance}")
 
 
+def _check_rowcount(source_rows: list[dict[str, str]], target_rows: list[dict[str, str]], tolerance: int = 0) -> CheckResult:
+    return _rowcount_result(len(source_rows), len(target_rows), tolerance)
+
+
+def _key_reconciliation_result(rec: Reconciliation) -> CheckResult:
+    status = "PASS" if rec.missing == rec.extra == rec.changed == 0 else "FAIL"
+    detail = f"missing={rec.missing}, extra={rec.extra}, changed={rec.changed}, matched={rec.matched}, key_columns={rec.key_columns}"
+    samples = ", ".join(f"{kind}={keys}" for kind, keys in rec.samples.items() if keys)
+    return CheckResult("key_reconciliation", status, f"{detail}; sample {samples}" if samples else detail)
+
+
+def _check_key_reconciliation(selected: dict[str, Any], chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1) -> list[CheckResult]:
+    rec = reconcile_files(selected, chunk_rows=chunk_rows, workers=workers)
+    return [_key_reconciliation_result(rec)] if rec is not None else []
+
+
+def _not_rerun_result(name: str, last_status: str | None) -> CheckResult:
+    """A check an incremental run leaves alone because it would have to rescan whole files."""
+    last = f"last full run: {last_status}" if last_status else "no full run recorded"
+    return CheckResult(name, "SKIPPED", f"not re-run incrementally ({last}); use full_rebuild to re-check")
+
+
+def _nulls_result(null_count: int, columns: list[str], side: str) -> CheckResult:
+    status = "PASS" if null_count == 0 else "FAIL"
+    return CheckResult(f"null_check_{side}", status, f"null violations={null_count} on columns={columns}")
+
+
 def _check_nulls(rows: list[dict[str, str]], columns: list[str], side: str) -> CheckResult:
     null_count = 0
     for r in rows:
         for c in columns:
             if str(r.get(c, "")).strip() == "":
                 null_count += 1
-    status = "PASS" if null_count == 0 else "FAIL"
-    return CheckResult(f"null_check_{side}", status, f"null violations={null_count} on columns={columns}")
+    return _nulls_result(null_count, columns, side)
+
+
+def _duplicates_result(dups: int, key_columns: list[str], side: str, sketch=None) -> CheckResult:
+    status = "PASS" if dups == 0 else "FAIL"
+    detail = f"duplicate keys={dups} on key_columns={key_columns}"
+    if sketch is not None:
+        detail += f", distinct keys~{sketch.distinct_keys} (+/-{sketch.hll.error:.1%}), candidates={len(sketch.candidates)}"
+        if _overfilled(sketch.bloom):
+            detail += f", filter overfilled (false-positive rate~{sketch.bloom.estimated_false_positive_rate():.2g}; raise expected_keys)"
+    return CheckResult(f"duplicate_check_{side}", status, detail)
+
+
+def _overfilled(bloom) -> bool:
+    return bloom.estimated_false_positive_rate() > bloom.false_positive_rate
+
+
+def _warn_if_overfilled(selected: dict[str, Any], bloom):
+    """Counts stay exact, but an overfilled filter turns many keys into candidates held in memory."""
+    if _overfilled(bloom):
+        logger.warning(
+            "Duplicate-key filter of ETL profile %s is %.0f%% full (expected_keys=%d): false-positive rate~%.2g exceeds %.2g; "
+            "set duplicates.expected_keys higher",
+            selected.get("name"), bloom.fill_ratio() * 100, bloom.expected,
+            bloom.estimated_false_positive_rate(), bloom.false_positive_rate,
+        )
 
 
 def _check_duplicates(rows: list[dict[str, str]], key_columns: list[str], side: str) -> CheckResult:
     keys = [tuple(r.get(c, "") for c in key_columns) for r in rows]
     dups = sum(1 for _, count in Counter(keys).items() if count > 1)
-    status = "PASS" if dups == 0 else "FAIL"
-    return CheckResult(f"duplicate_check_{side}", status, f"duplicate keys={dups} on key_columns={key_columns}")
+    return _duplicates_result(dups, key_columns, side)
+
+
+def _pk_result(bad: int, pk_columns: list[str], side: str) -> CheckResult:
+    status = "PASS" if bad == 0 else "FAIL"
+    return CheckResult(f"pk_check_{side}", status, f"pk null violations={bad} on pk={pk_columns}")
 
 
 def _check_pk_not_null(rows: list[dict[str, str]], pk_columns: list[str], side: str) -> CheckResult:
@@ -88,26 +156,44 @@ def _check_pk_not_null(rows: list[dict[str, str]], pk_columns: list[str], side:
         for c in pk_columns:
             if str(r.get(c, "")).strip() == "":
                 bad += 1
-    status = "PASS" if bad == 0 else "FAIL"
-    return CheckResult(f"pk_check_{side}", status, f"pk null violations={bad} on pk={pk_columns}")
+    return _pk_result(bad, pk_columns, side)
 
 
-def _check_freshness(rows: list[dict[str, str]], timestamp_column: str, max_latency_minutes: int, side: str) -> CheckResult:
-    if not rows:
+def _freshness_result(latest: datetime | None, row_count: int, timestamp_column: str, max_latency_minutes: int, side: str) -> CheckResult:
+    if not row_count:
         return CheckResult(f"freshness_latency_{side}", "FAIL", "no rows to validate freshness")
-    latest = max(_parse_iso_utc(r[timestamp_column]) for r in rows if r.get(timestamp_column))
-    latency_minutes = int((datetime.now(timezone.utc) - latest).total_seconds() / 60)
+    if latest is None:
+        raise ValueError(f"no '{timestamp_column}' values to validate freshness")
+    latency_minutes = freshness_latency_minutes(latest)
     status = "PASS" if latency_minutes <= max_latency_minutes else "FAIL"
     return CheckResult(
         f"freshness_latency_{side}",
         status,
         f"latest={latest.isoformat()}, latency_minutes={latency_minutes}, max_allowed={max_latency_minutes}",
+        observed=latest.isoformat(),
     )
 
 
+def _check_freshness(rows: list[dict[str, str]], timestamp_column: str, max_latency_minutes: int, side: str) -> CheckResult:
+    stamps = [_parse_iso_utc(r[timestamp_column]) for r in rows if r.get(timestamp_column)]
+    return _freshness_result(max(stamps) if stamps else None, len(rows), timestamp_column, max_latency_minutes, side)
+
+
+def _rule_result(name: str, violations: int, op: str, value: Any, side: str) -> CheckResult:
+    status = "PASS" if violations == 0 else "FAIL"
+    detail = f"violations={violations}, expr={value}" if op == "expr" else f"violations={violations}, op={op}, value={value}"
+    return CheckResult(f"business_rule_{side}_{name}", status, detail)
+
+
 def _check_business_rules(rows: list[dict[str, str]], rules: list[dict[str, Any]], side: str) -> list[CheckResult]:
     results: list[CheckResult] = []
     for rule in rules:
+        if is_expression(rule):
+            expr = compile_expression(str(rule["expr"]))
+            ctx = PyColumns(len(rows), {c: [r.get(c, "") for r in rows] for c in expr.columns})
+            violations = ctx.count_false(expr.predicate(ctx))
+            results.append(_rule_result(str(rule.get("name", expr.text)), violations, "expr", expr.text, side))
+            continue
         column = str(rule.get("column", ""))
         op = str(rule.get("op", "gte"))
         value = rule.get("value", 0)
@@ -129,8 +215,7 @@ def _check_business_rules(rows: list[dict[str, str]], rules: list[dict[str, Any]
                 violations += 1
             elif op == "eq" and not (sample == threshold):
                 violations += 1
-        status = "PASS" if violations == 0 else "FAIL"
-        results.append(CheckResult(f"business_rule_{side}_{name}", status, f"violations={violations}, op={op}, value={value}"))
+        results.append(_rule_result(name, violations, op, value, side))
     return results
 
 
@@ -154,21 +239,30 @@ def load_last_report() -> dict[str, Any]:
     return json.loads(ETL_REPORT_PATH.read_text(encoding="utf-8"))
 
 
-def run_etl_profile(profile_name: str | None = None) -> dict[str, Any]:
+def _select_profile(profile_name: str | None) -> dict[str, Any]:
     cfg = _load_profiles_config()
     profiles = cfg.get("profiles", [])
     if not profiles:
         raise ValueError("No ETL profiles configured in etl/profiles.yaml")
 
-    selected = None
     if profile_name:
         selected = next((p for p in profiles if p.get("name") == profile_name), None)
         if not selected:
             raise ValueError(f"Unknown ETL profile: {profile_name}")
-    else:
-        selected = profiles[0]
+        return selected
+    return profiles[0]
+
 
-    source_rows = _read_csv(selected["source"]["path"])
+def _shared(sources, kind: str, path: str, compute):
+    """``compute()``, or the result another profile of the same batch already computed for this file."""
+    if sources is None:
+        return compute()
+    return sources.get((kind, str(Path(path).resolve())), compute)
+
+
+def _memory_checks(selected: dict[str, Any], sources=None) -> tuple[list[CheckResult], int, int]:
+    source_path = selected["source"]["path"]
+    source_rows = _shared(sources, "rows", source_path, lambda: _read_csv(source_path))
     target_rows = _read_csv(selected["target"]["path"])
 
     checks: list[CheckResult] = []
@@ -180,6 +274,7 @@ def run_etl_profile(profile_name: str | None = None) -> dict[str, Any]:
     checks.append(_check_schema(source_rows, required_cols, "source"))
     checks.append(_check_schema(target_rows, required_cols, "target"))
     checks.append(_check_rowcount(source_rows, target_rows, int(selected.get("rowcount_tolerance", 0))))
+    checks.extend(_check_key_reconciliation(selected, int(selected.get("chunk_rows", DEFAULT_CHUNK_ROWS))))
     checks.append(_check_nulls(target_rows, required_cols, "target"))
     checks.append(_check_duplicates(target_rows, key_columns, "target"))
     checks.append(_check_pk_not_null(target_rows, key_columns, "target"))
@@ -188,9 +283,160 @@ def run_etl_profile(profile_name: str | None = None) -> dict[str, Any]:
         checks.append(_check_freshness(target_rows, timestamp_column, max_latency_minutes, "target"))
 
     checks.extend(_check_business_rules(target_rows, selected.get("business_rules", []), "target"))
+    return checks, len(source_rows), len(target_rows)
+
+
+def _aggregated_checks(selected: dict[str, Any], aggregate, sources=None) -> tuple[list[CheckResult], int, int]:
+    chunk_rows = int(selected.get("chunk_rows", DEFAULT_CHUNK_ROWS))
+    workers = int(selected.get("workers", 1))
+    source_path = selected["source"]["path"]
+    # The source side only needs the header and row count, so it is the same for every profile reading the file.
+    source = _shared(
+        sources, aggregate.__qualname__, source_path,
+        lambda: aggregate_parallel(aggregate, source_path, selected, full=False, chunk_rows=chunk_rows, workers=workers),
+    )
+    target = aggregate_parallel(aggregate, selected["target"]["path"], selected, full=True, chunk_rows=chunk_rows, workers=workers)
+    reconciliation = _check_key_reconciliation(selected, chunk_rows, workers)
+    return _aggregate_checks(selected, source, target, reconciliation), source.rows.rows, target.rows.rows
+
+
+def _streaming_checks(selected: dict[str, Any], sources=None) -> tuple[list[CheckResult], int, int]:
+    return _aggregated_checks(selected, aggregate_file, sources)
+
+
+def _aggregate_checks(
+    selected: dict[str, Any], source, target, reconciliation: list[CheckResult] = (), last_full: dict[str, str] | None = None
+) -> list[CheckResult]:
+    """Checks from both sides' aggregates.
+
+    ``last_full`` is given by incremental runs that did not rescan the target: the
+    duplicate verification pass is then not run and, unless the sketch already
+    rules duplicates out, the check is reported as not re-run.
+    """
+    required_cols = selected.get("required_columns", [])
+    key_columns = selected.get("key_columns", [])
+    timestamp_column = selected.get("freshness", {}).get("timestamp_column")
+    max_latency_minutes = int(selected.get("freshness", {}).get("max_latency_minutes", 1440))
+    sketch = target.dups if isinstance(target.dups, SketchDuplicateKeys) else None
+    duplicates_name = "duplicate_check_target"
+    if sketch is not None:
+        _warn_if_overfilled(selected, sketch.bloom)
+    if sketch is not None and sketch.needs_verify and last_full is not None:
+        duplicates = _not_rerun_result(duplicates_name, last_full.get(duplicates_name))
+    else:
+        if sketch is not None and sketch.needs_verify:
+            sketch.verify_file(selected["target"]["path"], int(selected.get("chunk_rows", DEFAULT_CHUNK_ROWS)))
+        # Exact mode with workers > 1 is verified through a sketch too, but only sketch mode reports its estimates.
+        shown = sketch if (selected.get("duplicates") or {}).get("mode") == "sketch" else None
+        duplicates = _duplicates_result(target.dups.duplicate_keys, key_columns, "target", shown)
+
+    checks = [
+        _schema_result(source.columns, required_cols, "source"),
+        _schema_result(target.columns, required_cols, "target"),
+        _rowcount_result(source.rows.rows, target.rows.rows, int(selected.get("rowcount_tolerance", 0))),
+        *reconciliation,
+        _nulls_result(target.nulls.count, required_cols, "target"),
+        duplicates,
+        _pk_result(target.pk.count, key_columns, "target"),
+    ]
+    if timestamp_column:
+        checks.append(_freshness_result(target.freshness.latest, target.rows.rows, timestamp_column, max_latency_minutes, "target"))
+    checks.extend(_rule_result(r.name, r.violations, r.op, r.value, "target") for r in target.rules)
+    return checks
+
+
+def _columnar_checks(selected: dict[str, Any], sources=None) -> tuple[list[CheckResult], int, int]:
+    if not columnar.available():
+        return _streaming_checks(selected, sources)
+    return _aggregated_checks(selected, columnar.aggregate_file_columnar, sources)
+
+
+ENGINES = {"streaming": _streaming_checks, "memory": _memory_checks, "columnar": _columnar_checks}
+
+
+def _incremental_checks(selected: dict[str, Any], engine: str, full_rebuild: bool = False) -> tuple[list[CheckResult], int, int, dict[str, Any]]:
+    mode = incremental.mode(selected)
+    # Timestamp filtering is row-wise, so only the offset mode can use the columnar reader.
+    columnar_ok = engine == "columnar" and mode == "offset" and columnar.available()
+    aggregate = columnar.aggregate_file_columnar if columnar_ok else aggregate_file
+    chunk_rows = int(selected.get("chunk_rows", DEFAULT_CHUNK_ROWS))
+    workers = int(selected.get("workers", 1))
+    name = str(selected.get("name"))
+    # format 3: duplicate keys are kept as a sketch (never the full key set) whose filter records its sizing.
+    key = {"definition": incremental.definition_hash(selected), "aggregate": aggregate.__qualname__, "mode": mode, "format": 3}
+
+    previous = None if full_rebuild else incremental.load_state(name)
+    if previous is not None and previous.get("key") != key:
+        previous = None
+    state, info = {"key": key}, {"mode": mode, "full_rebuild": bool(full_rebuild)}
+    sides = {}
+    for side, full in (("source", False), ("target", True)):
+        sides[side], state[side], info[side] = incremental.update_side(
+            aggregate, selected, side, full, previous and previous[side], chunk_rows, workers
+        )
+    source, target = sides["source"], sides["target"]
+    # Key reconciliation and the duplicate verification pass read whole files, so they only
+    # run when this run rescanned them anyway; otherwise they report the last full result.
+    last_full = {} if previous is None else previous.get("last_full", {})
+    if info["source"]["rebuilt"] or info["target"]["rebuilt"]:
+        reconciliation = _check_key_reconciliation(selected, chunk_rows, workers)
+    elif reconcile_settings(selected) is not None:
+        reconciliation = [_not_rerun_result("key_reconciliation", last_full.get("key_reconciliation"))]
+    else:
+        reconciliation = []
+    checks = _aggregate_checks(selected, source, target, reconciliation, None if info["target"]["rebuilt"] else last_full)
+    state["last_full"] = {
+        **last_full,
+        **{c.name: c.status for c in checks if c.name in ("key_reconciliation", "duplicate_check_target") and c.status != "SKIPPED"},
+    }
+    incremental.save_state(name, state)
+    return checks, source.rows.rows, target.rows.rows, info
+
+
+def _cached_checks(selected: dict[str, Any], entry: dict[str, Any]) -> list[CheckResult]:
+    """Checks of a cache entry with freshness re-judged against the current clock."""
+    timestamp_column = selected.get("freshness", {}).get("timestamp_column")
+    max_latency_minutes = int(selected.get("freshness", {}).get("max_latency_minutes", 1440))
+    checks = []
+    for c in entry["checks"]:
+        if c["name"].startswith("freshness_latency_") and c.get("observed"):
+            side = c["name"].removeprefix("freshness_latency_")
+            checks.append(_freshness_result(_parse_iso_utc(c["observed"]), entry["target_rows"], timestamp_column, max_latency_minutes, side))
+        else:
+            checks.append(CheckResult(c["name"], c["status"], c["detail"], c.get("observed")))
+    return checks
+
+
+def profile_report(selected: dict[str, Any], engine: str | None = None, full_rebuild: bool = False, sources=None) -> dict[str, Any]:
+    """Run one already-selected profile and return its report without writing it."""
+    engine = engine or selected.get("engine", "streaming")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown ETL engine: {engine} (expected one of {sorted(ENGINES)})")
+    incremental_info = cache_info = None
+    is_incremental = incremental.mode(selected)
+    if is_incremental and engine == "memory":
+        raise ValueError(f"incremental: {is_incremental} is not supported by the memory engine (use streaming or columnar)")
+    # Incremental profiles keep their own state; caching them too would hide what each run read.
+    key = cache.cache_key(selected, engine) if selected.get("cache") and not is_incremental else None
+    entry = cache.lookup(key) if key and not full_rebuild else None
+    if entry is not None:
+        checks, source_count, target_count = _cached_checks(selected, entry), entry["source_rows"], entry["target_rows"]
+    elif is_incremental:
+        checks, source_count, target_count, incremental_info = _incremental_checks(selected, engine, full_rebuild)
+    else:
+        checks, source_count, target_count = ENGINES[engine](selected, sources)
+    if key:
+        cache_info = {"hit": entry is not None, "key": key}
+        if entry is None:
+            cache.store(key, {
+                "checks": [{**c.as_dict(), "observed": c.observed} for c in checks],
+                "source_rows": source_count,
+                "target_rows": target_count,
+            })
 
     pass_count = len([c for c in checks if c.status == "PASS"])
-    fail_count = len(checks) - pass_count
+    skipped_count = len([c for c in checks if c.status == "SKIPPED"])
+    fail_count = len(checks) - pass_count - skipped_count
     status = "PASS" if fail_count == 0 else "FAIL"
 
     report = {
@@ -203,12 +449,26 @@ def run_etl_profile(profile_name: str | None = None) -> dict[str, Any]:
             "total_checks": len(checks),
             "pass": pass_count,
             "fail": fail_count,
-            "source_rows": len(source_rows),
-            "target_rows": len(target_rows),
+            "skipped": skipped_count,
+            "source_rows": source_count,
+            "target_rows": target_count,
         },
         "checks": [c.as_dict() for c in checks],
     }
+    if incremental_info is not None:
+        report["incremental"] = incremental_info
+    if cache_info is not None:
+        report["cache"] = cache_info
+    if selected.get("history", True):
+        try:
+            history.record(report, engine)
+        except Exception:  # trend history is best-effort: never fail the run that produced the report
+            logger.exception("Could not record ETL history for profile %s", selected.get("name"))
+    return report
+
 
+def run_etl_profile(profile_name: str | None = None, engine: str | None = None, full_rebuild: bool = False) -> dict[str, Any]:
+    report = profile_report(_select_profile(profile_name), engine, full_rebuild)
     ETL_REPORT_PATH.parent.mkdir(parents=True, exist_ok=True)
     ETL_REPORT_PATH.write_text(json.dumps(report, indent=2), encoding="utf-8")
     return report
@@ -0,0 +1,332 @@
+"""Append-only columnar history of ETL check results, for pass-rate and violation trends.
+
+Each profile has one file under ``ETL_HISTORY_DIR`` holding a sequence of blocks.
+A block stores a batch of rows (one row per check per run) column by column:
+
+    b"ETLH" | header length (u32) | header JSON | column payloads
+
+The header lists the row count, the ``run_at`` range of the block (so queries
+skip blocks outside their time window without decompressing anything) and the
+offset, length and type of each zlib-compressed column payload, so a query only
+decompresses the columns it asks for. Timestamps are delta-encoded int64 epoch
+milliseconds, integers are int64 and strings are dictionary-encoded.
+
+Every run appends one small block; once ``COMPACT_BLOCKS`` small blocks have
+piled up at the end of the file they are merged into blocks of up to
+``BLOCK_ROWS`` rows. A torn block at the end of the file (interrupted write) is
+ignored by readers. Appends and compaction hold an exclusive ``flock`` on a
+sidecar ``.lock`` file and queries a shared one, so several processes can use
+the same history directory.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+ETL_HISTORY_DIR = Path("reports/etl-history")
+BLOCK_ROWS = 8192
+COMPACT_BLOCKS = 64
+BUCKETS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+MAGIC = b"ETLH"
+_PREFIX = struct.Struct("<4sI")
+_NULL = -(2**63)
+SCHEMA = {"run_at": "ts", "engine": "str", "check": "str", "status": "str", "violations": "int"}
+
+_lock = threading.Lock()
+
+
+def _history_path(profile_name: str) -> Path:
+    return ETL_HISTORY_DIR / f"{hashlib.sha1(profile_name.encode()).hexdigest()[:16]}.etlh"
+
+
+@contextmanager
+def _file_lock(path: Path, exclusive: bool):
+    # A sidecar file: compaction replaces the history file, so a lock on it would not carry over.
+    if fcntl is None:
+        yield
+        return
+    with path.with_suffix(".lock").open("a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+# --- column codecs ---------------------------------------------------------
+
+
+def _int_bytes(values: list[int]) -> bytes:
+    a = array("q", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _int_values(data: bytes) -> list[int]:
+    a = array("q")
+    a.frombytes(data)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tolist()
+
+
+def _encode(kind: str, values: list) -> bytes:
+    if kind == "ts":
+        deltas = [b - a for a, b in zip([0] + values, values)]
+        raw = _int_bytes(deltas)
+    elif kind == "int":
+        raw = _int_bytes([_NULL if v is None else v for v in values])
+    else:
+        codes: dict[str, int] = {}
+        idx = [codes.setdefault(v, len(codes)) for v in values]
+        words = json.dumps(list(codes)).encode()
+        raw = struct.pack("<I", len(words)) + words + _int_bytes(idx)
+    return zlib.compress(raw, 6)
+
+
+def _decode(kind: str, payload: bytes) -> list:
+    raw = zlib.decompress(payload)
+    if kind == "ts":
+        out, acc = [], 0
+        for d in _int_values(raw):
+            acc += d
+            out.append(acc)
+        return out
+    if kind == "int":
+        return [None if v == _NULL else v for v in _int_values(raw)]
+    (size,) = struct.unpack_from("<I", raw)
+    words = json.loads(raw[4:4 + size])
+    return [words[i] for i in _int_values(raw[4 + size:])]
+
+
+def _block(columns: dict[str, list]) -> bytes:
+    run_at = columns["run_at"]
+    header: dict[str, Any] = {"rows": len(run_at), "run_at": [min(run_at), max(run_at)], "columns": {}}
+    payloads, offset = [], 0
+    for name, kind in SCHEMA.items():
+        data = _encode(kind, columns[name])
+        header["columns"][name] = [kind, offset, len(data)]
+        payloads.append(data)
+        offset += len(data)
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return _PREFIX.pack(MAGIC, len(head)) + head + b"".join(payloads)
+
+
+def _blocks(path: Path) -> Iterator[tuple[int, int, dict[str, Any]]]:
+    """(block start, payload start, header) of every complete block; reads headers only."""
+    size = path.stat().st_size
+    with path.open("rb") as f:
+        pos = 0
+        while pos + _PREFIX.size <= size:
+            f.seek(pos)
+            magic, head_len = _PREFIX.unpack(f.read(_PREFIX.size))
+            if magic != MAGIC:
+                return
+            try:
+                header = json.loads(f.read(head_len))
+            except ValueError:
+                return
+            data_start = pos + _PREFIX.size + head_len
+            end = data_start + sum(length for _, _, length in header["columns"].values())
+            if end > size:
+                return
+            yield pos, data_start, header
+            pos = end
+
+
+def _read(path: Path, data_start: int, header: dict[str, Any], columns: list[str]) -> dict[str, list]:
+    out = {}
+    with path.open("rb") as f:
+        for name in columns:
+            kind, offset, length = header["columns"][name]
+            f.seek(data_start + offset)
+            out[name] = _decode(kind, f.read(length))
+    return out
+
+
+# --- writing ---------------------------------------------------------------
+
+
+def _millis(ts: datetime) -> int:
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp() * 1000)
+
+
+_VIOLATIONS = re.compile(r"(?:violations|duplicate keys)=(\d+)")
+_RECONCILED = re.compile(r"missing=(\d+), extra=(\d+), changed=(\d+)")
+_DELTA = re.compile(r"delta=(-?\d+)")
+
+
+def violations(check: dict[str, Any]) -> int | None:
+    """Violation count behind a check's detail, or None for checks that have none (schema, freshness)."""
+    detail = check.get("detail", "")
+    if m := _RECONCILED.search(detail):
+        return sum(map(int, m.groups()))
+    if m := _VIOLATIONS.search(detail):
+        return int(m.group(1))
+    if check.get("name") == "rowcount_reconciliation" and (m := _DELTA.search(detail)):
+        return abs(int(m.group(1)))
+    return None
+
+
+def record(report: dict[str, Any], engine: str):
+    """Append the checks of one profile report as a block of the profile's history file."""
+    checks = report.get("checks", [])
+    if not checks:
+        return
+    run_at = _millis(datetime.fromisoformat(report["generated_at"]))
+    block = _block({
+        "run_at": [run_at] * len(checks),
+        "engine": [engine] * len(checks),
+        "check": [c["name"] for c in checks],
+        "status": [c["status"] for c in checks],
+        "violations": [violations(c) for c in checks],
+    })
+    path = _history_path(str(report.get("profile")))
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(path, exclusive=True):
+            with path.open("ab") as f:
+                f.write(block)
+            _compact(path)
+
+
+def _compact(path: Path):
+    """Merge the run-sized blocks at the end of the file once there are ``COMPACT_BLOCKS`` of them."""
+    blocks = list(_blocks(path))
+    tail = []
+    for b in reversed(blocks):
+        if b[2]["rows"] >= BLOCK_ROWS:
+            break
+        tail.append(b)
+    if len(tail) < COMPACT_BLOCKS:
+        return
+    tail.reverse()
+    merged: dict[str, list] = {name: [] for name in SCHEMA}
+    for _, data_start, header in tail:
+        for name, values in _read(path, data_start, header, list(SCHEMA)).items():
+            merged[name] += values
+    rows = len(merged["run_at"])
+    start = tail[0][0]
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    with path.open("rb") as src, tmp.open("wb") as dst:
+        remaining = start
+        while remaining:
+            chunk = src.read(min(remaining, 8 << 20))
+            dst.write(chunk)
+            remaining -= len(chunk)
+        for i in range(0, rows, BLOCK_ROWS):
+            dst.write(_block({name: values[i:i + BLOCK_ROWS] for name, values in merged.items()}))
+    tmp.replace(path)
+
+
+# --- queries ---------------------------------------------------------------
+
+
+def scan(
+    profile_name: str,
+    columns: list[str],
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> dict[str, list]:
+    """Values of ``columns`` (plus ``run_at``) for rows with ``since <= run_at < until``.
+
+    Blocks outside the window are skipped on their header alone and only the
+    requested columns of the others are decompressed.
+    """
+    unknown = [c for c in columns if c not in SCHEMA]
+    if unknown:
+        raise ValueError(f"Unknown ETL history columns: {unknown} (expected some of {list(SCHEMA)})")
+    wanted = list(dict.fromkeys(["run_at", *columns]))
+    out: dict[str, list] = {name: [] for name in wanted}
+    path = _history_path(profile_name)
+    if not path.exists():
+        return out
+    lo = _millis(since) if since else None
+    hi = _millis(until) if until else None
+    with _file_lock(path, exclusive=False):  # block offsets must not move under a compaction
+        for _, data_start, header in _blocks(path):
+            first, last = header["run_at"]
+            if (lo is not None and last < lo) or (hi is not None and first >= hi):
+                continue
+            values = _read(path, data_start, header, wanted)
+            keep = range(header["rows"])
+            if (lo is not None and first < lo) or (hi is not None and last >= hi):
+                keep = [i for i, t in enumerate(values["run_at"]) if (lo is None or t >= lo) and (hi is None or t < hi)]
+            for name in wanted:
+                col = values[name]
+                out[name] += col if isinstance(keep, range) else [col[i] for i in keep]
+    return out
+
+
+def _bucket_start(millis: int, bucket: str) -> str:
+    if bucket not in BUCKETS:
+        raise ValueError(f"Unknown bucket: {bucket} (expected one of {sorted(BUCKETS)})")
+    width = BUCKETS[bucket]
+    seconds = millis // 1000
+    return datetime.fromtimestamp(seconds - seconds % width, timezone.utc).isoformat()
+
+
+def pass_rate(
+    profile_name: str,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    bucket: str = "day",
+    check: str | None = None,
+) -> list[dict[str, Any]]:
+    """Runs, passed runs and pass rate per time bucket; a run passes when none of its checks (or ``check``) failed.
+
+    Checks an incremental run did not re-run (``SKIPPED``) do not fail it.
+    """
+    data = scan(profile_name, ["status"] + (["check"] if check else []), since, until)
+    runs: dict[int, bool] = {}
+    for i, (t, status) in enumerate(zip(data["run_at"], data["status"])):
+        if check and data["check"][i] != check:
+            continue
+        runs[t] = runs.get(t, True) and status in ("PASS", "SKIPPED")
+    buckets: dict[str, list[int]] = {}
+    for t, passed in sorted(runs.items()):
+        b = buckets.setdefault(_bucket_start(t, bucket), [0, 0])
+        b[0] += 1
+        b[1] += passed
+    return [{"start": start, "runs": n, "passed": ok, "pass_rate": round(ok / n, 4)} for start, (n, ok) in buckets.items()]
+
+
+def violation_trend(
+    profile_name: str,
+    check: str | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    bucket: str = "day",
+) -> list[dict[str, Any]]:
+    """Per time bucket and check: runs, total, max and latest violation count (checks without counts are skipped)."""
+    data = scan(profile_name, ["check", "violations"], since, until)
+    groups: dict[tuple[str, str], dict[str, Any]] = {}
+    for t, name, v in sorted(zip(data["run_at"], data["check"], data["violations"]), key=lambda r: r[0]):
+        if v is None or (check and name != check):
+            continue
+        g = groups.setdefault((_bucket_start(t, bucket), name), {"runs": 0, "total": 0, "max": 0, "last": 0})
+        g["runs"] += 1
+        g["total"] += v
+        g["max"] = max(g["max"], v)
+        g["last"] = v
+    return [{"start": start, "check": name, **g} for (start, name), g in sorted(groups.items())]
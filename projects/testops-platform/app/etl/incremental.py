@@ -0,0 +1,160 @@
+"""Incremental ETL revalidation: keep last run's aggregates and fold in only new rows.
+
+Two ways to find the new rows of a side:
+
+- ``offset``: the file is append-only. The previous run remembers how many bytes
+  it consumed plus digests of the first and last bytes of that prefix; if the
+  prefix is unchanged only the appended byte range is read.
+- ``timestamp``: rows are immutable once written, carry
+  ``freshness.timestamp_column`` and arrive stamped no earlier than the latest
+  stamp already in the file. The file is rescanned and only rows stamped after
+  the previous run's watermark are aggregated, plus rows stamped exactly at the
+  watermark whose fingerprint (a hash of the whole row) the previous run did not
+  record. Identical rows at the watermark are told apart by count, except when
+  ``workers`` splits them across byte ranges.
+
+Anything that makes the saved state unusable (different profile definition,
+engine, rewritten or truncated file, no watermark yet) triggers a full rebuild
+of that side, as does ``full_rebuild=True``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+from pathlib import Path
+from typing import Any, Callable
+
+from app.etl.parallel import aggregate_parallel
+from app.etl.streaming import DEFAULT_CHUNK_ROWS, existing_csv, read_header
+
+ETL_STATE_DIR = Path("reports/etl-state")
+EDGE_BYTES = 64 << 10
+MODES = {"offset", "timestamp"}
+
+
+def mode(profile: dict[str, Any]) -> str | None:
+    """Incremental mode of a profile: ``incremental: offset|timestamp``, or ``true`` to pick one."""
+    value = profile.get("incremental")
+    if not value:
+        return None
+    if value is True:
+        return "timestamp" if (profile.get("freshness") or {}).get("timestamp_column") else "offset"
+    if value not in MODES:
+        raise ValueError(f"Unknown incremental mode: {value} (expected one of {sorted(MODES)})")
+    if value == "timestamp" and not (profile.get("freshness") or {}).get("timestamp_column"):
+        raise ValueError("incremental: timestamp needs freshness.timestamp_column")
+    return value
+
+
+def definition_hash(profile: dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(profile, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _state_path(profile_name: str) -> Path:
+    return ETL_STATE_DIR / f"{hashlib.sha1(profile_name.encode()).hexdigest()[:16]}.pkl"
+
+
+def load_state(profile_name: str) -> dict[str, Any] | None:
+    p = _state_path(profile_name)
+    if not p.exists():
+        return None
+    try:
+        with p.open("rb") as f:
+            return pickle.load(f)
+    except Exception:  # unreadable or written by an incompatible version: rebuild
+        return None
+
+
+def save_state(profile_name: str, state: dict[str, Any]):
+    p = _state_path(profile_name)
+    p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = p.with_suffix(f".{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(p)
+
+
+def _digest(path: Path, start: int, end: int) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as f:
+        f.seek(start)
+        h.update(f.read(end - start))
+    return h.hexdigest()
+
+
+def file_mark(path: Path, end: int) -> dict[str, Any]:
+    """What an append-only check needs to recognise the first ``end`` bytes of ``path`` later."""
+    with path.open("rb") as f:
+        f.seek(max(0, end - 1))
+        last = f.read(1) if end else b""
+    return {
+        "end": end,
+        "head": _digest(path, 0, min(end, EDGE_BYTES)),
+        "tail": _digest(path, max(0, end - EDGE_BYTES), end),
+        "newline": last == b"\n",
+    }
+
+
+def appended_range(path: Path, mark: dict[str, Any], size: int) -> tuple[int, int] | None:
+    """Byte range appended since ``mark`` was taken, or None when the old prefix changed."""
+    end = mark["end"]
+    if size < end or (size > end and not mark["newline"]):  # truncated, or the last record is still being written
+        return None
+    if _digest(path, 0, min(end, EDGE_BYTES)) != mark["head"] or _digest(path, max(0, end - EDGE_BYTES), end) != mark["tail"]:
+        return None
+    return end, size
+
+
+def _sized_like(profile: dict[str, Any], base) -> dict[str, Any]:
+    """``profile`` with the duplicate-key filter size of ``base``, so new sections merge into it."""
+    bloom = getattr(base.dups, "bloom", None)
+    return profile if bloom is None else {**profile, "_expected_keys": bloom.expected}
+
+
+def update_side(
+    aggregate: Callable[..., Any],
+    profile: dict[str, Any],
+    side: str,
+    full: bool,
+    previous: dict[str, Any] | None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+) -> tuple[Any, dict[str, Any], dict[str, Any]]:
+    """Return (aggregates, state to persist, run info) for the ``side`` ("source"/"target") of ``profile``."""
+    how = mode(profile)
+    path = existing_csv(profile[side]["path"])
+    size = path.stat().st_size
+    base = None if previous is None else previous["aggregates"]
+
+    if how == "offset":
+        data_start = read_header(path)[1]
+        section = appended_range(path, previous["mark"], size) if previous else None
+        if section is None:
+            aggs = aggregate_parallel(aggregate, path, profile, full, chunk_rows, workers, (data_start, max(size, data_start)))
+            rebuilt = True
+        else:
+            aggs, rebuilt = base, False
+            if section[1] > section[0]:
+                aggs.merge(aggregate_parallel(aggregate, path, _sized_like(profile, base), full, chunk_rows, workers, section))
+        new_rows = aggs.rows.rows - (0 if rebuilt else previous["rows"])
+        state = {"aggregates": aggs, "rows": aggs.rows.rows, "mark": file_mark(path, size)}
+    else:
+        column = profile["freshness"]["timestamp_column"]
+        after = previous["watermark"] if previous and "at_watermark" in previous else None  # older states: rebuild
+        rebuilt = after is None
+        since = {"column": column, "after": after, "seen": None if rebuilt else previous["at_watermark"]}
+        fresh = aggregate_parallel(aggregate, path, {**(profile if rebuilt else _sized_like(profile, base)), "_since": since}, full, chunk_rows, workers)
+        if rebuilt:
+            aggs = fresh
+        else:
+            aggs = base
+            aggs.merge(fresh)
+        new_rows = fresh.rows.rows
+        state = {"aggregates": aggs, "rows": aggs.rows.rows, "watermark": aggs.watermark, "at_watermark": aggs.at_watermark}
+
+    info = {"rebuilt": rebuilt, "new_rows": new_rows}
+    if how == "timestamp":
+        info["watermark"] = aggs.watermark.isoformat() if aggs.watermark else None
+    return aggs, state, info
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import mmap
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+from app.etl.sketches import sized as sketch_sized
+from app.etl.streaming import DEFAULT_CHUNK_ROWS, existing_csv, read_header
+
+MIN_RANGE_BYTES = 16 << 20  # below this a range is not worth a process hop
+RANGES_PER_WORKER = 4  # several ranges per worker evens out skew between them
+_COUNT_STEP = 64 << 20
+SAMPLE_BYTES = 1 << 20  # read to estimate a section's row count
+
+
+def _count_quotes(mm: mmap.mmap, start: int, end: int) -> int:
+    n = 0
+    for i in range(start, end, _COUNT_STEP):
+        n += mm[i:min(i + _COUNT_STEP, end)].count(b'"')
+    return n
+
+
+def estimate_rows(path: str | Path, start: int, end: int) -> int:
+    """Rows in the section ``[start, end)``, extrapolated from the newlines in its first ``SAMPLE_BYTES``."""
+    if end <= start:
+        return 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        sample = f.read(min(SAMPLE_BYTES, end - start))
+    if len(sample) == end - start:
+        return sample.count(b"\n") + (not sample.endswith(b"\n"))
+    whole = sample.rfind(b"\n") + 1 or len(sample)  # rows cut off by the sample end do not count
+    return -(-(end - start) * max(1, sample.count(b"\n", 0, whole)) // whole)
+
+
+def split_ranges(path: str | Path, data_start: int, parts: int, size: int | None = None) -> list[tuple[int, int]]:
+    """Split the data section of a CSV into about ``parts`` byte ranges that each start on a record.
+
+    A candidate cut moves forward to the next newline that lies outside a quoted
+    field. Quote parity is tracked with ``bytes.count`` from ``data_start`` on, so a
+    quoted value spanning lines is never split. ``size`` caps the section (default: EOF).
+    """
+    size = Path(path).stat().st_size if size is None else size
+    if parts <= 1 or size <= data_start:
+        return [(data_start, size)]
+    bounds = [data_start]
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos, quotes = data_start, 0
+        for i in range(1, parts):
+            target = data_start + (size - data_start) * i // parts
+            if target <= pos:
+                continue
+            quotes += _count_quotes(mm, pos, target)
+            pos = target
+            while True:
+                nl = mm.find(b"\n", pos, size)
+                if nl == -1:
+                    pos = size
+                    break
+                quotes += _count_quotes(mm, pos, nl)
+                pos = nl + 1
+                if quotes % 2 == 0:
+                    break
+            if pos >= size:
+                break
+            bounds.append(pos)
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def aggregate_parallel(
+    aggregate: Callable[..., Any],
+    path: str | Path,
+    profile: dict[str, Any],
+    full: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    workers: int = 1,
+    byte_range: tuple[int, int] | None = None,
+):
+    """Run ``aggregate`` (a module-level ``aggregate_file``-style function) over byte ranges in a process pool.
+
+    Each worker returns the partial aggregates for its range; they are merged in
+    file order, so ties (e.g. equal max timestamps) resolve as in a single pass.
+    Small files and ``workers <= 1`` run in-process. ``byte_range`` limits the work
+    to a record-aligned section of the data, e.g. rows appended since the last run.
+    A duplicate-key sketch without ``expected_keys`` is sized from the section's
+    estimated row count, once here so that every range builds mergeable filters.
+    """
+    p = existing_csv(path)
+    header, data_start = read_header(p)
+    start, end = byte_range or (data_start, p.stat().st_size)
+    if full:
+        profile = sketch_sized(profile, lambda: estimate_rows(p, start, end))
+    parts = min(workers * RANGES_PER_WORKER, (end - start) // MIN_RANGE_BYTES)
+    if workers <= 1 or parts <= 1:
+        return aggregate(p, profile, full, chunk_rows, byte_range, header)
+
+    ranges = split_ranges(p, start, parts, end)
+    # spawn, not fork: the API process runs threads, and forking those is unsafe.
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges)), mp_context=ctx) as ex:
+        futures = [ex.submit(aggregate, str(p), profile, full, chunk_rows, r, header) for r in ranges]
+        merged = None
+        for fut in futures:
+            side = fut.result()
+            if merged is None:
+                merged = side
+            else:
+                merged.merge(side)
+    return merged
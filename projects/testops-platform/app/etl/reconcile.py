@@ -0,0 +1,199 @@
+"""Key-level source/target reconciliation with bounded memory.
+
+Phase one streams each CSV and appends a ``fingerprint<TAB>repr(key)`` record to one of
+N spill files picked by a hash of the key, so equal keys from both sides land in
+the same partition. Phase two loads one source/target partition pair at a time
+and compares fingerprints; peak memory is one partition's keys, not the file's.
+"""
+from __future__ import annotations
+
+import ast
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Any, TextIO
+
+from app.etl.parallel import aggregate_parallel
+from app.etl.streaming import DEFAULT_CHUNK_ROWS, _column, csv_rows, existing_csv, read_header, to_columns
+
+PARTITION_INPUT_BYTES = 64 << 20  # input bytes per partition when `partitions` is not configured
+MAX_PARTITIONS = 4096
+DEFAULT_SAMPLE_SIZE = 20
+MAX_OPEN_SPILL_FILES = 64  # per range; the least recently written partition is closed beyond this
+
+
+def settings(profile: dict[str, Any]) -> dict[str, Any] | None:
+    """The profile's ``reconciliation`` block, or None when key reconciliation is not enabled."""
+    cfg = profile.get("reconciliation")
+    if cfg is None or cfg is False:
+        return None
+    cfg = {} if cfg is True else dict(cfg)
+    return cfg if cfg.get("enabled", True) else None
+
+
+def _partition_count(cfg: dict[str, Any], paths: list[str]) -> int:
+    if cfg.get("partitions"):
+        return max(1, int(cfg["partitions"]))
+    size = sum(existing_csv(p).stat().st_size for p in paths)
+    return max(1, min(MAX_PARTITIONS, -(-size // PARTITION_INPUT_BYTES)))
+
+
+class KeySpill:
+    """Hash-partitioned (key, row fingerprint) records of one file, or of one byte range of it."""
+
+    def __init__(self, directory: str | Path, key_columns: list[str], compare_columns: list[str], partitions: int):
+        self.directory = Path(directory)
+        self.key_columns = list(key_columns)
+        self.compare_columns = list(compare_columns)
+        self.partitions = partitions
+        self.files: list[list[str]] = [[] for _ in range(partitions)]
+        self._open: OrderedDict[int, TextIO] = OrderedDict()
+
+    def _handle(self, p: int) -> TextIO:
+        f = self._open.pop(p, None)
+        if f is None:
+            path = self.directory / f"part-{p:05d}.tsv"
+            if not self.files[p]:
+                self.files[p].append(str(path))
+            if len(self._open) >= MAX_OPEN_SPILL_FILES:
+                self._open.popitem(last=False)[1].close()
+            f = path.open("a", encoding="utf-8", newline="")
+        self._open[p] = f
+        return f
+
+    def close(self):
+        """Flush and close the partition files; they are read only after this."""
+        while self._open:
+            self._open.popitem()[1].close()
+
+    def update(self, n: int, cols: dict):
+        keys = zip(*(_column(cols, n, c) for c in self.key_columns)) if self.key_columns else repeat((), n)
+        values = zip(*(_column(cols, n, c) for c in self.compare_columns)) if self.compare_columns else repeat((), n)
+        buckets: dict[int, list[str]] = {}
+        parts = self.partitions
+        for k, v in zip(keys, values):
+            # repr() of a tuple of str/None is unambiguous, single-line and much cheaper than json.
+            key = repr(k)
+            p = int.from_bytes(blake2b(key.encode(), digest_size=8).digest(), "big") % parts
+            fp = blake2b(repr(v).encode(), digest_size=8).hexdigest()
+            buckets.setdefault(p, []).append(f"{fp}\t{key}\n")
+        for p, lines in buckets.items():
+            self._handle(p).writelines(lines)
+
+    def merge(self, other: "KeySpill"):
+        for mine, theirs in zip(self.files, other.files):
+            mine += theirs
+
+
+def spill_file(
+    path: str | Path,
+    profile: dict[str, Any],
+    full: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    byte_range: tuple[int, int] | None = None,
+    header: list[str] | None = None,
+) -> KeySpill:
+    """``aggregate_file``-compatible partition pass, so ``aggregate_parallel`` can fan it out."""
+    p = existing_csv(path)
+    if header is None:
+        header = read_header(p)[0]
+    spill = profile["_spill"]
+    directory = tempfile.mkdtemp(prefix="range-", dir=spill["dir"])
+    keys = list(profile.get("key_columns", []))
+    compare = spill["compare_columns"]
+    side = KeySpill(directory, keys, compare, spill["partitions"])
+    needed = list(dict.fromkeys(keys + compare))
+    rows = (r for r in csv_rows(p, byte_range) if r)
+    try:
+        while chunk := list(islice(rows, chunk_rows)):
+            side.update(len(chunk), to_columns(header, chunk, needed))
+    finally:
+        side.close()
+    return side
+
+
+def _load(files: list[str]) -> dict[str, str]:
+    # A key seen more than once keeps all its fingerprints (fixed width, concatenated).
+    out: dict[str, str] = {}
+    for name in files:
+        with open(name, encoding="utf-8", newline="") as f:
+            for line in f:
+                fp, key = line.rstrip("\n").split("\t", 1)
+                out[key] = out.get(key, "") + fp
+    return out
+
+
+def _same(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    if len(a) != len(b) or len(a) == 16:
+        return False
+    return sorted(a[i:i + 16] for i in range(0, len(a), 16)) == sorted(b[i:i + 16] for i in range(0, len(b), 16))
+
+
+def _sample_key(key: str):
+    k = ast.literal_eval(key)
+    return k[0] if len(k) == 1 else list(k)
+
+
+@dataclass
+class Reconciliation:
+    key_columns: list[str]
+    compare_columns: list[str]
+    partitions: int
+    sample_size: int
+    missing: int = 0
+    extra: int = 0
+    changed: int = 0
+    matched: int = 0
+    samples: dict[str, list] = field(default_factory=lambda: {"missing": [], "extra": [], "changed": []})
+
+    def _count(self, kind: str, key: str):
+        setattr(self, kind, getattr(self, kind) + 1)
+        if len(self.samples[kind]) < self.sample_size:
+            self.samples[kind].append(_sample_key(key))
+
+    def compare(self, source: KeySpill, target: KeySpill):
+        for p in range(self.partitions):
+            src = _load(source.files[p])
+            for key, fps in _load(target.files[p]).items():
+                expected = src.pop(key, None)
+                if expected is None:
+                    self._count("extra", key)
+                elif _same(expected, fps):
+                    self.matched += 1
+                else:
+                    self._count("changed", key)
+            for key in src:
+                self._count("missing", key)
+
+
+def reconcile_files(profile: dict[str, Any], chunk_rows: int = DEFAULT_CHUNK_ROWS, workers: int = 1) -> Reconciliation | None:
+    """Compare source and target of ``profile`` key by key; None when reconciliation is not configured."""
+    cfg = settings(profile)
+    if cfg is None:
+        return None
+    source_path, target_path = profile["source"]["path"], profile["target"]["path"]
+    keys = list(profile.get("key_columns", []))
+    compare = cfg.get("compare_columns")
+    if compare is None:
+        target_header = set(read_header(existing_csv(target_path))[0])
+        compare = [c for c in read_header(existing_csv(source_path))[0] if c in target_header and c not in keys]
+    result = Reconciliation(keys, list(compare), _partition_count(cfg, [source_path, target_path]), int(cfg.get("sample_size", DEFAULT_SAMPLE_SIZE)))
+
+    root = tempfile.mkdtemp(prefix="etl-reconcile-", dir=cfg.get("spill_dir"))
+    try:
+        sides = []
+        for name, path in (("source", source_path), ("target", target_path)):
+            side_dir = Path(root) / name
+            side_dir.mkdir()
+            spill = {"dir": str(side_dir), "compare_columns": result.compare_columns, "partitions": result.partitions}
+            sides.append(aggregate_parallel(spill_file, path, {**profile, "_spill": spill}, chunk_rows=chunk_rows, workers=workers))
+        result.compare(*sides)
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+    return result
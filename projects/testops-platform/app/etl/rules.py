@@ -0,0 +1,370 @@
+"""Business-rule expressions for ETL profiles.
+
+A rule with an ``expr`` holds when the expression is true for a row, e.g.::
+
+    amount >= 0 and status in ('paid', 'pending')
+    shipped_at is null or shipped_at >= ordered_at
+    not (email matches '^[^@]+@[^@]+$') and country != 'US'
+
+Supported: ``and``/``or``/``not`` and parentheses; ``== != < <= > >=`` against
+number or string literals or another column (numerically when both values parse,
+as text otherwise); ``[not] in (...)``; ``matches 're'``
+(``re.search``); ``is [not] null``. A blank or missing value is null, and a
+comparison with a null (or an unparseable number) is false.
+
+Expressions are parsed once (cached by text) and compiled into closures over a
+column context: ``PyColumns`` works on the tuples of the streaming engine, and the
+columnar engine supplies a NumPy context, so each comparison runs over a whole
+chunk. ``RuleSet`` evaluates all expression rules of a profile against one shared
+context per chunk, so number parsing of a column is done once for all rules.
+"""
+from __future__ import annotations
+
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable
+
+_TOKEN = re.compile(
+    r"\s*(?:(?P<num>-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+    r"|(?P<str>'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\")"
+    r"|(?P<op>==|!=|<=|>=|<|>|=|\(|\)|,)"
+    r"|(?P<name>[A-Za-z_][A-Za-z0-9_.]*|`[^`]+`))"
+)
+_KEYWORDS = {"and", "or", "not", "in", "is", "null", "matches"}
+_FLIP = {"<": ">", "<=": ">=", ">": "<", ">=": "<=", "==": "==", "!=": "!="}
+CMP: dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+}
+
+
+class RuleSyntaxError(ValueError):
+    pass
+
+
+def _tokenize(text: str) -> list[tuple[str, Any]]:
+    tokens, pos = [], 0
+    text = text.rstrip()
+    while pos < len(text):
+        m = _TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise RuleSyntaxError(f"unexpected input at {pos}: {text[pos:pos + 20]!r}")
+        pos = m.end()
+        kind = m.lastgroup
+        value = m.group(kind)
+        if kind == "num":
+            tokens.append(("num", float(value)))
+        elif kind == "str":
+            tokens.append(("str", re.sub(r"\\([\\'\"])", r"\1", value[1:-1])))  # keeps regex escapes like \d
+        elif kind == "name" and value.lower() in _KEYWORDS:
+            tokens.append(("kw", value.lower()))
+        elif kind == "name":
+            tokens.append(("col", value.strip("`")))
+        else:
+            tokens.append(("op", "==" if value == "=" else value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.i = 0
+
+    def peek(self, kind: str | None = None, value: Any = None) -> bool:
+        if self.i >= len(self.tokens):
+            return False
+        k, v = self.tokens[self.i]
+        return (kind is None or k == kind) and (value is None or v == value)
+
+    def take(self, kind: str | None = None, value: Any = None):
+        if not self.peek(kind, value):
+            got = self.tokens[self.i][1] if self.i < len(self.tokens) else "end of expression"
+            raise RuleSyntaxError(f"expected {value or kind}, got {got!r} in {self.text!r}")
+        self.i += 1
+        return self.tokens[self.i - 1]
+
+    def parse(self):
+        node = self.disjunction()
+        if self.i != len(self.tokens):
+            raise RuleSyntaxError(f"unexpected {self.tokens[self.i][1]!r} in {self.text!r}")
+        return node
+
+    def disjunction(self):
+        node = self.conjunction()
+        while self.peek("kw", "or"):
+            self.take()
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.peek("kw", "and"):
+            self.take()
+            node = ("and", node, self.negation())
+        return node
+
+    def negation(self):
+        if self.peek("kw", "not"):
+            self.take()
+            return ("not", self.negation())
+        return self.predicate()
+
+    def operand(self):
+        if self.peek("num") or self.peek("str") or self.peek("col"):
+            return self.take()
+        raise RuleSyntaxError(f"expected a column or literal in {self.text!r}")
+
+    def predicate(self):
+        if self.peek("op", "("):
+            self.take()
+            node = self.disjunction()
+            self.take("op", ")")
+            return node
+        left = self.operand()
+        if self.peek("op") and self.tokens[self.i][1] in CMP:
+            return ("cmp", self.take()[1], left, self.operand())
+        negate = False
+        if self.peek("kw", "not"):
+            self.take()
+            negate = True
+            if not self.peek("kw", "in"):
+                raise RuleSyntaxError(f"expected 'in' after 'not' in {self.text!r}")
+        if self.peek("kw", "in"):
+            self.take()
+            self.take("op", "(")
+            values = [self._literal()]
+            while self.peek("op", ","):
+                self.take()
+                values.append(self._literal())
+            self.take("op", ")")
+            return ("in", left, values, negate)
+        if self.peek("kw", "matches"):
+            self.take()
+            pattern = self.take("str")[1]
+            try:
+                re.compile(pattern)
+            except re.error as e:
+                raise RuleSyntaxError(f"bad regex {pattern!r}: {e}") from e
+            return ("match", left, pattern)
+        if self.peek("kw", "is"):
+            self.take()
+            negate = self.peek("kw", "not")
+            if negate:
+                self.take()
+            self.take("kw", "null")
+            return ("null", left, negate)
+        raise RuleSyntaxError(f"incomplete condition after {left[1]!r} in {self.text!r}")
+
+    def _literal(self):
+        if self.peek("num") or self.peek("str"):
+            return self.take()
+        raise RuleSyntaxError(f"'in' takes literals only in {self.text!r}")
+
+
+def _columns(node, out: list[str]) -> list[str]:
+    kind = node[0]
+    if kind == "col":
+        out.append(node[1])
+    elif kind in ("num", "str"):
+        pass
+    elif kind in ("and", "or"):
+        _columns(node[1], out)
+        _columns(node[2], out)
+    elif kind == "not":
+        _columns(node[1], out)
+    elif kind == "cmp":
+        _columns(node[2], out)
+        _columns(node[3], out)
+    else:  # in / match / null
+        _columns(node[1], out)
+    return out
+
+
+def _compile(node) -> Callable:
+    kind = node[0]
+    if kind in ("and", "or"):
+        left, right = _compile(node[1]), _compile(node[2])
+        if kind == "and":
+            return lambda ctx: ctx.and_(left(ctx), right(ctx))
+        return lambda ctx: ctx.or_(left(ctx), right(ctx))
+    if kind == "not":
+        inner = _compile(node[1])
+        return lambda ctx: ctx.not_(inner(ctx))
+    if kind == "null":
+        _, (_, col), negate = node
+        if negate:
+            return lambda ctx: ctx.not_(ctx.null(col))
+        return lambda ctx: ctx.null(col)
+    if kind == "match":
+        _, (_, col), pattern = node
+        rx = re.compile(pattern)
+        return lambda ctx: ctx.match(col, rx)
+    if kind == "in":
+        _, (_, col), values, negate = node
+        if all(k == "num" for k, _ in values):
+            nums = frozenset(v for _, v in values)
+            test = lambda ctx: ctx.isin_num(col, nums)  # noqa: E731
+        else:
+            texts = frozenset(str(v) if k == "str" else _num_text(v) for k, v in values)
+            test = lambda ctx: ctx.isin_text(col, texts)  # noqa: E731
+        if negate:
+            # `x not in (...)` is still false for a null x
+            return lambda ctx: ctx.and_(ctx.not_(test(ctx)), ctx.not_(ctx.null(col)))
+        return test
+    _, op, left, right = node  # cmp
+    if left[0] != "col" and right[0] == "col":
+        op, left, right = _FLIP[op], right, left
+    if left[0] != "col":
+        const = CMP[op](left[1], right[1]) if left[0] == right[0] else op == "!="
+        return lambda ctx: ctx.const(const)
+    col = left[1]
+    if right[0] == "num":
+        value = right[1]
+        return lambda ctx: ctx.cmp_num(op, col, value)
+    if right[0] == "str":
+        value = right[1]
+        return lambda ctx: ctx.cmp_text(op, col, value)
+    other = right[1]
+    return lambda ctx: ctx.cmp_cols(op, col, other)
+
+
+def _num_text(v: float) -> str:
+    return str(int(v)) if v.is_integer() else repr(v)
+
+
+class Expression:
+    def __init__(self, text: str):
+        self.text = text
+        tree = _Parser(text).parse()
+        self.columns = list(dict.fromkeys(_columns(tree, [])))
+        self.predicate = _compile(tree)
+
+
+@lru_cache(maxsize=1024)
+def compile_expression(text: str) -> Expression:
+    """Parse and compile once per distinct expression text."""
+    return Expression(text)
+
+
+def _to_float(v) -> float | None:
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
+class PyColumns:
+    """Column context over Python sequences (``None`` for short rows); values are cached per chunk."""
+
+    def __init__(self, n: int, cols: dict):
+        self.n = n
+        self.cols = cols
+        self._num: dict[str, list] = {}
+        self._null: dict[str, list] = {}
+
+    def text(self, col: str):
+        v = self.cols.get(col)
+        return v if v is not None else ("",) * self.n
+
+    def num(self, col: str) -> list:
+        if col not in self._num:
+            self._num[col] = [None if v is None else _to_float(v) for v in self.text(col)]
+        return self._num[col]
+
+    def null(self, col: str) -> list:
+        if col not in self._null:
+            self._null[col] = [v is None or not v.strip() for v in self.text(col)]
+        return self._null[col]
+
+    def const(self, value: bool) -> list:
+        return [value] * self.n
+
+    def and_(self, a, b):
+        return [x and y for x, y in zip(a, b)]
+
+    def or_(self, a, b):
+        return [x or y for x, y in zip(a, b)]
+
+    def not_(self, a):
+        return [not x for x in a]
+
+    def cmp_num(self, op: str, col: str, value: float):
+        f = CMP[op]
+        return [x is not None and f(x, value) for x in self.num(col)]
+
+    def cmp_text(self, op: str, col: str, value: str):
+        f = CMP[op]
+        return [not isnull and f(x, value) for x, isnull in zip(self.text(col), self.null(col))]
+
+    def cmp_cols(self, op: str, a: str, b: str):
+        # Numbers when both sides parse, text otherwise (so ISO timestamps order correctly).
+        f = CMP[op]
+        out = []
+        for xn, yn, xt, yt, xnull, ynull in zip(self.num(a), self.num(b), self.text(a), self.text(b), self.null(a), self.null(b)):
+            if xnull or ynull:
+                out.append(False)
+            elif xn is not None and yn is not None:
+                out.append(f(xn, yn))
+            else:
+                out.append(f(xt, yt))
+        return out
+
+    def isin_num(self, col: str, values: frozenset):
+        return [x is not None and x in values for x in self.num(col)]
+
+    def isin_text(self, col: str, values: frozenset):
+        return [not isnull and x in values for x, isnull in zip(self.text(col), self.null(col))]
+
+    def match(self, col: str, rx: re.Pattern):
+        return [not isnull and rx.search(x) is not None for x, isnull in zip(self.text(col), self.null(col))]
+
+    def count_false(self, mask) -> int:
+        return sum(1 for x in mask if not x)
+
+
+class ExprRule:
+    """Result holder for one expression rule (same attributes the engine reads from ``RuleViolations``)."""
+
+    op = "expr"
+
+    def __init__(self, rule: dict[str, Any]):
+        self.value = str(rule["expr"])
+        self.name = str(rule.get("name", self.value))
+        self.violations = 0
+        compile_expression(self.value)  # fail fast on syntax errors
+
+    @property
+    def columns(self) -> list[str]:
+        return compile_expression(self.value).columns
+
+
+class RuleSet:
+    """Evaluates every expression rule of a profile against one shared column context per chunk.
+
+    Only expression texts are stored (compiled predicates come from the cache), so
+    the state pickles for process-pool workers and incremental runs.
+    """
+
+    def __init__(self, rules: list[ExprRule], context: type = PyColumns):
+        self.rules = rules
+        self.context = context
+
+    def update(self, n: int, cols: dict):
+        ctx = self.context(n, cols)
+        for r in self.rules:
+            r.violations += ctx.count_false(compile_expression(r.value).predicate(ctx))
+
+    def merge(self, other: "RuleSet"):
+        for a, b in zip(self.rules, other.rules):
+            a.violations += b.violations
+
+
+def is_expression(rule: dict[str, Any]) -> bool:
+    return "expr" in rule
+
+
+def rule_columns(rule: dict[str, Any]) -> list[str]:
+    if is_expression(rule):
+        return compile_expression(str(rule["expr"])).columns
+    return [str(rule.get("column", ""))]
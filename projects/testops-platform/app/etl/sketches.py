@@ -0,0 +1,135 @@
+"""Mergeable Bloom filter and HyperLogLog for memory-bounded duplicate-key checks.
+
+The aggregators built on them (``streaming.SketchDuplicateKeys`` and its columnar
+variant) keep only Bloom-filter hits as duplicate candidates and count those
+exactly in a second pass, so the duplicate count stays exact while memory is the
+filter plus the candidates instead of every distinct key.
+"""
+from __future__ import annotations
+
+import math
+from hashlib import blake2b
+from typing import Any, Callable
+
+DEFAULT_FALSE_POSITIVE_RATE = 0.01
+DEFAULT_EXPECTED_KEYS = 10_000_000  # only when neither the profile nor a row estimate gives a size
+MIN_EXPECTED_KEYS = 1024
+SIZE_HEADROOM = 1.25  # on top of a row estimate: sampling error and a few appended runs
+DEFAULT_DISTINCT_ERROR = 0.01
+
+
+def key_hash(key: tuple) -> tuple[int, int]:
+    d = blake2b(repr(key).encode(), digest_size=16).digest()
+    return int.from_bytes(d[:8], "big"), int.from_bytes(d[8:], "big") | 1
+
+
+class BloomFilter:
+    def __init__(self, expected: int, false_positive_rate: float):
+        expected = max(1, int(expected))
+        self.expected, self.false_positive_rate = expected, false_positive_rate
+        self.size = max(64, int(-expected * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / expected * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, h1: int, h2: int):
+        m = self.size
+        return [(h1 + i * h2) % m for i in range(self.hashes)]
+
+    def add(self, h1: int, h2: int) -> bool:
+        """Insert; True if every bit was already set, i.e. the key was (probably) seen before."""
+        bits, seen = self.bits, True
+        for pos in self._positions(h1, h2):
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                seen = False
+                bits[byte] |= mask
+        return seen
+
+    def __contains__(self, hashes: tuple[int, int]) -> bool:
+        bits = self.bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(*hashes))
+
+    def combine(self, other: "BloomFilter", op) -> "BloomFilter":
+        if other.size != self.size or other.hashes != self.hashes:
+            raise ValueError(f"Cannot combine Bloom filters of {self.size} and {other.size} bits")
+        out = BloomFilter.__new__(BloomFilter)
+        out.size, out.hashes = self.size, self.hashes
+        out.expected, out.false_positive_rate = self.expected, self.false_positive_rate
+        n = len(self.bits)
+        out.bits = bytearray(op(int.from_bytes(self.bits, "big"), int.from_bytes(other.bits, "big")).to_bytes(n, "big"))
+        return out
+
+    def empty(self) -> bool:
+        return not any(self.bits)
+
+    def fill_ratio(self) -> float:
+        return int.from_bytes(self.bits, "big").bit_count() / self.size
+
+    def estimated_false_positive_rate(self) -> float:
+        """False-positive rate at the current fill; above ``false_positive_rate`` the filter is overfilled."""
+        return self.fill_ratio() ** self.hashes
+
+
+class HyperLogLog:
+    def __init__(self, relative_error: float = DEFAULT_DISTINCT_ERROR):
+        # standard error is about 1.04 / sqrt(2**p)
+        self.p = min(18, max(4, math.ceil(math.log2((1.04 / relative_error) ** 2))))
+        self.registers = bytearray(1 << self.p)
+
+    def add(self, h: int):
+        p = self.p
+        idx = h >> (64 - p)
+        rest = h & ((1 << (64 - p)) - 1)
+        rank = (64 - p) - rest.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def merge(self, other: "HyperLogLog"):
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    @property
+    def error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def count(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)  # linear counting for small cardinalities
+        return int(round(estimate))
+
+
+def options(profile: dict[str, Any]) -> dict[str, Any] | None:
+    """Sketch settings from ``duplicates: {mode: sketch, ...}``, or None for exact duplicate detection.
+
+    Exact mode with ``workers`` > 1 also gets (default) settings: each worker then
+    returns a fixed-size filter instead of its whole key set, and the verification
+    pass keeps the count exact. Incremental profiles get them as well, so their
+    saved state holds the filter rather than every key. Without ``expected_keys``
+    the filter is sized by ``sized`` from the input, else ``DEFAULT_EXPECTED_KEYS``.
+    """
+    cfg = profile.get("duplicates") or {}
+    mode = cfg.get("mode", "exact")
+    if mode not in ("exact", "sketch"):
+        raise ValueError(f"Unknown duplicates mode: {mode} (expected exact or sketch)")
+    if mode == "exact" and int(profile.get("workers", 1)) <= 1 and not profile.get("incremental"):
+        return None
+    return {
+        "false_positive_rate": float(cfg.get("false_positive_rate", DEFAULT_FALSE_POSITIVE_RATE)),
+        "expected_keys": int(cfg.get("expected_keys") or profile.get("_expected_keys") or DEFAULT_EXPECTED_KEYS),
+        "distinct_error": float(cfg.get("distinct_error", DEFAULT_DISTINCT_ERROR)),
+    }
+
+
+
+def sized(profile: dict[str, Any], estimate_rows: Callable[[], int]) -> dict[str, Any]:
+    """``profile`` with its Bloom filter sized for ``estimate_rows()`` keys.
+
+    Unchanged when no sketch is used, ``duplicates.expected_keys`` is configured or
+    the size was already fixed (e.g. to match a saved filter it must merge with).
+    """
+    if options(profile) is None or (profile.get("duplicates") or {}).get("expected_keys") or profile.get("_expected_keys"):
+        return profile
+    return {**profile, "_expected_keys": max(MIN_EXPECTED_KEYS, math.ceil(estimate_rows() * SIZE_HEADROOM))}
@@ -0,0 +1,434 @@
+from __future__ import annotations
+
+import csv
+import io
+from collections import Counter
+from datetime import datetime, timezone
+from hashlib import blake2b
+from itertools import islice, repeat
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from app.etl.rules import ExprRule, PyColumns, RuleSet, is_expression, rule_columns
+from app.etl.sketches import BloomFilter, HyperLogLog, key_hash, options as sketch_options
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+Row = list[str]
+
+
+def _column(cols: dict[str, tuple], n: int, column: str):
+    """Values of ``column`` for this chunk; a column missing from the header reads as "" like ``row.get(c, "")``."""
+    v = cols.get(column)
+    return v if v is not None else ("",) * n
+
+
+def to_columns(header: list[str], chunk: list[Row], columns: list[str]) -> dict[str, tuple]:
+    """Transpose a chunk into the requested columns with csv.DictReader semantics.
+
+    A short row reads as None (DictReader's restval) and duplicate header names
+    resolve to the last occurrence, exactly like ``dict(zip(fieldnames, row))``.
+    """
+    idx = {c: len(header) - 1 - header[::-1].index(c) for c in columns if c in header}
+    if not idx:
+        return {}
+    width = len(header)
+    if any(len(r) < width for r in chunk):
+        chunk = [r if len(r) >= width else r + [None] * (width - len(r)) for r in chunk]
+    transposed = list(zip(*chunk))
+    return {c: transposed[i] for c, i in idx.items()}
+
+
+def existing_csv(path: str | Path) -> Path:
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"CSV not found: {p}")
+    return p
+
+
+def read_header(path: str | Path) -> tuple[list[str], int]:
+    """Parse the header record and return it with the byte offset where the data rows start."""
+    raw = b""
+    with open(path, "rb") as f:
+        for line in f:
+            raw += line
+            if raw.count(b'"') % 2 == 0:  # a quoted newline inside the header keeps the record open
+                break
+    header = next(csv.reader(io.StringIO(raw.decode("utf-8"), newline="")), None) or []
+    return header, len(raw)
+
+
+def range_lines(path: str | Path, start: int, end: int) -> Iterator[str]:
+    """Decoded lines of the records that start in ``[start, end)``; ``start`` must be a record boundary."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        pos = start
+        for line in f:
+            if pos >= end:
+                return
+            pos += len(line)
+            yield line.decode("utf-8")
+
+
+def csv_rows(path: Path, byte_range: tuple[int, int] | None = None) -> Iterator[Row]:
+    """Data rows of the whole file (header skipped) or of one record-aligned byte range."""
+    if byte_range is not None:
+        yield from csv.reader(range_lines(path, *byte_range))
+        return
+    with path.open("r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+class RowCount:
+    def __init__(self):
+        self.rows = 0
+
+    def update(self, chunk: list[Row]):
+        self.rows += len(chunk)
+
+    def merge(self, other: "RowCount"):
+        self.rows += other.rows
+
+
+class BlankCount:
+    """Counts blank cells over ``columns``; backs both the null and the PK-not-null checks."""
+
+    def __init__(self, columns: list[str]):
+        self.columns = list(columns)
+        self.count = 0
+
+    def update(self, n: int, cols: dict):
+        for c in self.columns:
+            self.count += sum(1 for v in _column(cols, n, c) if v is not None and not v.strip())
+
+    def merge(self, other: "BlankCount"):
+        self.count += other.count
+
+
+class DuplicateKeys:
+    def __init__(self, key_columns: list[str]):
+        self.key_columns = list(key_columns)
+        self.seen: set = set()
+        self.dups: set = set()
+
+    def update(self, n: int, cols: dict):
+        seen, dups = self.seen, self.dups
+        for k in zip(*(_column(cols, n, c) for c in self.key_columns)) if self.key_columns else [()] * n:
+            if k in seen:
+                dups.add(k)
+            else:
+                seen.add(k)
+
+    def merge(self, other: "DuplicateKeys"):
+        self.dups |= other.dups
+        self.dups |= self.seen & other.seen
+        self.seen |= other.seen
+
+    @property
+    def duplicate_keys(self) -> int:
+        return len(self.dups)
+
+
+def _values(v, n: int, missing) -> list:
+    if v is None:
+        return [""] * n  # column absent from the header reads as ""
+    v = v.to_pylist() if hasattr(v, "to_pylist") else v.tolist() if hasattr(v, "tolist") else list(v)
+    return [None if x == missing else x for x in v] if missing is not None else v
+
+
+class SketchDuplicateKeys:
+    """Duplicate keys via a Bloom filter: only filter hits are kept, then counted exactly by ``verify_file``.
+
+    A HyperLogLog over the same key hashes gives ``distinct_keys``. ``missing`` is
+    the columnar reader's short-row sentinel, so its keys hash like csv's None.
+    """
+
+    def __init__(self, key_columns: list[str], false_positive_rate: float, expected_keys: int, distinct_error: float, missing=None):
+        self.key_columns = list(key_columns)
+        self.missing = missing
+        self.bloom = BloomFilter(expected_keys, false_positive_rate)
+        self.cross: BloomFilter | None = None  # keys possibly present in more than one merged range
+        self.hll = HyperLogLog(distinct_error)
+        self.candidates: set = set()
+        self._dups: int | None = None
+
+    def _keys(self, n: int, cols: dict):
+        if not self.key_columns:
+            return repeat((), n)
+        return zip(*(_values(cols.get(c), n, self.missing) for c in self.key_columns))
+
+    def update(self, n: int, cols: dict):
+        # Hot loop: BloomFilter.add and HyperLogLog.add inlined.
+        bits, size, hashes = self.bloom.bits, self.bloom.size, range(self.bloom.hashes)
+        registers, shift = self.hll.registers, 64 - self.hll.p
+        low = (1 << shift) - 1
+        candidates = self.candidates
+        for k in self._keys(n, cols):
+            d = int.from_bytes(blake2b(repr(k).encode(), digest_size=16).digest(), "big")
+            h1, h2 = d >> 64, (d & 0xFFFFFFFFFFFFFFFF) | 1
+            idx, rank = h1 >> shift, shift - (h1 & low).bit_length() + 1
+            if rank > registers[idx]:
+                registers[idx] = rank
+            seen = True
+            for i in hashes:
+                pos = (h1 + i * h2) % size
+                byte, mask = pos >> 3, 1 << (pos & 7)
+                if not bits[byte] & mask:
+                    seen = False
+                    bits[byte] |= mask
+            if seen:
+                candidates.add(k)
+        self._dups = None
+
+    def merge(self, other: "SketchDuplicateKeys"):
+        # A key in both ranges has all its bits set in both filters, so the AND is a superset of the overlap.
+        overlap = self.bloom.combine(other.bloom, int.__and__)
+        for extra in (self.cross, other.cross):
+            if extra is not None:
+                overlap = overlap.combine(extra, int.__or__)
+        self.cross = overlap
+        self.bloom = self.bloom.combine(other.bloom, int.__or__)
+        self.hll.merge(other.hll)
+        self.candidates |= other.candidates
+        self._dups = None
+
+    @property
+    def needs_verify(self) -> bool:
+        return self._dups is None and (bool(self.candidates) or (self.cross is not None and not self.cross.empty()))
+
+    def _cross(self) -> BloomFilter | None:
+        return None if self.cross is None or self.cross.empty() else self.cross
+
+    def verify_file(self, path: str | Path, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        """Second pass over the key columns: count the candidate keys exactly."""
+        cross, candidates = self._cross(), self.candidates
+        counts: dict[tuple, int] = {}
+        for n, cols in column_chunks(path, self.key_columns, chunk_rows):
+            for k in self._keys(n, cols):
+                if k in candidates or (cross is not None and key_hash(k) in cross):
+                    counts[k] = counts.get(k, 0) + 1
+        self._dups = sum(1 for c in counts.values() if c > 1)
+
+    @property
+    def duplicate_keys(self) -> int:
+        if self._dups is None:
+            if self.needs_verify:
+                raise RuntimeError("verify_file() must run before duplicate_keys is read")
+            self._dups = 0
+        return self._dups
+
+    @property
+    def distinct_keys(self) -> int:
+        return self.hll.count()
+
+
+class MaxTimestamp:
+    def __init__(self, column: str):
+        self.column = column
+        self.latest: datetime | None = None
+
+    def update(self, n: int, cols: dict):
+        latest = self.latest
+        for v in _column(cols, n, self.column):
+            if v:
+                ts = datetime.fromisoformat(v.replace("Z", "+00:00"))
+                if latest is None or ts > latest:
+                    latest = ts
+        self.latest = latest
+
+    def merge(self, other: "MaxTimestamp"):
+        if other.latest is not None and (self.latest is None or other.latest > self.latest):
+            self.latest = other.latest
+
+
+_OPS: dict[str, Callable[[float, float], bool]] = {
+    "gte": lambda a, b: a >= b,
+    "lte": lambda a, b: a <= b,
+    "gt": lambda a, b: a > b,
+    "lt": lambda a, b: a < b,
+    "eq": lambda a, b: a == b,
+}
+
+
+def _safe_float(v: Any) -> float | None:
+    try:
+        return float(v)
+    except Exception:
+        return None
+
+
+class RuleViolations:
+    def __init__(self, rule: dict[str, Any]):
+        self.column = str(rule.get("column", ""))
+        self.op = str(rule.get("op", "gte"))
+        self.value = rule.get("value", 0)
+        self.name = str(rule.get("name", f"rule_{self.column}_{self.op}_{self.value}"))
+        self.threshold = _safe_float(self.value)  # parsed once, not per row
+        self.violations = 0
+
+    def update(self, n: int, cols: dict):
+        if self.threshold is None:
+            self.violations += n
+            return
+        cmp = _OPS.get(self.op)
+        t = self.threshold
+        bad = 0
+        for sample in map(_safe_float, _column(cols, n, self.column)):
+            if sample is None or (cmp is not None and not cmp(sample, t)):
+                bad += 1
+        self.violations += bad
+
+    def merge(self, other: "RuleViolations"):
+        self.violations += other.violations
+
+
+def needed_columns(profile: dict[str, Any]) -> list[str]:
+    cols = list(profile.get("required_columns", [])) + list(profile.get("key_columns", []))
+    ts_col = (profile.get("freshness") or {}).get("timestamp_column")
+    if ts_col:
+        cols.append(ts_col)
+    for r in profile.get("business_rules", []):
+        cols += rule_columns(r)
+    return list(dict.fromkeys(cols))
+
+
+class SideAggregates:
+    """Every per-file aggregate a profile needs, fed chunk by chunk in a single pass."""
+
+    def __init__(self, header: list[str], profile: dict[str, Any], full: bool):
+        self.header = header
+        self.rows = RowCount()
+        self.watermark: datetime | None = None  # latest timestamp seen, tracked for incremental runs only
+        self.at_watermark: Counter[bytes] = Counter()  # fingerprints of the rows stamped exactly at ``watermark``
+        self.nulls = self.dups = self.pk = self.freshness = None
+        self.rules: list = []
+        self.aggs: list = []
+        self.needed = needed_columns(profile) if full else []
+        if full:
+            self._build(profile)
+
+    def _build(self, profile: dict[str, Any]):
+        keys = list(profile.get("key_columns", []))
+        ts_col = (profile.get("freshness") or {}).get("timestamp_column")
+        sketch = sketch_options(profile)
+        self.nulls = BlankCount(profile.get("required_columns", []))
+        self.dups = SketchDuplicateKeys(keys, **sketch) if sketch else DuplicateKeys(keys)
+        self.pk = BlankCount(keys)
+        self.freshness = MaxTimestamp(ts_col) if ts_col else None
+        self.rules = [ExprRule(r) if is_expression(r) else RuleViolations(r) for r in profile.get("business_rules", [])]
+        self.aggs = [a for a in (self.nulls, self.dups, self.pk, self.freshness) if a is not None] + self._rule_aggs(PyColumns)
+
+    def _rule_aggs(self, context) -> list:
+        """Single-column rules aggregate themselves; expression rules share one ``RuleSet`` pass."""
+        exprs = [r for r in self.rules if isinstance(r, ExprRule)]
+        return [r for r in self.rules if not isinstance(r, ExprRule)] + ([RuleSet(exprs, context)] if exprs else [])
+
+    def update(self, n: int, cols: dict):
+        self.rows.rows += n
+        for a in self.aggs:
+            a.update(n, cols)
+
+    def merge(self, other: "SideAggregates"):
+        self.rows.merge(other.rows)
+        for a, b in zip(self.aggs, other.aggs):
+            a.merge(b)
+        self.advance_watermark(other.watermark, other.at_watermark)
+
+    def advance_watermark(self, latest: datetime | None, marks: Counter[bytes]):
+        if latest is None or (self.watermark is not None and latest < self.watermark):
+            return
+        if self.watermark is None or latest > self.watermark:
+            self.watermark, self.at_watermark = latest, Counter()
+        self.at_watermark.update(marks)
+
+    @property
+    def columns(self) -> set[str]:
+        # DictReader-based schema check looked at the first row's keys: no rows, no columns.
+        return set(self.header) if self.rows.rows else set()
+
+
+def _row_fingerprint(row: Row) -> bytes:
+    return blake2b("\x1f".join(row).encode(), digest_size=16).digest()
+
+
+def _rows_after(
+    header: list[str], chunk: list[Row], column: str, after: datetime | None, seen: Counter[bytes]
+) -> tuple[list[Row], datetime | None, Counter[bytes]]:
+    """Rows stamped later than ``after`` (every row when None), the latest stamp among them
+    and the fingerprints of the rows at that stamp.
+
+    Rows stamped exactly ``after`` are kept unless they match a fingerprint in
+    ``seen`` (the rows the previous run already aggregated at that stamp); each
+    match consumes one count, so a repeated identical row is still kept.
+    """
+    if column not in header:
+        return (chunk if after is None else []), None, Counter()
+    i = len(header) - 1 - header[::-1].index(column)
+    kept, latest, at_latest = [], None, []
+    for r in chunk:
+        v = r[i] if i < len(r) else None
+        if not v:
+            if after is None:  # unstamped rows can only be counted by a full rebuild
+                kept.append(r)
+            continue
+        ts = datetime.fromisoformat(v.replace("Z", "+00:00"))
+        if after is not None and ts <= after:
+            if ts < after:
+                continue
+            fp = _row_fingerprint(r)
+            if seen[fp]:
+                seen[fp] -= 1
+                continue
+        kept.append(r)
+        if latest is None or ts > latest:
+            latest, at_latest = ts, [r]
+        elif ts == latest:
+            at_latest.append(r)
+    return kept, latest, Counter(map(_row_fingerprint, at_latest))
+
+
+def aggregate_file(
+    path: str | Path,
+    profile: dict[str, Any],
+    full: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    byte_range: tuple[int, int] | None = None,
+    header: list[str] | None = None,
+) -> SideAggregates:
+    """Aggregate a whole CSV, or only ``byte_range`` of it (``header`` then comes from the caller).
+
+    With a ``_since`` entry in ``profile`` (set by incremental runs) only rows past
+    that timestamp watermark, or at it but not among ``_since["seen"]``, are
+    aggregated; ``side.watermark`` tracks the latest stamp and ``side.at_watermark``
+    the rows carrying it.
+    """
+    p = existing_csv(path)
+    if header is None:
+        header = read_header(p)[0]
+    side = SideAggregates(header, profile, full)
+    since = profile.get("_since")
+    seen = Counter(since.get("seen") or ()) if since is not None else None
+    rows = (r for r in csv_rows(p, byte_range) if r)  # blank lines are skipped like DictReader does
+    while chunk := list(islice(rows, chunk_rows)):
+        if since is not None:
+            chunk, latest, marks = _rows_after(header, chunk, since["column"], since["after"], seen)
+            side.advance_watermark(latest, marks)
+            if not chunk:
+                continue
+        side.update(len(chunk), to_columns(header, chunk, side.needed))
+    return side
+
+
+def column_chunks(path: str | Path, columns: list[str], chunk_rows: int = DEFAULT_CHUNK_ROWS) -> Iterator[tuple[int, dict]]:
+    """``(n, cols)`` chunks of just ``columns`` over the whole file, e.g. for a verification pass."""
+    p = existing_csv(path)
+    header = read_header(p)[0]
+    rows = (r for r in csv_rows(p) if r)
+    while chunk := list(islice(rows, chunk_rows)):
+        yield len(chunk), to_columns(header, chunk, columns)
+
+
+def freshness_latency_minutes(latest: datetime) -> int:
+    return int((datetime.now(timezone.utc) - latest).total_seconds() / 60)
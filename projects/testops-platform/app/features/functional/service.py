@@ -1,67 +1,128 @@
+import contextvars
 import json
 import os
 import sys
-import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from app.core.deadline import bounded, run_bounded
 from app.core.models import Finding
+from app.features.functional.worker_pool import agentic_module, browser_pool
 from app.healing.playwright_healer import apply_selector_fallbacks
 from app.healing.engine import run_with_self_healing
 
 
+_HISTORY_LOCK = threading.Lock()
+
+
+def _subprocess_exec(workflow_path: str, notify: bool = False) -> dict:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(Path("../agentic-automation-framework-python").resolve())
+    cmd = [
+        sys.executable,
+        "../agentic-automation-framework-python/main.py",
+        "--workflow",
+        workflow_path,
+    ]
+    if notify:
+        cmd.append("--notify")
+    p = run_bounded(cmd, env=env)
+    return {
+        "ok": p.returncode == 0,
+        "returncode": p.returncode,
+        "error": (p.stderr or p.stdout)[-800:] if p.returncode != 0 else "",
+        "stdout_tail": p.stdout[-1200:],
+        "stderr_tail": p.stderr[-1200:],
+    }
+
+
+def _record_run(result: dict, notify: bool):
+    # Same side effects as the agentic CLI's run_once: run history, dashboard and optional notification.
+    try:
+        with _HISTORY_LOCK:  # run-history.json is rewritten as a whole
+            agentic_module("agentic.agent.history").record_run(result)
+        if notify:
+            agentic_module("agentic.agent.engine").notify_result(result)
+    except Exception:
+        pass  # reporting side effects never fail the workflow
+
+
+def _pool_exec(pool, timeout_s: float, notify: bool = False):
+    def _exec(workflow_path: str) -> dict:
+        wf = json.loads(Path(workflow_path).read_text())
+        try:
+            r = pool.run(wf, timeout=bounded(timeout_s))
+        except Exception as e:  # browser launch/crash or timeout counts as a failed attempt
+            r = {"ok": False, "name": wf.get("name", "workflow"), "durationMs": None, "error": f"{type(e).__name__}: {e}"}
+        _record_run(r, notify)
+        return {
+            "ok": bool(r.get("ok")),
+            "returncode": 0 if r.get("ok") else 1,
+            "error": r.get("error", ""),
+            "duration_ms": r.get("durationMs"),
+            "final_url": r.get("finalUrl", ""),
+            "steps": r.get("steps", []),
+        }
+
+    return _exec
+
+
+def _run_workflow(wf: str, execute) -> Finding:
+    wf_path = Path(wf)
+    if not wf_path.exists():
+        return Finding("functional", wf, "high", "ERROR", "Workflow file missing", {"workflow": wf})
+
+    state = {"healed": False, "attempts": 0, "last": None, "current_workflow": str(wf_path)}
+
+    def _exec_once():
+        state["attempts"] += 1
+        r = execute(state["current_workflow"])
+        state["last"] = r
+        if not r["ok"] and state["attempts"] == 1:
+            # self-heal pass: try selector fallbacks
+            healed_path = apply_selector_fallbacks(state["current_workflow"])
+            state["current_workflow"] = healed_path
+            state["healed"] = True
+            raise RuntimeError("initial run failed; applied selector healing")
+        if not r["ok"]:
+            raise RuntimeError(r["error"] or "workflow failed")
+        return r
+
+    hr = run_with_self_healing(_exec_once, max_attempts=3, backoff_ms=300)
+    r = state["last"] or {}
+    ok = hr.ok
+    details = {
+        "healed": state["healed"],
+        "attempts": hr.attempts,
+        "workflow_used": state["current_workflow"],
+        "returncode": r.get("returncode"),
+    }
+    if "steps" in r:
+        details.update({"duration_ms": r.get("duration_ms"), "steps": r["steps"], "error": "" if ok else (r.get("error") or hr.last_error)})
+    else:
+        details.update({"stdout_tail": r.get("stdout_tail", ""), "stderr_tail": r.get("stderr_tail", hr.last_error)})
+    return Finding(
+        "functional",
+        f"workflow:{wf_path.name}",
+        "high",
+        "PASS" if ok else "FAIL",
+        "Workflow execution completed" if ok else "Workflow execution failed",
+        details,
+    )
+
+
 def run_functional(cfg: dict) -> list[Finding]:
-    findings: list[Finding] = []
-    workflows = cfg.get("features", {}).get("functional", {}).get("workflows", [])
-
-    for wf in workflows:
-        wf_path = Path(wf)
-        if not wf_path.exists():
-            findings.append(Finding("functional", wf, "high", "ERROR", "Workflow file missing", {"workflow": wf}))
-            continue
-
-        env = os.environ.copy()
-        env["PYTHONPATH"] = str(Path("../agentic-automation-framework-python").resolve())
-
-        state = {"healed": False, "attempts": 0, "last": None, "current_workflow": str(wf_path)}
-
-        def _exec_once():
-            state["attempts"] += 1
-            cmd = [
-                sys.executable,
-                "../agentic-automation-framework-python/main.py",
-                "--workflow",
-                state["current_workflow"],
-            ]
-            p = subprocess.run(cmd, capture_output=True, text=True, env=env)
-            state["last"] = p
-            if p.returncode != 0 and state["attempts"] == 1:
-                # self-heal pass: try selector fallbacks
-                healed_path = apply_selector_fallbacks(state["current_workflow"])
-                state["current_workflow"] = healed_path
-                state["healed"] = True
-                raise RuntimeError("initial run failed; applied selector healing")
-            if p.returncode != 0:
-                raise RuntimeError((p.stderr or p.stdout)[-800:])
-            return p
-
-        hr = run_with_self_healing(_exec_once, max_attempts=3, backoff_ms=300)
-        p = state["last"]
-        ok = hr.ok
-        findings.append(
-            Finding(
-                "functional",
-                f"workflow:{wf_path.name}",
-                "high",
-                "PASS" if ok else "FAIL",
-                "Workflow execution completed" if ok else "Workflow execution failed",
-                {
-                    "healed": state["healed"],
-                    "attempts": hr.attempts,
-                    "workflow_used": state["current_workflow"],
-                    "returncode": getattr(p, "returncode", None),
-                    "stdout_tail": (p.stdout[-1200:] if p else ""),
-                    "stderr_tail": (p.stderr[-1200:] if p else hr.last_error),
-                },
-            )
-        )
-
-    return findings
+    fcfg = cfg.get("features", {}).get("functional", {})
+    workflows = list(fcfg.get("workflows", []))
+    if not workflows:
+        return []
+
+    notify = bool(fcfg.get("notify", False))
+    if fcfg.get("runner", "pool") == "subprocess":
+        return [_run_workflow(wf, lambda path: _subprocess_exec(path, notify)) for wf in workflows]
+
+    with browser_pool(size=int(fcfg.get("workers", 2))) as pool, ThreadPoolExecutor(max_workers=min(pool.size, len(workflows))) as ex:
+        execute = _pool_exec(pool, float(fcfg.get("timeout_s", 300)), notify)
+        # one copy of this thread's context per workflow, so the domain deadline applies on the worker threads
+        jobs = [(contextvars.copy_context(), wf) for wf in workflows]
+        return list(ex.map(lambda job: job[0].run(_run_workflow, job[1], execute), jobs))
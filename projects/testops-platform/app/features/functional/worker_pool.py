@@ -0,0 +1,211 @@
+import atexit
+import importlib
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from contextlib import contextmanager
+from pathlib import Path
+
+AGENTIC_ROOT = Path(__file__).resolve().parents[4] / "agentic-automation-framework-python"
+
+
+def agentic_module(name: str):
+    root = str(AGENTIC_ROOT)
+    if root not in sys.path:
+        sys.path.append(root)
+    return importlib.import_module(name)
+
+
+def _agentic_runner():
+    return agentic_module("agentic.playwright_runner").run_workflow_on
+
+
+class _ChromiumLauncher:
+    def __init__(self, headless: bool):
+        self.headless = headless
+        self._pw = None
+
+    def __call__(self):
+        if self._pw is None:
+            from playwright.sync_api import sync_playwright
+
+            self._pw = sync_playwright().start()
+        return self._pw.chromium.launch(headless=self.headless)
+
+    def stop(self):
+        if self._pw is not None:
+            self._pw.stop()
+            self._pw = None
+
+
+class BrowserWorkerPool:
+    """Long-lived worker threads, each keeping one warm browser for workflow runs.
+
+    Playwright's sync API is bound to the thread that started it, so every
+    worker owns its own Playwright instance and browser and only ever touches
+    them from its own thread. Each workflow still gets a fresh browser context,
+    and a browser that died is relaunched on the next job.
+
+    A run that times out cannot be interrupted from outside its thread, so a
+    replacement worker is started and one worker retires once its current job
+    ends; the pool keeps ``size`` workers available while the stuck one finishes.
+    """
+
+    def __init__(self, size: int = 2, headless: bool = True, launcher_factory=None, runner=None):
+        self.size = max(1, int(size))
+        self.headless = headless
+        self._launcher_factory = launcher_factory or (lambda: _ChromiumLauncher(headless))
+        self._runner = runner
+        self._tasks: queue.Queue = queue.Queue()
+        self._threads: list[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.launches = 0
+        self.runs = 0
+        self._surplus = 0  # workers to retire after their current job
+        self._leases = 0
+        self._retired = False
+
+    def _start(self):
+        with self._lock:
+            if self._threads:
+                return
+            if self._runner is None:
+                self._runner = _agentic_runner()
+            for _ in range(self.size):
+                self._spawn()
+
+    def _spawn(self):
+        # caller holds self._lock
+        t = threading.Thread(target=self._worker, name=f"browser-worker-{len(self._threads)}", daemon=True)
+        t.start()
+        self._threads.append(t)
+
+    def _worker(self):
+        launcher = self._launcher_factory()
+        browser = None
+        try:
+            while True:
+                item = self._tasks.get()
+                if item is None:
+                    return
+                workflow, fut = item
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    if browser is None or not browser.is_connected():
+                        browser = launcher()
+                        with self._lock:
+                            self.launches += 1
+                    result = self._runner(browser, workflow)
+                    with self._lock:
+                        self.runs += 1
+                    fut.set_result(result)
+                except BaseException as e:
+                    fut.set_exception(e)
+                with self._lock:
+                    if self._surplus:
+                        self._surplus -= 1
+                        self._threads.remove(threading.current_thread())
+                        return
+        finally:
+            if browser is not None:
+                try:
+                    browser.close()
+                except Exception:
+                    pass
+            stop = getattr(launcher, "stop", None)
+            if stop:
+                stop()
+
+    def submit(self, workflow: dict) -> Future:
+        self._start()
+        fut: Future = Future()
+        self._tasks.put((workflow, fut))
+        return fut
+
+    def run(self, workflow: dict, timeout: float | None = None) -> dict:
+        fut = self.submit(workflow)
+        try:
+            return fut.result(timeout=timeout)
+        except FuturesTimeoutError:
+            if not fut.cancel():  # already running: its worker stays busy until the browser returns
+                with self._lock:
+                    if self._threads:
+                        self._surplus += 1
+                        self._spawn()
+            raise
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": self.size, "alive": sum(t.is_alive() for t in self._threads), "launches": self.launches, "runs": self.runs}
+
+    def close(self, timeout: float = 10.0, wait: bool = True):
+        """Stop the workers once the jobs already queued are done."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._surplus = 0
+        for _ in threads:
+            self._tasks.put(None)
+        if wait:
+            for t in threads:
+                t.join(timeout)
+
+    def _lease(self):
+        with self._lock:
+            self._leases += 1
+
+    def release(self):
+        with self._lock:
+            self._leases -= 1
+            done = self._retired and self._leases == 0
+        if done:
+            self.close(wait=False)
+
+    def retire(self):
+        """Close the pool once every current lease is released."""
+        with self._lock:
+            self._retired = True
+            done = self._leases == 0
+        if done:
+            self.close(wait=False)
+
+
+_POOL: BrowserWorkerPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+@contextmanager
+def browser_pool(size: int = 2, headless: bool | None = None):
+    """Lease the shared pool for a batch of runs.
+
+    When a caller asks for a different size or mode the shared pool is
+    replaced; the old one is retired and only closed when its last lease ends,
+    so runs still using it are not cut off.
+    """
+    global _POOL
+    if headless is None:
+        headless = os.getenv("HEADLESS", "true").lower() == "true"
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.size != size or _POOL.headless != headless:
+            if _POOL is not None:
+                _POOL.retire()
+            _POOL = BrowserWorkerPool(size=size, headless=headless)
+        pool = _POOL
+        pool._lease()
+    try:
+        yield pool
+    finally:
+        pool.release()
+
+
+def shutdown_browser_pool():
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.close()
+            _POOL = None
+
+
+atexit.register(shutdown_browser_pool)
@@ -0,0 +1,221 @@
+import asyncio
+import contextvars
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.core.deadline import DeadlineExceeded, remaining
+
+
+class LatencyHistogram:
+    """HDR-style log-linear latency histogram.
+
+    Values are recorded in microseconds. Below ``sub_bucket_count`` every value
+    has its own bucket; above it each power of two is split into
+    ``sub_bucket_count / 2`` linear buckets, so the relative error stays under
+    ``10 ** -significant_digits`` and memory depends on the value range, not the
+    sample count.
+    """
+
+    def __init__(self, significant_digits: int = 2):
+        self._k = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self._sub = 1 << self._k
+        self._half = self._sub // 2
+        self.counts: Counter = Counter()
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = None
+        self.max_us = 0
+
+    def _index(self, v: int) -> int:
+        if v < self._sub:
+            return v
+        b = v.bit_length() - self._k
+        return self._sub + (b - 1) * self._half + ((v >> b) - self._half)
+
+    def _value(self, idx: int) -> int:
+        if idx < self._sub:
+            return idx
+        b = (idx - self._sub) // self._half + 1
+        lowest = ((idx - self._sub) % self._half + self._half) << b
+        return lowest + (1 << b) - 1
+
+    def record(self, value_us: int):
+        v = max(0, int(value_us))
+        self.counts[self._index(v)] += 1
+        self.total += 1
+        self.sum_us += v
+        self.min_us = v if self.min_us is None else min(self.min_us, v)
+        self.max_us = max(self.max_us, v)
+
+    def merge(self, other: "LatencyHistogram"):
+        self.counts.update(other.counts)
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+        self.max_us = max(self.max_us, other.max_us)
+
+    def percentile_us(self, q: float) -> int:
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(q / 100 * self.total))
+        seen = 0
+        for idx in sorted(self.counts):
+            seen += self.counts[idx]
+            if seen >= target:
+                return min(self._value(idx), self.max_us)
+        return self.max_us
+
+    def summary_ms(self) -> dict:
+        def ms(us):
+            return round(us / 1000, 2)
+
+        return {
+            "count": self.total,
+            "min": ms(self.min_us or 0),
+            "avg": ms(self.sum_us / self.total) if self.total else 0,
+            "p50": ms(self.percentile_us(50)),
+            "p95": ms(self.percentile_us(95)),
+            "p99": ms(self.percentile_us(99)),
+            "max": ms(self.max_us),
+        }
+
+
+@dataclass
+class LoadProfile:
+    url: str
+    method: str = "GET"
+    requests: int | None = None  # total request budget
+    concurrency: int = 1
+    rate_per_s: float | None = None  # open model (fixed arrival rate) when set, closed loop otherwise
+    duration_s: float | None = None
+    timeout_s: float = 20.0
+
+    @classmethod
+    def from_check(cls, c: dict) -> "LoadProfile":
+        duration = c.get("duration_s")
+        reqs = c.get("requests")
+        if reqs is None and duration is None:
+            reqs = 5
+        return cls(
+            url=str(c.get("url")),
+            method=str(c.get("method", "GET")).upper(),
+            requests=int(reqs) if reqs is not None else None,
+            concurrency=max(1, int(c.get("concurrency", 1))),
+            rate_per_s=float(c["rate_per_s"]) if c.get("rate_per_s") else None,
+            duration_s=float(duration) if duration is not None else None,
+            timeout_s=float(c.get("timeout_s", 20)),
+        )
+
+
+@dataclass
+class LoadResult:
+    histogram: LatencyHistogram
+    errors: int = 0
+    elapsed_s: float = 0.0
+    status_counts: Counter = field(default_factory=Counter)
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.histogram.total if self.histogram.total else 0.0
+
+    def as_dict(self) -> dict:
+        n = self.histogram.total
+        return {
+            "latency_ms": self.histogram.summary_ms(),
+            "requests": n,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "throughput_rps": round(n / self.elapsed_s, 2) if self.elapsed_s else 0,
+            "elapsed_s": round(self.elapsed_s, 3),
+            "status_counts": {str(k): v for k, v in self.status_counts.items()},
+        }
+
+
+async def _run_load(profile: LoadProfile) -> LoadResult:
+    limits = httpx.Limits(max_connections=profile.concurrency, max_keepalive_connections=profile.concurrency)
+    result = LoadResult(histogram=LatencyHistogram())
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + profile.duration_s if profile.duration_s else None
+    issued = 0
+
+    def _more() -> bool:
+        if profile.requests is not None and issued >= profile.requests:
+            return False
+        return deadline is None or loop.time() < deadline
+
+    async with httpx.AsyncClient(limits=limits, timeout=profile.timeout_s, follow_redirects=True) as client:
+
+        async def _one(intended_start: float):
+            try:
+                r = await client.request(profile.method, profile.url)
+                result.status_counts[r.status_code] += 1
+                if r.status_code >= 400:
+                    result.errors += 1
+            except Exception as e:
+                result.status_counts[type(e).__name__] += 1
+                result.errors += 1
+            # Measured from the intended start, so queueing behind a saturated pool counts (no coordinated omission).
+            result.histogram.record(int((loop.time() - intended_start) * 1_000_000))
+
+        if profile.rate_per_s:
+            sem = asyncio.Semaphore(profile.concurrency)
+            interval = 1.0 / profile.rate_per_s
+            tasks = set()
+
+            async def _bounded(intended_start: float):
+                async with sem:
+                    await _one(intended_start)
+
+            while _more():
+                intended = started + issued * interval
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                    if not _more():
+                        break
+                issued += 1
+                task = asyncio.create_task(_bounded(intended))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)  # keep only in-flight tasks
+            await asyncio.gather(*tasks)
+        else:
+
+            async def _worker():
+                nonlocal issued
+                while _more():
+                    issued += 1
+                    await _one(loop.time())
+
+            await asyncio.gather(*[_worker() for _ in range(profile.concurrency)])
+
+    result.elapsed_s = loop.time() - started
+    return result
+
+
+async def _run_load_bounded(profile: LoadProfile) -> LoadResult:
+    """``_run_load`` cancelled, in-flight requests included, when the current domain deadline passes."""
+    left = remaining()
+    if left is None:
+        return await _run_load(profile)
+    try:
+        return await asyncio.wait_for(_run_load(profile), left)
+    except asyncio.TimeoutError:
+        raise DeadlineExceeded("load run stopped at the domain deadline") from None
+
+
+def run_load(profile: LoadProfile) -> LoadResult:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_run_load_bounded(profile))
+    # called from async code (API handler, job): asyncio.run cannot nest, so use a private loop in a worker thread
+    ctx = contextvars.copy_context()  # carries the domain deadline over
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="load") as ex:
+        return ex.submit(ctx.run, lambda: asyncio.run(_run_load_bounded(profile))).result()
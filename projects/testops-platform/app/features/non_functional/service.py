@@ -1,6 +1,8 @@
 import time
 import requests
+from app.core.deadline import DeadlineExceeded, bounded, check
 from app.core.models import Finding
+from app.features.non_functional.load import LoadProfile, run_load
 
 
 def run_non_functional(cfg: dict) -> list[Finding]:
@@ -8,13 +10,14 @@ def run_non_functional(cfg: dict) -> list[Finding]:
     checks = cfg.get("features", {}).get("non_functional", {}).get("checks", [])
 
     for c in checks:
+        check()  # a timed-out domain is abandoned by the orchestrator, so stop issuing requests
         ctype = c.get("type")
         cid = c.get("id", ctype)
         url = c.get("url")
         if ctype == "http_sla":
             start = time.time()
             try:
-                r = requests.get(url, timeout=20)
+                r = requests.get(url, timeout=bounded(20))
                 elapsed = int((time.time() - start) * 1000)
                 max_ms = int(c.get("max_ms", 1000))
                 ok = r.ok and elapsed <= max_ms
@@ -23,22 +26,29 @@ def run_non_functional(cfg: dict) -> list[Finding]:
                 findings.append(Finding("non_functional", cid, "medium", "ERROR", f"HTTP SLA check error: {e}"))
 
         elif ctype == "light_load":
-            reqs = int(c.get("requests", 5))
             max_avg = int(c.get("max_avg_ms", 1500))
-            times = []
-            failures = 0
-            for _ in range(reqs):
-                t0 = time.time()
-                try:
-                    r = requests.get(url, timeout=20)
-                    if not r.ok:
-                        failures += 1
-                except Exception:
-                    failures += 1
-                times.append(int((time.time() - t0) * 1000))
-            avg = int(sum(times) / max(len(times), 1))
-            ok = failures == 0 and avg <= max_avg
-            findings.append(Finding("non_functional", cid, "medium", "PASS" if ok else "FAIL", "Light load check completed", {"avg_ms": avg, "max_avg_ms": max_avg, "failures": failures, "samples": times}))
+            try:
+                result = run_load(LoadProfile.from_check(c))
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                findings.append(Finding("non_functional", cid, "medium", "ERROR", f"Light load check error: {e}"))
+                continue
+            details = result.as_dict()
+            lat = details["latency_ms"]
+            breaches = []
+            if lat["avg"] > max_avg:
+                breaches.append(f"avg {lat['avg']}ms > {max_avg}ms")
+            for q in ("p95", "p99"):
+                limit = c.get(f"max_{q}_ms")
+                if limit is not None and lat[q] > float(limit):
+                    breaches.append(f"{q} {lat[q]}ms > {limit}ms")
+            max_error_rate = float(c.get("max_error_rate", 0))
+            if result.error_rate > max_error_rate:
+                breaches.append(f"error_rate {details['error_rate']} > {max_error_rate}")
+            ok = not breaches
+            details.update({"avg_ms": lat["avg"], "max_avg_ms": max_avg, "failures": result.errors, "breaches": breaches})
+            findings.append(Finding("non_functional", cid, "medium", "PASS" if ok else "FAIL", "Light load check completed" if ok else f"Light load check breached: {'; '.join(breaches)}", details))
         else:
             findings.append(Finding("non_functional", cid, "low", "INFO", f"Unsupported non-functional check type: {ctype}"))
 
@@ -1,6 +1,6 @@
 import json
-import subprocess
 from pathlib import Path
+from app.core.deadline import run_bounded
 from app.core.models import Finding
 
 
@@ -14,7 +14,7 @@ def run_security(cfg: dict) -> list[Finding]:
         return [Finding("security", "secq", "critical", "ERROR", "Security framework path missing", {"path": str(project_path)})]
 
     cmd = ["./scripts/secq"] if mode == "core" else ["./scripts/secq", "--full", "--target", "https://example.com"]
-    p = subprocess.run(cmd, cwd=project_path, capture_output=True, text=True)
+    p = run_bounded(cmd, cwd=project_path)
 
     summary_path = project_path / "reports" / "security_bundle_summary.json"
     total = None
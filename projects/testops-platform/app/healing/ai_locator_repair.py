@@ -2,7 +2,7 @@ import json
 import os
 from typing import Optional
 
-import requests
+from app.core.http_client import http
 
 
 def _fallback(selector: str) -> str:
@@ -32,7 +32,7 @@ def suggest_selector(selector: str, step: dict, dom_excerpt: str = "") -> str:
     }
 
     try:
-        r = requests.post(
+        r = http.post(
             f"{base}/chat/completions",
             headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
             json={
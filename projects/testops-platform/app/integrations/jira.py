@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 
 def create_jira_issue(summary: str, description: str, issue_type: str = "Task"):
@@ -19,7 +19,7 @@ def create_jira_issue(summary: str, description: str, issue_type: str = "Task"):
             "issuetype": {"name": issue_type},
         }
     }
-    r = requests.post(f"{base}/rest/api/3/issue", json=payload, auth=(user, token), timeout=30)
+    r = http.post(f"{base}/rest/api/3/issue", json=payload, auth=(user, token), timeout=30)
     if not r.ok:
         return {"ok": False, "error": r.text}
     return {"ok": True, "issue": r.json()}
@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 
 def create_test_run(name: str, case_ids: list[int] | None = None):
@@ -21,7 +21,7 @@ def create_test_run(name: str, case_ids: list[int] | None = None):
     if case_ids:
         payload["case_ids"] = case_ids
 
-    r = requests.post(f"{base}/index.php?/api/v2/add_run/{project_id}", json=payload, auth=(user, key), timeout=30)
+    r = http.post(f"{base}/index.php?/api/v2/add_run/{project_id}", json=payload, auth=(user, key), timeout=30)
     if not r.ok:
         return {"ok": False, "error": r.text}
     return {"ok": True, "run": r.json()}
@@ -0,0 +1,12 @@
+from .manager import TERMINAL, Job, JobManager, JobNotCancellable, JobQueueFull, cancellation_requested, jobs, run_subprocess
+
+__all__ = [
+    "TERMINAL",
+    "Job",
+    "JobManager",
+    "JobNotCancellable",
+    "JobQueueFull",
+    "cancellation_requested",
+    "jobs",
+    "run_subprocess",
+]
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, UTC
+from typing import Any, Callable
+
+TERMINAL = {"SUCCEEDED", "FAILED", "CANCELLED"}
+
+_current = threading.local()
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class JobNotCancellable(RuntimeError):
+    pass
+
+
+def cancellation_requested() -> bool:
+    """True when the job running on this thread has been asked to stop.
+
+    Long loops call this between steps to stop early; outside a job it is always False.
+    A job that saw True here ends as CANCELLED, one that never checked ends normally.
+    """
+    job = getattr(_current, "job", None)
+    if job and job.cancel_event.is_set():
+        job.cancel_observed = True
+        return True
+    return False
+
+
+def run_subprocess(cmd: list[str], poll_s: float = 0.2, **kwargs) -> subprocess.CompletedProcess:
+    """``subprocess.run(cmd, capture_output=True, text=True)`` that kills the child when the job is cancelled."""
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, **kwargs) as p:
+        out = {}
+        reader = threading.Thread(target=lambda: out.update(zip(("stdout", "stderr"), p.communicate())), daemon=True)
+        reader.start()
+        while reader.is_alive():
+            reader.join(poll_s)
+            if reader.is_alive() and cancellation_requested():
+                p.kill()
+                reader.join()
+        return subprocess.CompletedProcess(cmd, p.returncode, out.get("stdout", ""), out.get("stderr", ""))
+
+
+def _now() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    params: dict
+    status: str = "QUEUED"  # QUEUED|RUNNING|SUCCEEDED|FAILED|CANCELLED
+    created_at: str = field(default_factory=_now)
+    started_at: str | None = None
+    finished_at: str | None = None
+    result: Any = None
+    error: str | None = None
+    version: int = 0
+    cancellable: bool = True  # False: the work never checks cancellation_requested(), so only a queued job can be cancelled
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    cancel_observed: bool = field(default=False, repr=False)
+    future: Future | None = field(default=None, repr=False)
+
+    def as_dict(self, include_result: bool = True) -> dict:
+        out = {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "cancellable": self.cancellable,
+            "cancel_requested": self.cancel_event.is_set(),
+            "error": self.error,
+        }
+        if include_result:
+            out["result"] = self.result
+        return out
+
+
+class JobManager:
+    """Runs long API operations on a bounded thread pool and tracks their state.
+
+    Jobs are kept in memory (most recent ``max_jobs``). Status changes bump a
+    version number and notify a condition (threads) and per-job asyncio events
+    (SSE streams), so watchers wait for the next change instead of sleeping in
+    a loop. Cancelling a running job only asks it to stop: it ends as CANCELLED
+    if the work checked ``cancellation_requested()``, otherwise it runs to
+    completion and keeps its result, with ``cancel_requested`` set. Jobs
+    submitted with ``cancellable=False`` can only be cancelled while queued.
+    """
+
+    def __init__(self, max_workers: int = 4, max_pending: int = 100, max_jobs: int = 500):
+        self.max_pending = max_pending
+        self.max_jobs = max_jobs
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="testops-job")
+        self._cond = threading.Condition()
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._async_waiters: dict[str, set] = {}
+
+    def _touch(self, job: Job, **changes):
+        with self._cond:
+            for k, v in changes.items():
+                setattr(job, k, v)
+            job.version += 1
+            self._cond.notify_all()
+            waiters = list(self._async_waiters.get(job.id, ()))
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                pass  # loop already closed
+
+    def _run(self, job: Job, fn: Callable[[], Any]):
+        if job.cancel_event.is_set():
+            self._touch(job, status="CANCELLED", finished_at=_now())
+            return
+        self._touch(job, status="RUNNING", started_at=_now())
+        _current.job = job
+        try:
+            result = fn()
+        except Exception as e:
+            self._touch(job, status="FAILED", error=str(e), finished_at=_now())
+            return
+        finally:
+            _current.job = None
+        status = "CANCELLED" if job.cancel_observed else "SUCCEEDED"
+        self._touch(job, status=status, result=result, finished_at=_now())
+
+    def submit(self, kind: str, fn: Callable[[], Any], params: dict | None = None, cancellable: bool = True) -> Job:
+        with self._cond:
+            pending = sum(1 for j in self._jobs.values() if j.status not in TERMINAL)
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"job queue full ({pending} pending)")
+            job = Job(id=f"job-{uuid.uuid4().hex[:12]}", kind=kind, params=params or {}, cancellable=cancellable)
+            self._jobs[job.id] = job
+            excess = len(self._jobs) - self.max_jobs
+            if excess > 0:
+                # Oldest finished jobs go first; queued and running ones are never dropped.
+                for old in [j.id for j in self._jobs.values() if j.status in TERMINAL][:excess]:
+                    del self._jobs[old]
+        job.future = self._pool.submit(self._run, job, fn)
+        return job
+
+    def get(self, job_id: str) -> Job | None:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def list(self, limit: int = 50) -> list[dict]:
+        with self._cond:
+            jobs = list(self._jobs.values())[-limit:]
+        return [j.as_dict(include_result=False) for j in reversed(jobs)]
+
+    def cancel(self, job_id: str) -> Job | None:
+        """Ask a job to stop; raises ``JobNotCancellable`` for a non-cancellable job that already started."""
+        job = self.get(job_id)
+        if not job or job.status in TERMINAL:
+            return job
+        if job.future and job.future.cancel():
+            job.cancel_event.set()
+            self._touch(job, status="CANCELLED", finished_at=_now())
+        elif not job.cancellable:
+            raise JobNotCancellable(f"{job.kind} jobs cannot be stopped once running")
+        else:
+            job.cancel_event.set()
+            self._touch(job)
+        return job
+
+    def wait_for_change(self, job: Job, seen_version: int, timeout: float = 15.0) -> int:
+        with self._cond:
+            self._cond.wait_for(lambda: job.version != seen_version, timeout=timeout)
+            return job.version
+
+    async def next_change(self, job: Job, seen_version: int, timeout: float = 15.0) -> int:
+        """Async ``wait_for_change``: waits on the event loop, holding no thread."""
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self._cond:
+            if job.version != seen_version:
+                return job.version
+            self._async_waiters.setdefault(job.id, set()).add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                ws = self._async_waiters.get(job.id)
+                if ws is not None:
+                    ws.discard(waiter)
+                    if not ws:
+                        del self._async_waiters[job.id]
+        return job.version
+
+    def wait(self, job: Job, timeout: float | None = None) -> Job:
+        with self._cond:
+            self._cond.wait_for(lambda: job.status in TERMINAL, timeout=timeout)
+        return job
+
+
+jobs = JobManager(
+    max_workers=int(os.getenv("TESTOPS_JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("TESTOPS_JOB_MAX_PENDING", "100")),
+)
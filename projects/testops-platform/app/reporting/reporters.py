@@ -1,40 +1,133 @@
+import gzip
 import json
-from dataclasses import asdict
+import os
+import shutil
+import tempfile
+import textwrap
+from collections import Counter
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from jinja2 import Template
 
-
-def write_reports(findings, out_dir="reports"):
-    p = Path(out_dir)
-    p.mkdir(parents=True, exist_ok=True)
-
-    items = [asdict(f) for f in findings]
-    (p / "summary.json").write_text(json.dumps(items, indent=2), encoding="utf-8")
-
-    total = len(items)
-    fail = len([x for x in items if x["status"] == "FAIL"])
-    err = len([x for x in items if x["status"] == "ERROR"])
-    passed = len([x for x in items if x["status"] == "PASS"])
-
-    html_tpl = Template("""
+_HTML_HEAD = Template("""
     <html><head><title>TestOps Platform Report</title>
     <style>body{font-family:Arial;margin:24px;background:#f8fafc}.card{background:white;border:1px solid #e2e8f0;border-radius:10px;padding:12px;margin-bottom:10px}code{background:#eef2ff;padding:2px 6px;border-radius:4px}pre{background:#0b1020;color:#dbeafe;padding:10px;border-radius:8px;overflow:auto}</style>
     </head><body>
     <h1>TestOps Platform - Unified Report</h1>
     <div class='card'><b>Total:</b> {{total}} | <b>Pass:</b> {{passed}} | <b>Fail:</b> {{fail}} | <b>Error:</b> {{err}}</div>
-    {% for f in items %}
+    """)
+_HTML_CARD = Template("""
       <div class='card'>
         <b>{{f.domain}}</b> / <code>{{f.check_id}}</code> / <b>{{f.status}}</b> / severity={{f.severity}}
         <p>{{f.summary}}</p>
         <pre>{{f.details}}</pre>
       </div>
-    {% endfor %}
-    </body></html>
     """)
-    (p / "summary.html").write_text(html_tpl.render(items=items, total=total, passed=passed, fail=fail, err=err), encoding="utf-8")
+_HTML_TAIL = """
+    </body></html>
+    """
+
+
+class StreamingReportWriter:
+    """Writes summary.json / summary.html (and optionally NDJSON) one finding at a time.
+
+    Counts are kept as running counters. HTML cards are spooled to a temp file
+    so the counts header can still lead the page. Files are written under a
+    temporary name and swapped in on close, so readers never see a partial report;
+    used as a context manager, a writer left unclosed by an error is aborted and
+    its temporary files removed.
+    """
+
+    def __init__(self, out_dir="reports", ndjson: bool = False, gzip_output: bool = False):
+        self.out = Path(out_dir)
+        self.out.mkdir(parents=True, exist_ok=True)
+        self.counts = {"total": 0, "pass": 0, "fail": 0, "error": 0}
+        self.by_domain: dict[str, Counter] = {}  # domain -> status counts, for stages that only need a summary
+        self._closed = False
+        self._json_path = self.out / "summary.json"
+        self._html_path = self.out / "summary.html"
+        self._json = open(self._tmp(self._json_path), "w", encoding="utf-8")
+        self._json.write("[")
+        self._cards = tempfile.TemporaryFile("w+", encoding="utf-8", dir=self.out)
+        self._ndjson_path = None
+        self._ndjson = None
+        if ndjson or gzip_output:
+            self._ndjson_path = self.out / ("summary.ndjson.gz" if gzip_output else "summary.ndjson")
+            tmp = self._tmp(self._ndjson_path)
+            self._ndjson = gzip.open(tmp, "wt", encoding="utf-8") if gzip_output else open(tmp, "w", encoding="utf-8")
+
+    @staticmethod
+    def _tmp(path: Path) -> Path:
+        return path.with_name(path.name + ".tmp")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if not self._closed:
+            self.abort()
+        return False
+
+    def add(self, finding):
+        item = asdict(finding) if is_dataclass(finding) else dict(finding)
+        # Same layout json.dumps(items, indent=2) produces for the whole list.
+        self._json.write(("," if self.counts["total"] else "") + "\n" + textwrap.indent(json.dumps(item, indent=2), "  "))
+        if self._ndjson:
+            self._ndjson.write(json.dumps(item) + "\n")
+        self._cards.write(_HTML_CARD.render(f=item))
+
+        self.by_domain.setdefault(item.get("domain"), Counter())[item.get("status")] += 1
+        self.counts["total"] += 1
+        key = {"PASS": "pass", "FAIL": "fail", "ERROR": "error"}.get(item.get("status"))
+        if key:
+            self.counts[key] += 1
+
+    def extend(self, findings):
+        for f in findings:
+            self.add(f)
+
+    def close(self) -> dict:
+        self._json.write("\n]" if self.counts["total"] else "]")
+        self._json.close()
+        os.replace(self._tmp(self._json_path), self._json_path)
+
+        c = self.counts
+        with open(self._tmp(self._html_path), "w", encoding="utf-8") as html:
+            html.write(_HTML_HEAD.render(total=c["total"], passed=c["pass"], fail=c["fail"], err=c["error"]))
+            self._cards.seek(0)
+            shutil.copyfileobj(self._cards, html)
+            html.write(_HTML_TAIL)
+        self._cards.close()
+        os.replace(self._tmp(self._html_path), self._html_path)
+
+        out = {"json": str(self._json_path), "html": str(self._html_path), "counts": dict(c)}
+        if self._ndjson:
+            self._ndjson.close()
+            os.replace(self._tmp(self._ndjson_path), self._ndjson_path)
+            out["ndjson"] = str(self._ndjson_path)
+        self._closed = True
+        return out
+
+    def abort(self):
+        """Drop the report: close every handle and remove the temporary files; published reports stay as they were."""
+        for f in (self._json, self._cards, self._ndjson):
+            if f is not None:
+                f.close()
+        for path in (self._json_path, self._html_path, self._ndjson_path):
+            if path is not None:
+                self._tmp(path).unlink(missing_ok=True)
+        self._closed = True
+
+
+def open_report_writer(reporting: dict) -> StreamingReportWriter:
+    return StreamingReportWriter(
+        reporting.get("out_dir", "reports"),
+        ndjson=bool(reporting.get("ndjson", False)),
+        gzip_output=bool(reporting.get("gzip", False)),
+    )
+
 
-    return {
-        "json": str(p / "summary.json"),
-        "html": str(p / "summary.html"),
-        "counts": {"total": total, "pass": passed, "fail": fail, "error": err},
-    }
+def write_reports(findings, out_dir="reports", ndjson: bool = False, gzip_output: bool = False):
+    writer = StreamingReportWriter(out_dir, ndjson=ndjson, gzip_output=gzip_output)
+    writer.extend(findings)
+    return writer.close()
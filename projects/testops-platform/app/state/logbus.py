@@ -1,24 +1,122 @@
+import asyncio
+import json
+import threading
 from collections import deque
 from datetime import datetime, UTC
-import json
+
+
+class Subscription:
+    """One live viewer of the bus: a bounded asyncio queue owned by the subscriber's event loop.
+
+    ``levels`` / ``msg`` filters are applied on the publishing side, so a viewer only
+    pays for the events it asked for. When a slow viewer's queue is full the oldest
+    queued event is dropped and counted in ``dropped``; the client can reconnect with
+    ``since=<last seq>`` to fill the gap from the replay buffer.
+    """
+
+    def __init__(self, bus: "LogBus", loop: asyncio.AbstractEventLoop, levels=None, msg: str | None = None, maxsize: int = 1000):
+        self.bus = bus
+        self.loop = loop
+        self.levels = {x.lower() for x in levels} if levels else None
+        self.msg = msg or None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.closed = False
+
+    def matches(self, event: dict) -> bool:
+        if self.levels and event["level"].lower() not in self.levels:
+            return False
+        return not self.msg or self.msg in event["msg"]
+
+    def _put(self, event: dict):
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: dict) -> bool:
+        try:
+            self.loop.call_soon_threadsafe(self._put, event)
+            return True
+        except RuntimeError:  # subscriber's loop is gone
+            return False
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+    def drain(self, limit: int = 100) -> list[dict]:
+        out = []
+        while len(out) < limit and not self.queue.empty():
+            out.append(self.queue.get_nowait())
+        return out
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 class LogBus:
-    def __init__(self):
-        self.buffer = deque(maxlen=500)
+    def __init__(self, maxlen: int = 500):
+        self.buffer = deque(maxlen=maxlen)
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._subscribers: set[Subscription] = set()
 
     def push(self, level: str, msg: str, data: dict | None = None):
-        event = {
-            "ts": datetime.now(UTC).isoformat(),
-            "level": level,
-            "msg": msg,
-            "data": data or {},
-        }
-        self.buffer.append(event)
+        with self._lock:
+            self.seq += 1
+            event = {
+                "seq": self.seq,
+                "ts": datetime.now(UTC).isoformat(),
+                "level": level,
+                "msg": msg,
+                "data": data or {},
+            }
+            self.buffer.append(event)
+            subscribers = [s for s in self._subscribers if s.matches(event)]
+        gone = [s for s in subscribers if not s.deliver(event)]
+        for s in gone:
+            self.unsubscribe(s)
         return event
 
+    def subscribe(self, since: int | None = None, levels=None, msg: str | None = None, backlog: int = 50, maxsize: int = 1000):
+        """Register a subscriber on the running loop and return ``(subscription, replay)``.
+
+        ``replay`` holds buffered events with ``seq > since`` (or the last ``backlog``
+        matching events when ``since`` is None). Replay and registration happen under
+        one lock, so nothing published in between is lost or duplicated.
+        """
+        sub = Subscription(self, asyncio.get_running_loop(), levels=levels, msg=msg, maxsize=maxsize)
+        with self._lock:
+            if since is None:
+                replay = [e for e in self.buffer if sub.matches(e)][-backlog:] if backlog else []
+            else:
+                replay = [e for e in self.buffer if e["seq"] > since and sub.matches(e)]
+            self._subscribers.add(sub)
+        return sub, replay
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            self._subscribers.discard(sub)
+        sub.closed = True
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def oldest_seq(self) -> int:
+        with self._lock:
+            return self.buffer[0]["seq"] if self.buffer else self.seq + 1
+
     def tail(self, n: int = 100):
-        return list(self.buffer)[-n:]
+        with self._lock:
+            return list(self.buffer)[-n:]
 
     def tail_jsonl(self, n: int = 100):
         return "\n".join(json.dumps(x) for x in self.tail(n))
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Any, Callable
+
+STATE_DB_PATH = "reports/testops-state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    id TEXT,
+    ts TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_records_collection_id ON records(collection, id);
+CREATE INDEX IF NOT EXISTS ix_records_collection_seq ON records(collection, seq);
+CREATE TABLE IF NOT EXISTS sequences (
+    collection TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+class RunStateStore:
+    """Embedded SQLite (WAL) store for run state, one row per record.
+
+    Records live in named collections. Appends and keyed updates touch a single
+    row, and "latest N" reads walk the (collection, seq) index, so no call
+    rewrites the whole collection. Read-modify-write goes through
+    ``BEGIN IMMEDIATE`` so concurrent API requests cannot lose updates.
+    """
+
+    def __init__(self, path: str | Path = STATE_DB_PATH):
+        self.path = Path(path)
+        self._local = threading.local()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def next_id(self, collection: str, prefix: str) -> str:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sequences(collection, value) VALUES (?, 1) "
+                "ON CONFLICT(collection) DO UPDATE SET value = value + 1",
+                (collection,),
+            )
+            value = conn.execute("SELECT value FROM sequences WHERE collection = ?", (collection,)).fetchone()[0]
+        return f"{prefix}-{value}"
+
+    def append(self, collection: str, data: dict, id: str | None = None, keep: int | None = None) -> dict:
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT INTO records(collection, id, ts, data) VALUES (?, ?, ?, ?)",
+                (collection, id, datetime.now(UTC).isoformat(), json.dumps(data)),
+            )
+            if keep:
+                self._prune(conn, collection, keep)
+        return data
+
+    def get(self, collection: str, id: str) -> dict | None:
+        row = self._conn().execute("SELECT data FROM records WHERE collection = ? AND id = ?", (collection, id)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def update(self, collection: str, id: str, fn: Callable[[dict], dict], default: dict | None = None) -> dict | None:
+        """Apply ``fn`` to one record atomically; inserts from ``default`` when given and missing."""
+        with self.transaction() as conn:
+            row = conn.execute("SELECT seq, data FROM records WHERE collection = ? AND id = ?", (collection, id)).fetchone()
+            if row is None and default is None:
+                return None
+            data = fn(json.loads(row[1]) if row else dict(default))
+            now = datetime.now(UTC).isoformat()
+            if row:
+                conn.execute("UPDATE records SET data = ?, ts = ? WHERE seq = ?", (json.dumps(data), now, row[0]))
+            else:
+                conn.execute(
+                    "INSERT INTO records(collection, id, ts, data) VALUES (?, ?, ?, ?)",
+                    (collection, id, now, json.dumps(data)),
+                )
+        return data
+
+    def latest(self, collection: str, limit: int = 20) -> list[dict]:
+        """Newest first."""
+        rows = self._conn().execute(
+            "SELECT data FROM records WHERE collection = ? ORDER BY seq DESC LIMIT ?", (collection, int(limit))
+        ).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def items(self, collection: str) -> list[dict]:
+        """Oldest first."""
+        rows = self._conn().execute("SELECT data FROM records WHERE collection = ? ORDER BY seq", (collection,)).fetchall()
+        return [json.loads(r[0]) for r in rows]
+
+    def keyed_items(self, collection: str) -> list[tuple[str, dict]]:
+        rows = self._conn().execute("SELECT id, data FROM records WHERE collection = ? ORDER BY seq", (collection,)).fetchall()
+        return [(r[0], json.loads(r[1])) for r in rows]
+
+    def count(self, collection: str) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM records WHERE collection = ?", (collection,)).fetchone()[0]
+
+    def _prune(self, conn: sqlite3.Connection, collection: str, keep: int) -> None:
+        conn.execute(
+            "DELETE FROM records WHERE collection = ? AND seq <= "
+            "(SELECT seq FROM records WHERE collection = ? ORDER BY seq DESC LIMIT 1 OFFSET ?)",
+            (collection, collection, int(keep)),
+        )
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_STORES: dict[str, RunStateStore] = {}
+_STORES_LOCK = threading.Lock()
+
+
+def get_store(path: str | Path | None = None) -> RunStateStore:
+    key = str(path or os.getenv("TESTOPS_STATE_DB", STATE_DB_PATH))
+    with _STORES_LOCK:
+        if key not in _STORES:
+            _STORES[key] = RunStateStore(key)
+        return _STORES[key]
+
+
+# collection -> (legacy JSON file, id field or "__key__" for dict-shaped files, id prefix for the sequence)
+LEGACY_JSON_SOURCES = {
+    "wave2.approvals": ("reports/wave2-approvals.json", "id", "apr"),
+    "wave3.hitl": ("reports/wave3-hitl.json", "id", "hitl"),
+    "wave32.flaky": ("reports/flaky-registry.json", "__key__", None),
+    "wave4.drift": ("reports/wave4-drift-reports.json", "id", None),
+    "wave4.soak": ("reports/wave4-soak-reports.json", "id", None),
+    "wave4.fuzz": ("reports/wave4-fuzz-reports.json", "id", None),
+    "v31.audit": ("reports/v31-approval-audit.json", None, None),
+    "v3.benchmarks": ("reports/v3-benchmarks.json", None, None),
+}
+
+
+def import_legacy_json(store: RunStateStore | None = None, sources: dict | None = None) -> dict[str, Any]:
+    """One-shot import of the old whole-file JSON state.
+
+    A collection that already has records is skipped, so re-running is safe.
+    """
+    store = store or get_store()
+    out: dict[str, Any] = {}
+    for collection, (path, id_field, prefix) in (sources or LEGACY_JSON_SOURCES).items():
+        p = Path(path)
+        if not p.exists():
+            out[collection] = {"status": "missing", "path": path}
+            continue
+        if store.count(collection):
+            out[collection] = {"status": "skipped", "reason": "collection not empty"}
+            continue
+        try:
+            raw = json.loads(p.read_text(encoding="utf-8"))
+        except Exception as e:
+            out[collection] = {"status": "error", "error": str(e)}
+            continue
+
+        pairs = list(raw.items()) if id_field == "__key__" else [(r.get(id_field) if id_field else None, r) for r in raw]
+        inserted = 0
+        with store.transaction() as conn:
+            for rid, data in pairs:
+                inserted += conn.execute(
+                    "INSERT OR IGNORE INTO records(collection, id, ts, data) VALUES (?, ?, ?, ?)",
+                    (collection, rid, str(data.get("ts") or data.get("created_at") or datetime.now(UTC).isoformat()), json.dumps(data)),
+                ).rowcount
+            if prefix:
+                conn.execute(
+                    "INSERT INTO sequences(collection, value) VALUES (?, ?) "
+                    "ON CONFLICT(collection) DO UPDATE SET value = MAX(value, excluded.value)",
+                    (collection, len(pairs)),
+                )
+        out[collection] = {"status": "imported", "rows": inserted}
+        if inserted < len(pairs):
+            out[collection]["duplicates_ignored"] = len(pairs) - inserted  # records sharing an id keep the first
+    return out
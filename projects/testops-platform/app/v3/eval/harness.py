@@ -1,7 +1,9 @@
-from pathlib import Path
-import json
 from datetime import datetime, UTC
 
+from app.state.store import get_store
+
+BENCHMARKS = "v3.benchmarks"
+
 
 def evaluate_run(payload: dict):
     counts = payload.get("counts", {})
@@ -12,15 +14,7 @@ def evaluate_run(payload: dict):
     return {"score": score, "pass_rate": round(pass_rate, 3), "fail_rate": round(fail_rate, 3)}
 
 
-def persist_benchmark(result: dict, path="reports/v3-benchmarks.json"):
-    p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
-    data = []
-    if p.exists():
-        try:
-            data = json.loads(p.read_text())
-        except Exception:
-            data = []
-    data.append({"ts": datetime.now(UTC).isoformat(), **result})
-    p.write_text(json.dumps(data[-500:], indent=2), encoding="utf-8")
-    return str(p)
+def persist_benchmark(result: dict):
+    store = get_store()
+    store.append(BENCHMARKS, {"ts": datetime.now(UTC).isoformat(), **result}, keep=500)
+    return str(store.path)
@@ -1,28 +1,164 @@
+import threading
 import time
+from bisect import bisect_left
 from functools import wraps
 
-METRICS = {"runs": 0, "failures": 0, "durations_ms": []}
+DEFAULT_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 300000)
+OVERFLOW_LABEL = "_other"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames=(), max_series: int = 500):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+        self._series: dict[tuple, object] = {}
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        key = tuple(str(labels[n]) for n in self.labelnames)
+        # Series count is capped so a runaway label value cannot grow memory without bound.
+        if key not in self._series and len(self._series) >= self.max_series:
+            key = tuple(OVERFLOW_LABEL for _ in self.labelnames)
+        return key
+
+    def series(self) -> list[tuple[dict, object]]:
+        with self._lock:
+            items = list(self._series.items())
+        return [(dict(zip(self.labelnames, k)), self._copy(v)) for k, v in items]
+
+    def _copy(self, v):
+        return v
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(tuple(str(labels[n]) for n in self.labelnames), 0)
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram: memory per series is ``len(buckets) + 2`` numbers however many samples arrive."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS_MS, max_series: int = 500):
+        super().__init__(name, help, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        idx = bisect_left(self.buckets, value)  # le semantics: value == bound lands in that bucket
+        with self._lock:
+            key = self._key(labels)
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = {"counts": [0] * (len(self.buckets) + 1), "sum": 0.0, "count": 0}
+            s["counts"][idx] += 1
+            s["sum"] += value
+            s["count"] += 1
+
+    def _copy(self, v):
+        return {"counts": list(v["counts"]), "sum": v["sum"], "count": v["count"]}
+
+    def quantile(self, q: float, data: dict) -> float:
+        """Estimate a quantile from bucket counts the way Prometheus' histogram_quantile does."""
+        total = data["count"]
+        if not total:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, c in enumerate(data["counts"]):
+            if seen + c >= rank and c:
+                if i == len(self.buckets):
+                    return float(self.buckets[-1])
+                lower = self.buckets[i - 1] if i else 0
+                return lower + (self.buckets[i] - lower) * (rank - seen) / c
+            seen += c
+        return float(self.buckets[-1])
+
+
+class TelemetryRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, _Metric] = {}
+
+    def _get_or_create(self, cls, name, help, labelnames, **kwargs):
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, help, labelnames, **kwargs)
+            elif not isinstance(m, cls) or m.labelnames != tuple(labelnames):
+                raise ValueError(f"metric {name} already registered with a different type or labels")
+            return m
+
+    def counter(self, name: str, help: str, labelnames=()) -> Counter:
+        return self._get_or_create(Counter, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS_MS) -> Histogram:
+        return self._get_or_create(Histogram, name, help, labelnames, buckets=buckets)
+
+    def collect(self) -> list[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+
+REGISTRY = TelemetryRegistry()
+RUNS = REGISTRY.counter("testops_runs_total", "Total instrumented runs", ["instrument"])
+FAILURES = REGISTRY.counter("testops_failures_total", "Total instrumented failures", ["instrument"])
+DURATION = REGISTRY.histogram("testops_duration_ms", "Instrumented call duration in ms", ["instrument"])
 
 
 def instrument(name: str):
     def deco(fn):
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            t0 = time.time()
-            METRICS["runs"] += 1
+            t0 = time.perf_counter()
+            RUNS.inc(instrument=name)
             try:
-                out = fn(*args, **kwargs)
-                METRICS["durations_ms"].append(int((time.time() - t0) * 1000))
-                return out
+                return fn(*args, **kwargs)
             except Exception:
-                METRICS["failures"] += 1
-                METRICS["durations_ms"].append(int((time.time() - t0) * 1000))
+                FAILURES.inc(instrument=name)
                 raise
+            finally:
+                DURATION.observe((time.perf_counter() - t0) * 1000, instrument=name)
         return wrapper
     return deco
 
 
 def snapshot():
-    d = METRICS["durations_ms"]
-    avg = int(sum(d) / len(d)) if d else 0
-    return {"runs": METRICS["runs"], "failures": METRICS["failures"], "avg_ms": avg, "samples": len(d)}
+    failures = {labels["instrument"]: v for labels, v in FAILURES.series()}
+    runs = {labels["instrument"]: v for labels, v in RUNS.series()}
+    instruments = {}
+    total_sum = total_count = 0
+    for labels, h in DURATION.series():
+        name = labels["instrument"]
+        total_sum += h["sum"]
+        total_count += h["count"]
+        instruments[name] = {
+            "runs": runs.get(name, 0),
+            "failures": failures.get(name, 0),
+            "avg_ms": int(h["sum"] / h["count"]) if h["count"] else 0,
+            "p50_ms": round(DURATION.quantile(0.5, h), 1),
+            "p95_ms": round(DURATION.quantile(0.95, h), 1),
+            "p99_ms": round(DURATION.quantile(0.99, h), 1),
+            "samples": h["count"],
+        }
+    return {
+        "runs": sum(runs.values()),
+        "failures": sum(failures.values()),
+        "avg_ms": int(total_sum / total_count) if total_count else 0,
+        "samples": total_count,
+        "instruments": instruments,
+    }
@@ -1,32 +1,20 @@
-from pathlib import Path
-import json
 from datetime import datetime, UTC
 
-AUDIT = Path("reports/v31-approval-audit.json")
+from app.state.store import get_store
 
-
-def _load():
-    if not AUDIT.exists():
-        return []
-    try:
-        return json.loads(AUDIT.read_text())
-    except Exception:
-        return []
+COLLECTION = "v31.audit"
 
 
 def log_approval(action: str, approved: bool, actor: str, payload: dict):
-    rows = _load()
-    rows.append({
+    row = {
         "ts": datetime.now(UTC).isoformat(),
         "action": action,
         "approved": approved,
         "actor": actor,
         "payload": payload,
-    })
-    AUDIT.parent.mkdir(parents=True, exist_ok=True)
-    AUDIT.write_text(json.dumps(rows[-1000:], indent=2), encoding="utf-8")
-    return rows[-1]
+    }
+    return get_store().append(COLLECTION, row, keep=1000)
 
 
 def list_audit(limit: int = 100):
-    return _load()[-limit:]
+    return list(reversed(get_store().latest(COLLECTION, limit)))
@@ -1,17 +1,41 @@
-from app.v3.observability.telemetry import snapshot
-
-
-def prometheus_text():
-    s = snapshot()
-    lines = [
-        "# HELP testops_runs_total Total instrumented runs",
-        "# TYPE testops_runs_total counter",
-        f"testops_runs_total {s['runs']}",
-        "# HELP testops_failures_total Total instrumented failures",
-        "# TYPE testops_failures_total counter",
-        f"testops_failures_total {s['failures']}",
-        "# HELP testops_duration_avg_ms Average duration in ms",
-        "# TYPE testops_duration_avg_ms gauge",
-        f"testops_duration_avg_ms {s['avg_ms']}",
-    ]
+from app.v3.observability.telemetry import REGISTRY, snapshot
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels: dict, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in items.items()) + "}"
+
+
+def _num(v) -> str:
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def prometheus_text(registry=REGISTRY):
+    lines = []
+    for m in registry.collect():
+        lines += [f"# HELP {m.name} {m.help}", f"# TYPE {m.name} {m.kind}"]
+        for labels, v in m.series():
+            if m.kind == "histogram":
+                cumulative = 0
+                for bound, c in zip(list(m.buckets) + ["+Inf"], v["counts"]):
+                    cumulative += c
+                    le = bound if bound == "+Inf" else _num(bound)
+                    lines.append(f"{m.name}_bucket{_labels(labels, le=le)} {cumulative}")
+                lines.append(f"{m.name}_sum{_labels(labels)} {_num(v['sum'])}")
+                lines.append(f"{m.name}_count{_labels(labels)} {v['count']}")
+            else:
+                lines.append(f"{m.name}{_labels(labels)} {_num(v)}")
+
+    if registry is REGISTRY:
+        lines += [
+            "# HELP testops_duration_avg_ms Average duration in ms (kept for existing dashboards; prefer testops_duration_ms)",
+            "# TYPE testops_duration_avg_ms gauge",
+            f"testops_duration_avg_ms {snapshot()['avg_ms']}",
+        ]
     return "\n".join(lines) + "\n"
@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 
 def push_result(run_id: int, case_id: int, status_id: int, comment: str = ""):
@@ -13,7 +13,7 @@ def push_result(run_id: int, case_id: int, status_id: int, comment: str = ""):
         "status_id": status_id,
         "comment": comment,
     }
-    r = requests.post(f"{base}/index.php?/api/v2/add_result_for_case/{run_id}/{case_id}", json=payload, auth=(user, key), timeout=30)
+    r = http.post(f"{base}/index.php?/api/v2/add_result_for_case/{run_id}/{case_id}", json=payload, auth=(user, key), timeout=30)
     if not r.ok:
         return {"ok": False, "error": r.text}
     return {"ok": True, "result": r.json()}
@@ -1,22 +1,13 @@
-from pathlib import Path
-import json
 from datetime import datetime, UTC
 
-DB = Path("reports/wave2-approvals.json")
+from app.state.store import get_store
 
-
-def _load():
-    if not DB.exists():
-        return []
-    try:
-        return json.loads(DB.read_text())
-    except Exception:
-        return []
+COLLECTION = "wave2.approvals"
 
 
 def create_request(title: str, payload: dict, requested_by: str):
-    rows = _load()
-    rid = f"apr-{len(rows)+1}"
+    store = get_store()
+    rid = store.next_id(COLLECTION, "apr")
     row = {
         "id": rid,
         "ts": datetime.now(UTC).isoformat(),
@@ -26,23 +17,18 @@ def create_request(title: str, payload: dict, requested_by: str):
         "status": "PENDING",
         "approvals": [],
     }
-    rows.append(row)
-    DB.parent.mkdir(parents=True, exist_ok=True)
-    DB.write_text(json.dumps(rows, indent=2), encoding="utf-8")
-    return row
+    return store.append(COLLECTION, row, id=rid)
 
 
 def approve(request_id: str, actor: str):
-    rows = _load()
-    for r in rows:
-        if r["id"] == request_id:
-            r["approvals"].append(actor)
-            if len(set(r["approvals"])) >= 2:
-                r["status"] = "APPROVED"
-            DB.write_text(json.dumps(rows, indent=2), encoding="utf-8")
-            return r
-    return None
+    def _apply(r):
+        r["approvals"].append(actor)
+        if len(set(r["approvals"])) >= 2:
+            r["status"] = "APPROVED"
+        return r
+
+    return get_store().update(COLLECTION, request_id, _apply)
 
 
 def list_requests():
-    return _load()
+    return get_store().items(COLLECTION)
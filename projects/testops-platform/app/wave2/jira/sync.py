@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 
 def add_comment(issue_key: str, comment: str):
@@ -10,7 +10,7 @@ def add_comment(issue_key: str, comment: str):
         return {"ok": False, "error": "jira config missing"}
 
     payload = {"body": comment}
-    r = requests.post(f"{base}/rest/api/3/issue/{issue_key}/comment", json=payload, auth=(user, token), timeout=30)
+    r = http.post(f"{base}/rest/api/3/issue/{issue_key}/comment", json=payload, auth=(user, token), timeout=30)
     if not r.ok:
         return {"ok": False, "error": r.text}
     return {"ok": True, "result": r.json()}
@@ -24,7 +24,7 @@ def transition_issue(issue_key: str, transition_id: str):
         return {"ok": False, "error": "jira config missing"}
 
     payload = {"transition": {"id": transition_id}}
-    r = requests.post(f"{base}/rest/api/3/issue/{issue_key}/transitions", json=payload, auth=(user, token), timeout=30)
+    r = http.post(f"{base}/rest/api/3/issue/{issue_key}/transitions", json=payload, auth=(user, token), timeout=30)
     if not r.ok:
         return {"ok": False, "error": r.text}
     return {"ok": True}
@@ -1,18 +1,10 @@
-from pathlib import Path
-import json
+from app.state.store import get_store
+from app.v3.eval.harness import BENCHMARKS
 
 
 def load_benchmark_trends(limit: int = 50):
-    p = Path("reports/v3-benchmarks.json")
-    if not p.exists():
-        return []
-    try:
-        rows = json.loads(p.read_text())
-    except Exception:
-        return []
-
     out = []
-    for r in rows[-limit:]:
+    for r in reversed(get_store().latest(BENCHMARKS, limit)):
         score = None
         if isinstance(r.get("evaluation"), dict):
             score = r["evaluation"].get("score")
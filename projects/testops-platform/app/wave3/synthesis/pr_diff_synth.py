@@ -1,6 +1,6 @@
 import os
 import json
-import requests
+from app.core.http_client import http
 
 
 def synthesize_tests_from_diff(pr_diff: str):
@@ -26,7 +26,7 @@ def synthesize_tests_from_diff(pr_diff: str):
     }
 
     try:
-        r = requests.post(
+        r = http.post(
             f"{base}/chat/completions",
             headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
             json={"model": model, "temperature": 0, "messages": [{"role": "user", "content": json.dumps(prompt)}]},
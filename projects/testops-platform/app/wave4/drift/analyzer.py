@@ -1,10 +1,10 @@
-import json
 from collections import Counter
 from datetime import datetime, UTC
 from math import sqrt
-from pathlib import Path
 
-DB = Path("reports/wave4-drift-reports.json")
+from app.state.store import get_store
+
+COLLECTION = "wave4.drift"
 
 
 def _mean(xs):
@@ -18,21 +18,11 @@ def _std(xs):
     return sqrt(sum((x - m) ** 2 for x in xs) / len(xs))
 
 
-def _load_db():
-    if not DB.exists():
-        return []
-    try:
-        return json.loads(DB.read_text())
-    except Exception:
-        return []
-
-
 def _persist(report):
-    rows = _load_db()
-    rows.append(report)
-    DB.parent.mkdir(parents=True, exist_ok=True)
-    DB.write_text(json.dumps(rows[-200:], indent=2), encoding="utf-8")
-    return report
+    store = get_store()
+    # Report ids are timestamped to the second; the sequence suffix keeps them unique.
+    report["id"] = store.next_id(COLLECTION, report["id"])
+    return store.append(COLLECTION, report, id=report["id"], keep=200)
 
 
 def analyze_drift(baseline: list[dict], current: list[dict], numeric_fields: list[str], categorical_fields: list[str]):
@@ -81,4 +71,4 @@ def analyze_drift(baseline: list[dict], current: list[dict], numeric_fields: lis
 
 
 def list_drift_reports(limit: int = 20):
-    return list(reversed(_load_db()))[:limit]
+    return get_store().latest(COLLECTION, limit)
@@ -1,27 +1,17 @@
-import json
 import random
 import time
 from datetime import datetime, UTC
-from pathlib import Path
 
-DB = Path("reports/wave4-soak-reports.json")
+from app.jobs import cancellation_requested
+from app.state.store import get_store
 
-
-def _load_db():
-    if not DB.exists():
-        return []
-    try:
-        return json.loads(DB.read_text())
-    except Exception:
-        return []
+COLLECTION = "wave4.soak"
 
 
 def _persist(report):
-    rows = _load_db()
-    rows.append(report)
-    DB.parent.mkdir(parents=True, exist_ok=True)
-    DB.write_text(json.dumps(rows[-100:], indent=2), encoding="utf-8")
-    return report
+    store = get_store()
+    report["id"] = store.next_id(COLLECTION, report["id"])
+    return store.append(COLLECTION, report, id=report["id"], keep=100)
 
 
 def _pct(xs: list[int], q: int):
@@ -36,7 +26,7 @@ def run_soak(duration_seconds: int = 60, interval_ms: int = 200, jitter_ms: int
     end = time.monotonic() + max(1, duration_seconds)
     samples = []
 
-    while time.monotonic() < end:
+    while time.monotonic() < end and not cancellation_requested():
         t0 = time.perf_counter()
         # simulate a reusable step (request/agent action/etc)
         time.sleep(max(0, (interval_ms + random.randint(-jitter_ms, jitter_ms)) / 1000.0))
@@ -61,4 +51,4 @@ def run_soak(duration_seconds: int = 60, interval_ms: int = 200, jitter_ms: int
 
 
 def list_soak_reports(limit: int = 20):
-    return list(reversed(_load_db()))[:limit]
+    return get_store().latest(COLLECTION, limit)
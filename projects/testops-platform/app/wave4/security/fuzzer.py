@@ -1,26 +1,15 @@
-import json
 from datetime import datetime, UTC
-from pathlib import Path
 import requests
 
-DB = Path("reports/wave4-fuzz-reports.json")
+from app.state.store import get_store
 
-
-def _load_db():
-    if not DB.exists():
-        return []
-    try:
-        return json.loads(DB.read_text())
-    except Exception:
-        return []
+COLLECTION = "wave4.fuzz"
 
 
 def _persist(report):
-    rows = _load_db()
-    rows.append(report)
-    DB.parent.mkdir(parents=True, exist_ok=True)
-    DB.write_text(json.dumps(rows[-200:], indent=2), encoding="utf-8")
-    return report
+    store = get_store()
+    report["id"] = store.next_id(COLLECTION, report["id"])
+    return store.append(COLLECTION, report, id=report["id"], keep=200)
 
 
 def run_fuzz(target_base_url: str, path: str = "/", method: str = "GET", auth_header: str = ""):
@@ -73,4 +62,4 @@ def run_fuzz(target_base_url: str, path: str = "/", method: str = "GET", auth_he
 
 
 def list_fuzz_reports(limit: int = 20):
-    return list(reversed(_load_db()))[:limit]
+    return get_store().latest(COLLECTION, limit)
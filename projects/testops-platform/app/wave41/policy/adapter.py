@@ -1,5 +1,5 @@
 import os
-import requests
+from app.core.http_client import http
 
 from app.wave2.policy.engine import evaluate_policy
 
@@ -14,7 +14,7 @@ def evaluate_with_adapter(input_data: dict):
         return local
 
     try:
-        response = requests.post(opa_url, json={"input": input_data}, timeout=timeout_s)
+        response = http.post(opa_url, json={"input": input_data}, timeout=timeout_s)
         response.raise_for_status()
         payload = response.json()
         result = payload.get("result")
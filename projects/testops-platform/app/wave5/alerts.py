@@ -5,7 +5,7 @@ from pathlib import Path
 import json
 import os
 
-import requests
+from app.core.http_client import http
 
 ALERTS_LOG = Path("reports/wave5/alerts-log.jsonl")
 
@@ -19,7 +19,7 @@ def _append_alert(row: dict) -> None:
 def _send_webhook(url: str, payload: dict) -> dict:
     if not url:
         return {"ok": False, "reason": "missing url"}
-    r = requests.post(url, json=payload, timeout=20)
+    r = http.post(url, json=payload, timeout=20)
     return {"ok": 200 <= r.status_code < 300, "status_code": r.status_code}
 
 
@@ -51,7 +51,7 @@ def _send_opsgenie(payload: dict) -> dict:
         "priority": "P1" if payload.get("severity") == "critical" else "P3",
         "details": payload,
     }
-    r = requests.post("https://api.opsgenie.com/v2/alerts", headers=headers, json=body, timeout=20)
+    r = http.post("https://api.opsgenie.com/v2/alerts", headers=headers, json=body, timeout=20)
     return {"ok": 200 <= r.status_code < 300, "status_code": r.status_code}
 
 
@@ -6,7 +6,7 @@ from pathlib import Path
 import json
 import os
 
-import requests
+from app.core.http_client import http
 
 REPORTS_DIR = Path("reports/wave5/mobile-cloud")
 LAST_REPORT = REPORTS_DIR / "last-run.json"
@@ -72,7 +72,7 @@ def run_cloud_mobile(
         # Skeleton provider integration: validate auth against provider status/session APIs.
         try:
             if cfg.provider == "browserstack":
-                response = requests.get(cfg.endpoint, auth=(cfg.username, cfg.access_key), timeout=30)
+                response = http.get(cfg.endpoint, auth=(cfg.username, cfg.access_key), timeout=30)
                 response.raise_for_status()
                 payload = response.json() if response.text else []
                 sample = payload[0].get("automation_session", {}) if isinstance(payload, list) and payload else {}
@@ -88,7 +88,7 @@ def run_cloud_mobile(
                 }
             else:
                 status_url = f"{cfg.endpoint.rstrip('/')}/{cfg.username}/jobs"
-                response = requests.get(status_url, auth=(cfg.username, cfg.access_key), timeout=30)
+                response = http.get(status_url, auth=(cfg.username, cfg.access_key), timeout=30)
                 response.raise_for_status()
                 payload = response.json() if response.text else []
                 job_id = payload[0].get("id") if isinstance(payload, list) and payload else "saucelabs-job"
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 import os
 
-import requests
+from app.core.http_client import http
 
 
 @dataclass
@@ -45,7 +45,7 @@ class VaultSecretProvider(SecretProvider):
         if not self.url or not self.token:
             return os.getenv(key, default)
         try:
-            r = requests.get(self._url(), headers=self._headers(), timeout=15)
+            r = http.get(self._url(), headers=self._headers(), timeout=15)
             r.raise_for_status()
             payload = r.json() or {}
             data = ((payload.get("data") or {}).get("data") or {})
@@ -59,7 +59,8 @@ class VaultSecretProvider(SecretProvider):
         if not self.token:
             return SecretProviderStatus(provider="vault", healthy=False, details={"reason": "missing WAVE5_VAULT_TOKEN"})
         try:
-            r = requests.get(f"{self.url}/v1/sys/health", headers=self._headers(), timeout=10)
+            # 429 (standby) and 503 (sealed) are answers here, not transient errors
+            r = http.get(f"{self.url}/v1/sys/health", headers=self._headers(), timeout=10, retry=False)
             healthy = r.status_code in (200, 429, 472, 473)
             return SecretProviderStatus(provider="vault", healthy=healthy, details={"status_code": r.status_code, "url": self.url})
         except Exception as exc:
@@ -4,14 +4,20 @@ import json
 from app.core.config import load_config
 from app.core.orchestrator import run_product_suite
 from app.agent.telegram_listener import run_telegram_listener
+from app.state.store import import_legacy_json
 
 
 def main():
     ap = argparse.ArgumentParser(description="TestOps Platform - unified product testing")
     ap.add_argument("--config", default="config/product.yaml")
     ap.add_argument("--telegram-listen", action="store_true")
+    ap.add_argument("--import-legacy-state", action="store_true", help="import old reports/*.json run state into the SQLite store")
     args = ap.parse_args()
 
+    if args.import_legacy_state:
+        print(json.dumps(import_legacy_json(), indent=2))
+        return
+
     if args.telegram_listen:
         run_telegram_listener(config_path=args.config)
         return
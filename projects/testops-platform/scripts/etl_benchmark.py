@@ -0,0 +1,81 @@
+"""Benchmark the ETL check engines on a synthetic orders extract.
+
+    python scripts/etl_benchmark.py --rows 10000000 --engines streaming columnar
+
+The file is generated once under reports/ and reused on later runs with the same row count.
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.etl import columnar, engine  # noqa: E402
+
+PROFILE = {
+    "name": "benchmark",
+    "required_columns": ["order_id", "customer_id", "amount", "status", "updated_at"],
+    "key_columns": ["order_id"],
+    "rowcount_tolerance": 0,
+    "freshness": {"timestamp_column": "updated_at", "max_latency_minutes": 100000000},
+    "business_rules": [
+        {"name": "amount_non_negative", "column": "amount", "op": "gte", "value": 0},
+        {"name": "status_numeric_flag", "column": "status_flag", "op": "gte", "value": 0},
+    ],
+}
+
+
+def generate(path: Path, rows: int, seed: int = 7):
+    if path.exists():
+        return
+    rnd = random.Random(seed)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with tmp.open("w", encoding="utf-8", newline="") as f:
+        f.write("order_id,customer_id,amount,status,updated_at,status_flag\n")
+        batch = []
+        for i in range(rows):
+            batch.append(
+                f"{i},C{rnd.randrange(100000):06d},{rnd.random() * 500:.2f},{'paid' if i % 7 else 'pending'},"
+                f"2026-02-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:00Z,{i % 2}\n"
+            )
+            if len(batch) == 100_000:
+                f.writelines(batch)
+                batch.clear()
+        f.writelines(batch)
+    tmp.replace(path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rows", type=int, default=10_000_000)
+    ap.add_argument("--engines", nargs="+", default=["streaming", "columnar"], choices=sorted(engine.ENGINES))
+    ap.add_argument("--chunk-rows", type=int, default=engine.DEFAULT_CHUNK_ROWS)
+    ap.add_argument("--workers", type=int, default=1)
+    args = ap.parse_args()
+
+    path = Path("reports") / f"etl-bench-{args.rows}.csv"
+    generate(path, args.rows)
+    profile = {**PROFILE, "source": {"path": str(path)}, "target": {"path": str(path)}, "chunk_rows": args.chunk_rows, "workers": args.workers}
+
+    results, reference = {}, None
+    for name in args.engines:
+        t0 = time.perf_counter()
+        checks, _, target_rows = engine.ENGINES[name](profile)
+        elapsed = time.perf_counter() - t0
+        # Freshness latency is wall-clock based; compare everything else.
+        got = [c.as_dict() for c in checks if not c.name.startswith("freshness")]
+        reference = reference or got
+        results[name] = {"seconds": round(elapsed, 2), "rows_per_s": int(target_rows / elapsed), "same_report": got == reference}
+
+    base = results[args.engines[0]]["seconds"]
+    for r in results.values():
+        r["speedup"] = round(base / r["seconds"], 2)
+    print(json.dumps({"rows": args.rows, "numpy": columnar.available(), "arrow": columnar.arrow_available(), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import re
+
+import pytest
+import yaml
+
+from app.etl import engine, history
+
+_LATENCY = re.compile(r"latency_minutes=[^,]*")
+
+
+@pytest.fixture
+def etl_profile(tmp_path, monkeypatch):
+    """Write source/target CSVs and a one-profile ``profiles.yaml`` named "p", and point the ETL engine at them.
+
+    ``directory`` defaults to ``tmp_path``; extra keyword arguments are merged into the profile.
+    """
+
+    def make(source: str, target: str, directory=None, **extra):
+        d = directory or tmp_path
+        d.mkdir(parents=True, exist_ok=True)
+        (d / "s.csv").write_text(source, encoding="utf-8")
+        (d / "t.csv").write_text(target, encoding="utf-8")
+        profile = {
+            "name": "p",
+            "source": {"path": str(d / "s.csv")},
+            "target": {"path": str(d / "t.csv")},
+            "required_columns": ["id", "amount", "updated_at", "absent"],
+            "key_columns": ["id"],
+            "freshness": {"timestamp_column": "updated_at", "max_latency_minutes": 10_000_000},
+            "business_rules": [
+                {"name": "amount_pos", "column": "amount", "op": "gt", "value": 0},
+                {"column": "amount", "op": "lte", "value": "100"},
+                {"name": "bad_threshold", "column": "amount", "op": "gte", "value": "n/a"},
+                {"name": "missing_col", "column": "nope", "op": "eq", "value": 1},
+            ],
+            **extra,
+        }
+        cfg = d / "profiles.yaml"
+        cfg.write_text(yaml.safe_dump({"profiles": [profile]}), encoding="utf-8")
+        monkeypatch.setattr(engine, "ETL_CONFIG_PATH", cfg)
+        monkeypatch.setattr(engine, "ETL_REPORT_PATH", d / "report.json")
+        monkeypatch.setattr(history, "ETL_HISTORY_DIR", d / "history")
+
+    return make
+
+
+@pytest.fixture
+def strip_report():
+    """Report without its wall-clock parts, for comparing runs: generation time and freshness latency."""
+
+    def strip(report):
+        report = dict(report)
+        report.pop("generated_at")
+        report["checks"] = [
+            dict(c, detail=_LATENCY.sub("latency_minutes=*", c["detail"])) if c["name"].startswith("freshness") else c
+            for c in report["checks"]
+        ]
+        return report
+
+    return strip
@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from app.agent.service import get_agent_service
+from app.channels.registry import get_channel_registry
+from app.core.config import load_config
+
+
+def _write(path, body, bump_ns=0):
+    path.write_text(body)
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump_ns))
+
+
+def test_config_is_cached_until_file_changes(tmp_path):
+    cfg_path = tmp_path / "product.yaml"
+    _write(cfg_path, "features:\n  security:\n    enabled: true\n")
+
+    first = load_config(str(cfg_path))
+    assert load_config(str(cfg_path)) is first
+    assert first["features"]["security"]["enabled"] is True
+
+    _write(cfg_path, "features:\n  security:\n    enabled: false\n", bump_ns=10_000_000)
+    second = load_config(str(cfg_path))
+    assert second is not first
+    assert second["features"]["security"]["enabled"] is False
+
+
+def test_config_is_read_only_and_validated(tmp_path):
+    cfg = load_config("config/product.yaml")
+    with pytest.raises(TypeError):
+        cfg["features"]["functional"]["enabled"] = False
+    assert isinstance(cfg["features"]["functional"]["workflows"], tuple)
+
+    bad = tmp_path / "bad.yaml"
+    bad.write_text("features:\n  functional: yes\n")
+    with pytest.raises(ValueError):
+        load_config(str(bad))
+
+
+def test_service_and_registry_rebuilt_only_on_change(tmp_path):
+    cfg_path = tmp_path / "product.yaml"
+    _write(cfg_path, "agent:\n  channels:\n    slack:\n      bot_token: a\n")
+
+    svc = get_agent_service(str(cfg_path))
+    reg = get_channel_registry(str(cfg_path))
+    assert get_agent_service(str(cfg_path)) is svc
+    assert get_channel_registry(str(cfg_path)) is reg
+    assert reg.slack.bot_token == "a"
+
+    _write(cfg_path, "agent:\n  channels:\n    slack:\n      bot_token: b\n", bump_ns=10_000_000)
+    assert get_agent_service(str(cfg_path)) is not svc
+    assert get_channel_registry(str(cfg_path)).slack.bot_token == "b"
@@ -0,0 +1,104 @@
+import threading
+import time
+
+import pytest
+import yaml
+from fastapi.testclient import TestClient
+
+from app.api.server import app
+from app.etl import batch, engine
+from app.jobs import JobManager
+
+ORDERS = "id,amount,updated_at\n" + "".join(f"{i},{i % 50},2026-01-01T00:00:00Z\n" for i in range(200))
+
+
+@pytest.fixture
+def profiles(tmp_path, monkeypatch):
+    (tmp_path / "orders.csv").write_text(ORDERS, encoding="utf-8")
+    (tmp_path / "orders_copy.csv").write_text(ORDERS, encoding="utf-8")
+    base = {
+        "source": {"path": str(tmp_path / "orders.csv")},
+        "target": {"path": str(tmp_path / "orders_copy.csv")},
+        "required_columns": ["id", "amount"],
+        "key_columns": ["id"],
+        "freshness": {"timestamp_column": "updated_at", "max_latency_minutes": 10_000_000},
+    }
+    defs = [
+        {"name": "a", **base},
+        {"name": "b", **base, "business_rules": [{"name": "positive", "column": "amount", "op": "gt", "value": 0}]},
+        {"name": "c", **base, "engine": "memory"},
+        {"name": "broken", **base, "target": {"path": str(tmp_path / "missing.csv")}},
+    ]
+    cfg = tmp_path / "profiles.yaml"
+    cfg.write_text(yaml.safe_dump({"profiles": defs}), encoding="utf-8")
+    monkeypatch.setattr(engine, "ETL_CONFIG_PATH", cfg)
+    monkeypatch.setattr(batch, "ETL_BATCH_REPORT_PATH", tmp_path / "batch.json")
+    return tmp_path
+
+
+def test_batch_runs_profiles_concurrently_with_one_source_read(profiles, monkeypatch):
+    calls = []
+    monkeypatch.setattr(engine, "_load_profiles_config", lambda real=engine._load_profiles_config: calls.append(1) or real())
+    report = batch.run_etl_profiles(["a", "b", "c"], workers=3)
+    assert len(calls) == 1
+    assert [p["profile"] for p in report["profiles"]] == ["a", "b", "c"]
+    assert [p["status"] for p in report["profiles"]] == ["PASS", "FAIL", "PASS"]
+    assert all(p["elapsed_ms"] >= 0 for p in report["profiles"])
+    # a and b share the streaming source aggregate; c (memory engine) reads rows once.
+    assert report["summary"] | {"elapsed_ms": 0} == {
+        "profiles": 3, "pass": 2, "fail": 1, "error": 0, "cancelled": 0, "workers": 3, "source_reads": 2, "elapsed_ms": 0,
+    }
+    assert report["status"] == "FAIL"
+    assert (profiles / "batch.json").exists()
+
+
+def test_batch_defaults_to_all_profiles_and_isolates_errors(profiles):
+    report = batch.run_etl_profiles(workers=2)
+    by_name = {p["profile"]: p for p in report["profiles"]}
+    assert set(by_name) == {"a", "b", "c", "broken"}
+    assert by_name["broken"]["status"] == "ERROR" and "FileNotFoundError" in by_name["broken"]["error"]
+    assert by_name["a"]["report"]["summary"]["target_rows"] == 200
+    with pytest.raises(ValueError, match="Unknown ETL profiles"):
+        batch.run_etl_profiles(["a", "nope"])
+
+
+def test_shared_reads_computes_once_per_key():
+    shared = batch.SharedReads()
+    assert shared.get(("k", "x"), lambda: 1) == 1
+    assert shared.get(("k", "x"), lambda: 2) == 1
+    with pytest.raises(RuntimeError):
+        shared.get(("k", "y"), lambda: (_ for _ in ()).throw(RuntimeError("boom")))
+    assert shared.reads == 2
+
+
+def test_batch_endpoint(profiles):
+    client = TestClient(app)
+    r = client.post("/etl/run-batch", headers={"X-API-Key": "operator-token"}, json={"profiles": ["a", "c"], "workers": 2})
+    assert r.status_code == 200
+    assert r.json()["summary"]["pass"] == 2
+    r = client.post("/etl/run-batch", headers={"X-API-Key": "viewer-token"}, json={})
+    assert r.status_code == 403
+
+
+def test_cancelled_batch_starts_no_further_profile(profiles, monkeypatch):
+    monkeypatch.setattr(batch, "CANCEL_POLL_S", 0.02)
+    started, release = [], threading.Event()
+    real = engine.profile_report
+
+    def slow(selected, *args):
+        started.append(selected["name"])
+        release.wait(5)
+        return real(selected, *args)
+
+    monkeypatch.setattr(engine, "profile_report", slow)
+    mgr = JobManager(max_workers=1)
+    job = mgr.submit("etl_run_batch", lambda: batch.run_etl_profiles(["a", "b", "c"], workers=1))
+    while not started:
+        time.sleep(0.01)
+    mgr.cancel(job.id)
+    time.sleep(0.1)
+    release.set()
+    assert mgr.wait(job, timeout=5).status == "CANCELLED"
+    assert started == ["a"]
+    assert [p["status"] for p in job.result["profiles"]] == ["PASS", "CANCELLED", "CANCELLED"]
+    assert job.result["summary"]["cancelled"] == 2 and job.result["status"] == "FAIL"
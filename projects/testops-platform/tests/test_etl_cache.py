@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from app.etl import cache, engine
+
+DATA = "id,amount,updated_at\n" + "".join(f"{i},{i % 9 + 1},2026-01-0{1 + i % 5}T00:00:00Z\n" for i in range(60))
+
+
+@pytest.fixture(autouse=True)
+def _cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "ETL_CACHE_DIR", tmp_path / "cache")
+
+
+def _no_engine(monkeypatch):
+    def boom(*a, **k):
+        raise AssertionError("engine should not run on a cache hit")
+
+    monkeypatch.setitem(engine.ENGINES, "streaming", boom)
+
+
+def test_unchanged_inputs_hit_the_cache(monkeypatch, etl_profile):
+    etl_profile(DATA, DATA, cache=True)
+    first = engine.run_etl_profile("p")
+    assert first["cache"]["hit"] is False
+
+    _no_engine(monkeypatch)
+    second = engine.run_etl_profile("p")
+    assert second["cache"] == {"hit": True, "key": first["cache"]["key"]}
+    assert second["checks"] == first["checks"] and second["summary"] == first["summary"]
+
+
+def test_freshness_is_rejudged_on_hit(monkeypatch, etl_profile):
+    etl_profile(DATA, DATA, cache=True)
+    first = engine.run_etl_profile("p")
+    fresh = next(c for c in first["checks"] if c["name"] == "freshness_latency_target")
+    assert fresh["status"] == "PASS" and "latest=2026-01-05T00:00:00+00:00" in fresh["detail"]
+
+    monkeypatch.setattr(engine, "freshness_latency_minutes", lambda latest: 99_999_999)
+    _no_engine(monkeypatch)
+    second = engine.run_etl_profile("p")
+    stale = next(c for c in second["checks"] if c["name"] == "freshness_latency_target")
+    assert second["cache"]["hit"] is True
+    assert stale["status"] == "FAIL" and "latency_minutes=99999999" in stale["detail"]
+    assert second["status"] == "FAIL"
+
+
+def test_changed_file_or_definition_misses(tmp_path, etl_profile):
+    etl_profile(DATA, DATA, cache=True)
+    engine.run_etl_profile("p")
+    (tmp_path / "t.csv").write_text(DATA.replace("59,6", "59,0"), encoding="utf-8")  # same size, new content
+    report = engine.run_etl_profile("p")
+    assert report["cache"]["hit"] is False
+    assert next(c for c in report["checks"] if c["name"] == "business_rule_target_amount_pos")["status"] == "FAIL"
+
+    etl_profile(DATA, DATA, cache=True, rowcount_tolerance=2)
+    assert engine.run_etl_profile("p")["cache"]["hit"] is False
+    assert engine.run_etl_profile("p", full_rebuild=True)["cache"]["hit"] is False
+    assert engine.run_etl_profile("p", engine="memory")["cache"]["hit"] is False  # engine is part of the key
+
+
+def test_cache_is_opt_in(tmp_path, etl_profile):
+    etl_profile(DATA, DATA)
+    assert "cache" not in engine.run_etl_profile("p")
+    assert not (tmp_path / "cache").exists()
+
+
+def test_lru_eviction(monkeypatch):
+    monkeypatch.setattr(cache, "ETL_CACHE_MAX_ENTRIES", 2)
+    for key in ("a", "b"):
+        cache.store(key, {"v": key})
+        time.sleep(0.02)
+    assert cache.lookup("a") == {"v": "a"}  # a is now the most recently used
+    time.sleep(0.02)
+    cache.store("c", {"v": "c"})
+    assert cache.lookup("b") is None
+    assert cache.lookup("a") == {"v": "a"} and cache.lookup("c") == {"v": "c"}
@@ -0,0 +1,39 @@
+import pytest
+
+from app.etl import columnar, engine
+
+np = pytest.importorskip("numpy")
+
+CLEAN = (
+    "id,amount,updated_at,note\n"
+    "1,10,2026-01-01T00:00:00Z,a\n"
+    "2,,2026-01-02T05:00:00+05:00,\"quoted, comma\"\n"
+    "2,-5,,x\n"
+    " ,abc,2026-01-01T12:00:00Z,y\n"
+    "3,1e2,2025-12-31T00:00:00.500000+00:00,z\n"
+    "4,nan,2026-01-01T23:59:59Z,\n"
+)
+
+
+@pytest.mark.parametrize("arrow", [True, False])
+def test_columnar_matches_reference_engine(monkeypatch, arrow, etl_profile, strip_report):
+    if arrow:
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(columnar, "arrow_available", lambda: False)
+    etl_profile("id,amount\n1,1\n2,2\n", CLEAN, chunk_rows=2)
+    expected = strip_report(engine.run_etl_profile("p", engine="memory"))
+    assert strip_report(engine.run_etl_profile("p", engine="columnar")) == expected
+
+
+def test_columnar_utc_fast_path_picks_latest(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text("ts\n2026-01-01T00:00:00Z\n2026-03-01T00:00:00+00:00\n2026-02-01T00:00:00Z\n")
+    side = columnar.aggregate_file_columnar(p, {"freshness": {"timestamp_column": "ts"}})
+    assert side.freshness.latest.isoformat() == "2026-03-01T00:00:00+00:00"
+
+
+def test_columnar_falls_back_without_numpy(monkeypatch, etl_profile, strip_report):
+    etl_profile("id\n1\n", CLEAN)
+    monkeypatch.setattr(columnar, "np", None)
+    assert strip_report(engine.run_etl_profile("p", engine="columnar")) == strip_report(engine.run_etl_profile("p", engine="memory"))
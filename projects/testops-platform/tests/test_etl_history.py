@@ -0,0 +1,155 @@
+import subprocess
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.etl import engine, history
+
+T0 = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+DATA = "id,amount,updated_at\n1,10,2026-01-01T00:00:00Z\n2,,2026-01-02T00:00:00Z\n2,-5,\n"
+
+
+def _report(at, failing=0, dups=0):
+    return {
+        "profile": "p",
+        "generated_at": at.isoformat(),
+        "checks": [
+            {"name": "schema_validation_target", "status": "PASS", "detail": "all required columns present"},
+            {"name": "rowcount_reconciliation", "status": "PASS", "detail": "source=5, target=4, delta=-1, tolerance=1"},
+            {"name": "duplicate_check_target", "status": "FAIL" if dups else "PASS", "detail": f"duplicate keys={dups} on key_columns=['id']"},
+            {"name": "business_rule_target_r", "status": "FAIL" if failing else "PASS", "detail": f"violations={failing}, op=gte, value=0"},
+        ],
+    }
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(history, "ETL_HISTORY_DIR", tmp_path)
+    return tmp_path
+
+
+def test_round_trip_and_time_window(store):
+    for i in range(6):
+        history.record(_report(T0 + timedelta(hours=12 * i), failing=i % 2), "streaming")
+    data = history.scan("p", ["check", "status", "violations", "engine"], since=T0 + timedelta(hours=12), until=T0 + timedelta(hours=36))
+    assert len(data["run_at"]) == 8  # two runs of four checks
+    assert data["engine"] == ["streaming"] * 8
+    assert data["violations"] == [None, 1, 0, 1, None, 1, 0, 0]
+    assert data["status"][3] == "FAIL" and data["status"][7] == "PASS"
+    assert history.scan("p", ["status"], since=T0 + timedelta(days=30)) == {"run_at": [], "status": []}
+    assert history.scan("other", ["status"]) == {"run_at": [], "status": []}
+    with pytest.raises(ValueError):
+        history.scan("p", ["detail"])
+
+
+def test_pass_rate_and_violation_trends(store):
+    for i in range(6):
+        history.record(_report(T0 + timedelta(hours=8 * i), failing=i, dups=1 if i == 5 else 0), "columnar")
+    assert history.pass_rate("p") == [
+        {"start": "2026-03-01T00:00:00+00:00", "runs": 2, "passed": 1, "pass_rate": 0.5},
+        {"start": "2026-03-02T00:00:00+00:00", "runs": 3, "passed": 0, "pass_rate": 0.0},
+        {"start": "2026-03-03T00:00:00+00:00", "runs": 1, "passed": 0, "pass_rate": 0.0},
+    ]
+    assert [b["pass_rate"] for b in history.pass_rate("p", bucket="week", check="duplicate_check_target")] == [0.8333]
+    trend = history.violation_trend("p", check="business_rule_target_r")
+    assert [(b["start"][:10], b["runs"], b["total"], b["max"], b["last"]) for b in trend] == [
+        ("2026-03-01", 2, 1, 1, 1),
+        ("2026-03-02", 3, 9, 4, 4),
+        ("2026-03-03", 1, 5, 5, 5),
+    ]
+    checks = {b["check"] for b in history.violation_trend("p")}
+    assert checks == {"rowcount_reconciliation", "duplicate_check_target", "business_rule_target_r"}
+    with pytest.raises(ValueError):
+        history.pass_rate("p", bucket="month")
+
+
+def test_queries_decode_only_the_columns_they_need(store, monkeypatch):
+    for i in range(3):
+        history.record(_report(T0 + timedelta(days=i)), "streaming")
+    decoded = []
+    real = history._read
+    monkeypatch.setattr(history, "_read", lambda path, start, header, cols: decoded.append(cols) or real(path, start, header, cols))
+    history.pass_rate("p")
+    assert {c for cols in decoded for c in cols} == {"run_at", "status"}
+    decoded.clear()
+    history.violation_trend("p", since=T0 + timedelta(days=2))
+    assert len(decoded) == 1  # the two older blocks are skipped on their headers
+    assert {c for cols in decoded for c in cols} == {"run_at", "check", "violations"}
+
+
+def test_compaction_merges_small_blocks_and_ignores_torn_tail(store, monkeypatch):
+    monkeypatch.setattr(history, "COMPACT_BLOCKS", 4)
+    monkeypatch.setattr(history, "BLOCK_ROWS", 12)
+    for i in range(11):
+        history.record(_report(T0 + timedelta(minutes=i), failing=i), "streaming")
+    path = history._history_path("p")
+    assert [h["rows"] for _, _, h in history._blocks(path)] == [12, 12, 12, 4, 4]
+    with path.open("ab") as f:
+        f.write(history._block({name: values for name, values in history.scan("p", list(history.SCHEMA)).items()})[:50])
+    data = history.scan("p", ["violations"])
+    assert data["violations"][3::4] == list(range(11))
+    assert data["run_at"] == sorted(data["run_at"])
+
+
+WRITER = '''
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from app.etl import history
+history.ETL_HISTORY_DIR, history.COMPACT_BLOCKS, history.BLOCK_ROWS = Path(sys.argv[1]), 4, 12
+for i in range(25):
+    at = datetime(2026, 3, 1, tzinfo=timezone.utc) + timedelta(minutes=i, seconds=int(sys.argv[2]))
+    history.record({"profile": "p", "generated_at": at.isoformat(), "checks": [{"name": "c", "status": "PASS", "detail": ""}] * 2}, "streaming")
+'''
+
+
+@pytest.mark.skipif(history.fcntl is None, reason="cross-process locking needs fcntl")
+def test_concurrent_writer_processes_keep_every_block(store):
+    procs = [subprocess.Popen([sys.executable, "-c", WRITER, str(store), str(n)]) for n in range(4)]
+    assert [p.wait(60) for p in procs] == [0] * 4
+    assert len(history.scan("p", ["status"])["status"]) == 4 * 25 * 2
+
+
+def test_history_failure_does_not_fail_the_run(etl_profile, monkeypatch, caplog):
+    def broken(report, engine_name):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(history, "record", broken)
+    etl_profile(DATA, DATA)
+    assert engine.run_etl_profile("p")["ok"] is True
+    assert "Could not record ETL history for profile p" in caplog.text
+
+
+def test_profile_runs_are_recorded(etl_profile):
+    etl_profile(DATA, DATA)
+    engine.run_etl_profile("p", engine="streaming")
+    engine.run_etl_profile("p", engine="memory")
+    data = history.scan("p", ["engine", "check", "status"])
+    assert data["engine"].count("streaming") == data["engine"].count("memory") > 0
+    assert "null_check_target" in data["check"]
+    assert history.pass_rate("p")[0]["runs"] == 2
+
+    etl_profile(DATA, DATA, history=False)
+    engine.run_etl_profile("p", engine="streaming")
+    assert history.pass_rate("p")[0]["runs"] == 2
+
+
+def test_history_endpoints(tmp_path, monkeypatch):
+    from app.api.server import app
+
+    monkeypatch.setattr(history, "ETL_HISTORY_DIR", tmp_path)
+    now = datetime.now(timezone.utc)
+    history.record(_report(now - timedelta(days=40), failing=1), "streaming")
+    history.record(_report(now, failing=3), "streaming")
+    client = TestClient(app)
+    viewer = {"X-API-Key": "viewer-token"}
+    r = client.get("/etl/history/pass-rate", params={"profile": "p"}, headers=viewer)
+    assert r.status_code == 200
+    assert [b["runs"] for b in r.json()["trend"]] == [1]
+    r = client.get("/etl/history/violations", params={"profile": "p", "days": 60, "check": "business_rule_target_r"}, headers=viewer)
+    assert [b["total"] for b in r.json()["trend"]] == [1, 3]
+    for path in ("/etl/history/pass-rate", "/etl/history/violations"):
+        r = client.get(path, params={"profile": "p", "bucket": "fortnight"}, headers=viewer)
+        assert r.status_code == 400 and "Unknown bucket: fortnight" in r.json()["detail"]
@@ -0,0 +1,168 @@
+import pytest
+
+from app.etl import engine, history, incremental
+from app.etl.streaming import DuplicateKeys, SketchDuplicateKeys
+
+HEADER = "id,amount,updated_at\n"
+
+
+def _rows(start, stop, day=1):
+    return "".join(f"{i % 40},{i % 130 - 3},2026-01-{day:02d}T{i % 24:02d}:00:00Z\n" for i in range(start, stop))
+
+
+@pytest.fixture(autouse=True)
+def _state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(incremental, "ETL_STATE_DIR", tmp_path / "state")
+
+
+@pytest.fixture
+def full_checks(tmp_path, etl_profile, strip_report):
+    """Checks and row counts of a from-scratch in-memory run over the given inputs."""
+
+    def run(source, target):
+        etl_profile(source, target, directory=tmp_path / "full")
+        report = engine.run_etl_profile("p", engine="memory")
+        return strip_report(report)["checks"], _rows_read(report)
+
+    return run
+
+
+def _rows_read(report):
+    return report["summary"]["source_rows"], report["summary"]["target_rows"]
+
+
+def _not_rerun(name, last):
+    return {"name": name, "status": "SKIPPED", "detail": f"not re-run incrementally (last full run: {last}); use full_rebuild to re-check"}
+
+
+def _incremental(report, strip_report):
+    return strip_report(report)["checks"], _rows_read(report)
+
+
+def _as_incremental(full, last_duplicates):
+    """A full run's results as an incremental run reports them: duplicate keys are not re-counted."""
+    checks, rows = full
+    return [_not_rerun(c["name"], last_duplicates) if c["name"] == "duplicate_check_target" else c for c in checks], rows
+
+
+@pytest.mark.parametrize("eng", ["streaming", "columnar"])
+def test_offset_mode_reads_only_appended_rows(tmp_path, eng, etl_profile, strip_report, full_checks):
+    etl_profile(HEADER + _rows(0, 100), HEADER + _rows(0, 90), incremental="offset")
+    first = engine.run_etl_profile("p", engine=eng)
+    assert first["incremental"]["target"] == {"rebuilt": True, "new_rows": 90}
+
+    with (tmp_path / "t.csv").open("a", encoding="utf-8") as f:
+        f.write(_rows(90, 150, day=2))
+    with (tmp_path / "s.csv").open("a", encoding="utf-8") as f:
+        f.write(_rows(100, 160, day=2))
+    second = engine.run_etl_profile("p", engine=eng)
+    assert second["incremental"]["source"] == {"rebuilt": False, "new_rows": 60}
+    assert second["incremental"]["target"] == {"rebuilt": False, "new_rows": 60}
+
+    source, target = (tmp_path / "s.csv").read_text(), (tmp_path / "t.csv").read_text()
+    assert _incremental(second, strip_report) == _as_incremental(full_checks(source, target), "FAIL")
+
+
+def test_offset_mode_rebuilds_when_prefix_changes(tmp_path, etl_profile):
+    etl_profile(HEADER + _rows(0, 50), HEADER + _rows(0, 50), incremental="offset")
+    engine.run_etl_profile("p")
+    (tmp_path / "t.csv").write_text(HEADER + _rows(5, 60), encoding="utf-8")
+    report = engine.run_etl_profile("p")
+    assert report["incremental"]["target"] == {"rebuilt": True, "new_rows": 55}
+    assert report["summary"]["target_rows"] == 55
+
+
+def test_timestamp_mode_merges_rows_past_watermark(tmp_path, etl_profile, strip_report, full_checks):
+    etl_profile(HEADER + _rows(0, 80), HEADER + _rows(0, 80), incremental="timestamp")
+    first = engine.run_etl_profile("p")
+    assert first["incremental"]["target"]["watermark"] == "2026-01-01T23:00:00+00:00"
+
+    # Not append-only: newer rows are written ahead of the old ones.
+    (tmp_path / "t.csv").write_text(HEADER + _rows(80, 100, day=3) + _rows(0, 80), encoding="utf-8")
+    (tmp_path / "s.csv").write_text(HEADER + _rows(0, 80) + _rows(80, 110, day=3), encoding="utf-8")
+    second = engine.run_etl_profile("p")
+    assert second["incremental"]["target"] == {"rebuilt": False, "new_rows": 20, "watermark": "2026-01-03T23:00:00+00:00"}
+    assert second["incremental"]["source"]["new_rows"] == 30
+
+    source, target = (tmp_path / "s.csv").read_text(), (tmp_path / "t.csv").read_text()
+    assert _incremental(second, strip_report) == _as_incremental(full_checks(source, target), "FAIL")
+
+
+def test_timestamp_mode_admits_new_rows_at_the_watermark(tmp_path, etl_profile, strip_report, full_checks):
+    batch = "".join(f"{i},{i},2026-01-01T05:00:00Z\n" for i in range(10))
+    etl_profile(HEADER + batch, HEADER + batch, incremental="timestamp")
+    engine.run_etl_profile("p")
+
+    # Same load stamp as the watermark, including an exact copy of an existing row.
+    late = "".join(f"{i},{i},2026-01-01T05:00:00Z\n" for i in (9, 10, 11))
+    for name in ("s.csv", "t.csv"):
+        with (tmp_path / name).open("a", encoding="utf-8") as f:
+            f.write(late)
+    second = engine.run_etl_profile("p")
+    assert second["incremental"]["target"] == {"rebuilt": False, "new_rows": 3, "watermark": "2026-01-01T05:00:00+00:00"}
+    assert engine.run_etl_profile("p")["incremental"]["target"]["new_rows"] == 0
+
+    source, target = (tmp_path / "s.csv").read_text(), (tmp_path / "t.csv").read_text()
+    # Row 9 now has a duplicate key, but only a full run counts duplicates across runs.
+    assert _incremental(second, strip_report) == _as_incremental(full_checks(source, target), "PASS")
+    rebuilt = engine.run_etl_profile("p", full_rebuild=True)
+    assert strip_report(rebuilt)["checks"] == full_checks(source, target)[0]
+
+
+def test_whole_file_checks_are_not_rerun_and_state_keeps_no_key_set(tmp_path, etl_profile):
+    etl_profile(HEADER + _rows(0, 30), HEADER + _rows(0, 30), incremental="offset", reconciliation=True)
+    first = engine.run_etl_profile("p")
+    assert {c["name"]: c["status"] for c in first["checks"]}["key_reconciliation"] == "PASS"
+    assert first["summary"]["skipped"] == 0
+
+    for name in ("s.csv", "t.csv"):
+        with (tmp_path / name).open("a", encoding="utf-8") as f:
+            f.write(_rows(0, 5, day=2))  # ids 0-4 again
+    second = engine.run_etl_profile("p")
+    skipped = [c for c in second["checks"] if c["status"] == "SKIPPED"]
+    assert skipped == [_not_rerun("key_reconciliation", "PASS"), _not_rerun("duplicate_check_target", "PASS")]
+    assert second["summary"]["skipped"] == 2
+    assert second["summary"]["fail"] == len([c for c in second["checks"] if c["status"] == "FAIL"])
+
+    state = incremental.load_state("p")
+    assert isinstance(state["target"]["aggregates"].dups, SketchDuplicateKeys)
+    assert not isinstance(state["target"]["aggregates"].dups, DuplicateKeys)
+    assert state["last_full"] == {"key_reconciliation": "PASS", "duplicate_check_target": "PASS"}
+
+    rebuilt = engine.run_etl_profile("p", full_rebuild=True)
+    assert not [c for c in rebuilt["checks"] if c["status"] == "SKIPPED"]
+    assert {c["name"]: c["status"] for c in rebuilt["checks"]}["duplicate_check_target"] == "FAIL"
+
+
+def test_skipped_checks_do_not_fail_a_run_in_history(tmp_path, etl_profile, monkeypatch):
+    monkeypatch.setattr(history, "ETL_HISTORY_DIR", tmp_path / "history")
+    etl_profile(HEADER + _rows(0, 10), HEADER + _rows(0, 10), incremental="offset", required_columns=["id"], business_rules=[], reconciliation=True)
+    assert engine.run_etl_profile("p")["status"] == "PASS"
+    for name in ("s.csv", "t.csv"):
+        with (tmp_path / name).open("a", encoding="utf-8") as f:
+            f.write(_rows(10, 12, day=2))
+    second = engine.run_etl_profile("p")
+    assert second["status"] == "PASS" and second["summary"]["skipped"] == 1
+    # The new keys share no filter bits with the old ones, so the sketch alone rules out duplicates.
+    assert [c["name"] for c in second["checks"] if c["status"] == "SKIPPED"] == ["key_reconciliation"]
+    assert history.pass_rate("p")[0]["pass_rate"] == 1.0
+
+
+def test_full_rebuild_and_definition_change_reset_state(etl_profile):
+    etl_profile(HEADER + _rows(0, 30), HEADER + _rows(0, 30), incremental=True)
+    assert engine.run_etl_profile("p")["incremental"]["mode"] == "timestamp"
+    assert engine.run_etl_profile("p")["incremental"]["target"]["rebuilt"] is False
+    assert engine.run_etl_profile("p", full_rebuild=True)["incremental"]["target"]["rebuilt"] is True
+
+    etl_profile(HEADER + _rows(0, 30), HEADER + _rows(0, 30), incremental=True, rowcount_tolerance=3)
+    assert engine.run_etl_profile("p")["incremental"]["target"]["rebuilt"] is True
+
+
+def test_incremental_mode_validation(etl_profile):
+    etl_profile(HEADER, HEADER, incremental="sometimes")
+    with pytest.raises(ValueError, match="incremental mode"):
+        engine.run_etl_profile("p")
+    etl_profile(HEADER + _rows(0, 5), HEADER + _rows(0, 5), incremental=True, freshness={})
+    assert engine.run_etl_profile("p")["incremental"]["mode"] == "offset"
+    with pytest.raises(ValueError, match="memory engine"):
+        engine.run_etl_profile("p", engine="memory")
@@ -0,0 +1,53 @@
+import pytest
+
+from app.etl import engine, parallel
+from app.etl.parallel import split_ranges
+from app.etl.streaming import SketchDuplicateKeys, aggregate_file, read_header
+
+
+def _rows(n):
+    out = ["id,amount,updated_at,note\n"]
+    for i in range(n):
+        note = f'"line one\nline {i}, ""quoted"""' if i % 7 == 0 else f"n{i}"
+        key = i if i % 50 else i - 1  # sprinkle duplicate keys across ranges
+        out.append(f"{key},{'' if i % 11 == 0 else i % 300 - 5},2026-01-{1 + i % 28:02d}T00:00:00Z,{note}\n")
+        if i % 97 == 0:
+            out.append("\n")
+    return "".join(out)
+
+
+def test_split_ranges_start_on_records_outside_quotes(tmp_path):
+    p = tmp_path / "t.csv"
+    p.write_text(_rows(2000), encoding="utf-8")
+    header, start = read_header(p)
+    ranges = split_ranges(p, start, 9)
+    assert len(ranges) > 1
+    assert ranges[0][0] == start and ranges[-1][1] == p.stat().st_size
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+
+    whole = aggregate_file(p, {"key_columns": ["id"], "required_columns": ["amount"]}, full=True)
+    parts = [aggregate_file(p, {"key_columns": ["id"], "required_columns": ["amount"]}, True, 64, r, header) for r in ranges]
+    merged = parts[0]
+    for side in parts[1:]:
+        merged.merge(side)
+    assert merged.rows.rows == whole.rows.rows == 2000
+    assert merged.dups.duplicate_keys == whole.dups.duplicate_keys > 0
+    assert merged.nulls.count == whole.nulls.count > 0
+
+
+def test_exact_duplicates_come_back_as_filters_not_key_sets(monkeypatch, tmp_path):
+    monkeypatch.setattr(parallel, "MIN_RANGE_BYTES", 2048)
+    p = tmp_path / "t.csv"
+    p.write_text(_rows(3000), encoding="utf-8")
+    side = parallel.aggregate_parallel(aggregate_file, p, {"key_columns": ["id"], "workers": 2}, chunk_rows=100, workers=2)
+    assert isinstance(side.dups, SketchDuplicateKeys) and side.dups.needs_verify
+    side.dups.verify_file(p)
+    assert side.dups.duplicate_keys == aggregate_file(p, {"key_columns": ["id"]}).dups.duplicate_keys > 0
+
+
+@pytest.mark.parametrize("eng", ["streaming", "columnar"])
+def test_process_pool_report_matches_single_pass(monkeypatch, eng, etl_profile, strip_report):
+    monkeypatch.setattr(parallel, "MIN_RANGE_BYTES", 2048)
+    etl_profile(_rows(300), _rows(3000), workers=2, chunk_rows=100)
+    single = strip_report(engine.run_etl_profile("p", engine="memory"))
+    assert strip_report(engine.run_etl_profile("p", engine=eng)) == single
@@ -0,0 +1,102 @@
+import pytest
+
+from app.etl import engine, parallel, reconcile
+
+SOURCE = (
+    "id,region,amount,updated_at\n"
+    "1,eu,10,2026-01-01T00:00:00Z\n"
+    "2,eu,20,2026-01-01T00:00:00Z\n"
+    "3,us,30,2026-01-01T00:00:00Z\n"
+    "4,us,40,2026-01-01T00:00:00Z\n"
+    "4,us,41,2026-01-01T00:00:00Z\n"
+)
+TARGET = (
+    "id,region,amount,updated_at,loaded_by\n"
+    "2,eu,20,2026-01-01T00:00:00Z,etl\n"
+    "\n"
+    "1,eu,11,2026-01-01T00:00:00Z,etl\n"
+    "4,us,41,2026-01-01T00:00:00Z,etl\n"
+    "4,us,40,2026-01-01T00:00:00Z,etl\n"
+    "5,us,50,2026-01-01T00:00:00Z,etl\n"
+)
+
+
+def _key_check(report):
+    return next(c for c in report["checks"] if c["name"] == "key_reconciliation")
+
+
+@pytest.mark.parametrize("eng", ["memory", "streaming", "columnar"])
+def test_key_reconciliation_reports_missing_extra_changed(tmp_path, eng, etl_profile):
+    etl_profile(SOURCE, TARGET, reconciliation={"partitions": 3, "spill_dir": str(tmp_path)})
+    report = engine.run_etl_profile("p", engine=eng)
+    names = [c["name"] for c in report["checks"]]
+    assert names.index("key_reconciliation") == names.index("rowcount_reconciliation") + 1
+    check = _key_check(report)
+    assert check["status"] == "FAIL"
+    assert check["detail"] == (
+        "missing=1, extra=1, changed=1, matched=2, key_columns=['id']; "
+        "sample missing=['3'], extra=['5'], changed=['1']"
+    )
+    assert not any(p.name.startswith("etl-reconcile-") for p in tmp_path.iterdir())  # spill files are removed
+
+
+def test_reconciliation_is_opt_in(etl_profile):
+    etl_profile(SOURCE, TARGET)
+    assert "key_reconciliation" not in [c["name"] for c in engine.run_etl_profile("p")["checks"]]
+    etl_profile(SOURCE, TARGET, reconciliation={"enabled": False})
+    assert "key_reconciliation" not in [c["name"] for c in engine.run_etl_profile("p")["checks"]]
+
+
+def test_composite_keys_compare_columns_and_sample_cap(etl_profile):
+    source = "a,b,v,w\n" + "".join(f"{i},x{i % 3},{i},keep\n" for i in range(200))
+    target = "a,b,v,w\n" + "".join(f"{i},x{i % 3},{i},other\n" for i in range(50, 260))
+    etl_profile(
+        source, target,
+        key_columns=["a", "b"], reconciliation={"compare_columns": ["v"], "sample_size": 2, "partitions": 7},
+    )
+    rec = reconcile.reconcile_files(engine._select_profile("p"), chunk_rows=16)
+    assert (rec.missing, rec.extra, rec.changed, rec.matched) == (50, 60, 0, 150)
+    assert all(len(v) <= 2 for v in rec.samples.values())
+    assert all(isinstance(k, list) and len(k) == 2 for k in rec.samples["missing"])
+
+
+@pytest.mark.parametrize("limit", [64, 2])
+def test_spill_keeps_a_bounded_set_of_partition_files_open(monkeypatch, etl_profile, limit):
+    monkeypatch.setattr(reconcile, "MAX_OPEN_SPILL_FILES", limit)
+    opened = []
+    real_open = reconcile.Path.open
+
+    def tracking_open(self, *args, **kwargs):
+        f = real_open(self, *args, **kwargs)
+        if "a" in f.mode:
+            assert sum(not g.closed for g in opened) < limit
+            opened.append(f)
+        return f
+
+    monkeypatch.setattr(reconcile.Path, "open", tracking_open)
+    source = "id,v\n" + "".join(f"{i},{i}\n" for i in range(300))
+    target = "id,v\n" + "".join(f"{i},{i % 7}\n" for i in range(20, 320))
+    etl_profile(source, target, reconciliation={"partitions": 7})
+    rec = reconcile.reconcile_files(engine._select_profile("p"), chunk_rows=10)
+    assert (rec.missing, rec.extra, rec.matched + rec.changed) == (20, 20, 280)
+    if limit == 64:
+        assert len(opened) == 14  # once per partition and side, not once per chunk
+    assert all(f.closed for f in opened)
+
+
+def test_partition_count_scales_with_input(tmp_path, monkeypatch):
+    monkeypatch.setattr(reconcile, "PARTITION_INPUT_BYTES", 100)
+    (tmp_path / "a.csv").write_text("id\n" + "1\n" * 200, encoding="utf-8")
+    assert reconcile._partition_count({}, [str(tmp_path / "a.csv")]) == 5
+    assert reconcile._partition_count({"partitions": 9}, [str(tmp_path / "a.csv")]) == 9
+
+
+def test_process_pool_spill_matches_single_pass(monkeypatch, etl_profile):
+    monkeypatch.setattr(parallel, "MIN_RANGE_BYTES", 2048)
+    source = "id,v,updated_at\n" + "".join(f"{i},{i % 17},2026-01-01T00:00:00Z\n" for i in range(3000))
+    target = "id,v,updated_at\n" + "".join(f"{i},{i % 19},2026-01-01T00:00:00Z\n" for i in range(100, 3100))
+    etl_profile(source, target, reconciliation={"partitions": 4}, chunk_rows=200)
+    single = _key_check(engine.run_etl_profile("p"))
+    etl_profile(source, target, reconciliation={"partitions": 4}, chunk_rows=200, workers=2)
+    assert _key_check(engine.run_etl_profile("p")) == single
+    assert single["detail"].startswith("missing=100, extra=100, ")
@@ -0,0 +1,111 @@
+import pickle
+
+import pytest
+
+from app.etl import columnar, engine, parallel
+from app.etl.rules import ExprRule, PyColumns, RuleSet, RuleSyntaxError, compile_expression
+
+DATA = (
+    "id,amount,limit,status,email,shipped_at,ordered_at\n"
+    "1,10,20,paid,a@x.io,2026-01-02T00:00:00Z,2026-01-01T00:00:00Z\n"
+    "2,-5,20,pending,bad-email,,2026-01-01T00:00:00Z\n"
+    "3,30,20,refunded,c@x.io,2025-12-31T00:00:00Z,2026-01-01T00:00:00Z\n"
+    "4,abc,,PAID,,2026-01-03T00:00:00Z,2026-01-03T00:00:00Z\n"
+    "5, 7 ,7,paid,e@x.io,2026-01-05T00:00:00Z,2026-01-04T00:00:00Z\n"
+    "6\n"
+)
+
+FRESHNESS = {"timestamp_column": "ordered_at", "max_latency_minutes": 10_000_000}
+RULES = [
+    {"name": "amount_ok", "expr": "amount >= 0 and amount <= limit"},
+    {"name": "status_known", "expr": "status in ('paid', 'pending')"},
+    {"name": "email_shape", "expr": "email is null or email matches '^[^@]+@[^@]+$'"},
+    {"name": "ships_after_order", "expr": "shipped_at is null or shipped_at >= ordered_at"},
+    {"name": "not_refunded", "expr": "not (status == 'refunded') and id not in (99, 100)"},
+    {"column": "amount", "op": "gte", "value": 0},
+]
+
+
+def _violations(expr, cols):
+    n = len(next(iter(cols.values())))
+    ctx = PyColumns(n, cols)
+    return ctx.count_false(compile_expression(expr).predicate(ctx))
+
+
+@pytest.mark.parametrize(
+    "expr, violations",
+    [
+        ("a > 1", 2),  # 1, and the unparseable 'x'
+        ("a != 1", 2),  # 'x' is not a number, so even != is false
+        ("1 < a", 2),  # literal on the left is flipped
+        ("b == 'q'", 1),
+        ("b = 'q'", 1),
+        ("a in (1, 2.0)", 1),
+        ("b not in ('q')", 3),  # a blank b is null, and a null is never 'not in' anything
+        ("b is null", 2),
+        ("b is not null", 1),
+        ("a == b or a == `c`", 1),  # numbers when both parse, text otherwise
+        ("not a is null and (b matches '^q$' or a >= 2)", 0),
+        ("a matches '^\\d$'", 1),  # regex escapes survive string unquoting
+        ("b != 'it\\'s'", 1),
+        ("1 == 1", 0),
+        ("'a' == 1", 3),
+    ],
+)
+def test_expression_operators(expr, violations):
+    cols = {"a": ["1", "2", "x"], "b": ["q", " ", "q"], "c": ["0", "2", "x"]}
+    assert _violations(expr, cols) == violations
+
+
+@pytest.mark.parametrize(
+    "expr",
+    ["", "a >", "a in ()", "a in (b)", "(a > 1", "a > 1 b", "a matches '['", "a is 1", "a not > 1", "a @ 1", "a"],
+)
+def test_syntax_errors(expr):
+    with pytest.raises(RuleSyntaxError):
+        compile_expression(expr)
+
+
+def test_compiled_once_and_columns_collected():
+    e = compile_expression("x > y or z is null and x in (1)")
+    assert compile_expression("x > y or z is null and x in (1)") is e
+    assert e.columns == ["x", "y", "z"]
+
+
+def test_rule_set_pickles_and_merges():
+    rules = RuleSet([ExprRule({"expr": "a > 1"}), ExprRule({"name": "b", "expr": "a < 3"})])
+    rules.update(3, {"a": ("1", "2", "3")})
+    clone = pickle.loads(pickle.dumps(rules))
+    rules.merge(clone)
+    assert [(r.name, r.violations) for r in rules.rules] == [("a > 1", 2), ("b", 2)]
+
+
+@pytest.mark.parametrize("eng", ["streaming", "columnar"])
+def test_expression_rules_match_in_memory_engine(eng, etl_profile, strip_report):
+    etl_profile(DATA, DATA, business_rules=RULES, freshness=FRESHNESS)
+    expected = strip_report(engine.run_etl_profile("p", engine="memory"))
+    details = {c["name"]: c["detail"] for c in expected["checks"]}
+    assert details["business_rule_target_amount_ok"] == "violations=4, expr=amount >= 0 and amount <= limit"
+    assert details["business_rule_target_status_known"].startswith("violations=3,")
+    assert details["business_rule_target_email_shape"].startswith("violations=1,")
+    assert details["business_rule_target_ships_after_order"].startswith("violations=1,")
+    assert details["business_rule_target_not_refunded"].startswith("violations=1,")
+    assert details["business_rule_target_rule_amount_gte_0"] == "violations=3, op=gte, value=0"
+    assert strip_report(engine.run_etl_profile("p", engine=eng)) == expected
+
+
+@pytest.mark.skipif(not columnar.available(), reason="numpy not installed")
+def test_expression_rules_across_parallel_workers(monkeypatch, etl_profile, strip_report):
+    monkeypatch.setattr(parallel, "MIN_RANGE_BYTES", 256)
+    rows = DATA + "".join(f"{i},{i % 40 - 5},30,{'paid' if i % 3 else 'void'},u{i}@x.io,,2026-01-01T00:00:00Z\n" for i in range(7, 400))
+    etl_profile(rows, rows, business_rules=RULES, freshness=FRESHNESS)
+    expected = strip_report(engine.run_etl_profile("p", engine="memory"))
+    etl_profile(rows, rows, business_rules=RULES, freshness=FRESHNESS, workers=2, chunk_rows=64)
+    assert strip_report(engine.run_etl_profile("p", engine="columnar")) == expected
+    assert strip_report(engine.run_etl_profile("p", engine="streaming")) == expected
+
+
+def test_invalid_expression_fails_the_run(etl_profile):
+    etl_profile(DATA, DATA, business_rules=[{"expr": "amount >"}], freshness=FRESHNESS)
+    with pytest.raises(RuleSyntaxError):
+        engine.run_etl_profile("p", engine="streaming")
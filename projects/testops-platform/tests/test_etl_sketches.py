@@ -0,0 +1,127 @@
+import random
+
+import pytest
+
+from app.etl import columnar, engine, parallel
+from app.etl.sketches import BloomFilter, HyperLogLog, key_hash
+from app.etl.streaming import SketchDuplicateKeys, aggregate_file
+
+
+def _rows(n, seed=3):
+    rnd = random.Random(seed)
+    out = ["id,region,amount,updated_at\n"]
+    for i in range(n):
+        key = rnd.randrange(n * 4)  # some keys repeat, most do not
+        out.append(f"{key},r{key % 3},{i % 90},2026-01-01T00:00:00Z\n")
+    out.append("7\n")  # short row: key without the other columns
+    return "".join(out)
+
+
+def _dup_check(report):
+    return next(c for c in report["checks"] if c["name"] == "duplicate_check_target")
+
+
+@pytest.mark.parametrize("eng", ["streaming", "columnar"])
+def test_sketch_mode_reports_exact_duplicate_count(eng, etl_profile):
+    data = _rows(3000)
+    etl_profile(data, data, key_columns=["id", "region"])
+    exact = _dup_check(engine.run_etl_profile("p", engine="memory"))
+    # A tiny, overfilled filter produces plenty of false-positive candidates; the second pass removes them.
+    etl_profile(data, data, key_columns=["id", "region"],
+                duplicates={"mode": "sketch", "expected_keys": 500, "false_positive_rate": 0.05})
+    sketch = _dup_check(engine.run_etl_profile("p", engine=eng))
+    assert sketch["status"] == exact["status"] == "FAIL"
+    assert sketch["detail"].startswith(exact["detail"] + ", distinct keys~")
+
+
+@pytest.mark.parametrize("eng", ["streaming", "columnar"])
+def test_sketch_merge_across_worker_ranges(monkeypatch, eng, etl_profile):
+    monkeypatch.setattr(parallel, "MIN_RANGE_BYTES", 2048)
+    data = _rows(4000, seed=11)
+    etl_profile(data, data)
+    exact = _dup_check(engine.run_etl_profile("p", engine="memory"))["detail"]
+    etl_profile(data, data, workers=2, chunk_rows=256, duplicates={"mode": "sketch", "expected_keys": 10_000})
+    assert _dup_check(engine.run_etl_profile("p", engine=eng))["detail"].startswith(exact + ",")
+
+
+@pytest.mark.skipif(not columnar.arrow_available(), reason="pyarrow not installed")
+def test_vectorized_key_hash_is_stable_and_length_aware():
+    import pyarrow as pa
+
+    keys = pa.array(["a", "\x00a", "", "a", "ab" * 40])
+    h1, h2 = columnar._hash_pair(keys)
+    assert h1[0] == h1[3] and len(set(h1.tolist())) == 4
+    assert (h2 & 1).all()
+    sliced = columnar._hash_pair(keys.slice(3))
+    assert sliced[0].tolist() == h1[3:].tolist()
+
+
+def test_unique_keys_need_no_second_pass():
+    agg = SketchDuplicateKeys(["id"], 0.001, 10_000, 0.02)
+    agg.update(2000, {"id": [str(i) for i in range(2000)]})
+    assert not agg.needs_verify and agg.duplicate_keys == 0
+    assert abs(agg.distinct_keys - 2000) <= 2000 * 0.06
+
+
+def test_hyperloglog_error_bound():
+    hll = HyperLogLog(0.01)
+    for i in range(200_000):
+        hll.add(key_hash((str(i),))[0])
+    assert hll.p == 14
+    assert abs(hll.count() - 200_000) <= 200_000 * 3 * hll.error
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    keys = [key_hash((str(i),)) for i in range(1000)]
+    assert not any(bloom.add(*h) for h in keys[:10])
+    for h in keys:
+        bloom.add(*h)
+    assert all(h in bloom for h in keys)
+    false_hits = sum(key_hash((f"x{i}",)) in bloom for i in range(5000))
+    assert false_hits < 5000 * 0.03
+
+
+def test_unknown_duplicates_mode(etl_profile):
+    etl_profile("id\n1\n", "id\n1\n", duplicates={"mode": "guess"})
+    with pytest.raises(ValueError, match="duplicates mode"):
+        engine.run_etl_profile("p")
+
+
+def test_filter_is_sized_from_the_input_unless_configured(tmp_path):
+    path = tmp_path / "t.csv"
+    path.write_text(_rows(5000), encoding="utf-8")
+    sized = parallel.aggregate_parallel(aggregate_file, path, {"key_columns": ["id"], "duplicates": {"mode": "sketch"}})
+    assert 5000 <= sized.dups.bloom.expected <= 5000 * 1.5
+
+    configured = {"key_columns": ["id"], "duplicates": {"mode": "sketch", "expected_keys": 200_000}}
+    assert parallel.aggregate_parallel(aggregate_file, path, configured).dups.bloom.expected == 200_000
+
+
+def test_row_estimate_extrapolates_from_a_sample(monkeypatch, tmp_path):
+    path = tmp_path / "rows.csv"
+    path.write_text("x" * 99 + "\n" + "".join(f"{i:09d}\n" for i in range(1000)), encoding="utf-8")
+    assert parallel.estimate_rows(path, 100, path.stat().st_size) == 1000
+    monkeypatch.setattr(parallel, "SAMPLE_BYTES", 95)
+    assert parallel.estimate_rows(path, 100, path.stat().st_size) == 1000  # 9 whole rows in the first 90 bytes
+    assert parallel.estimate_rows(path, 100, 100) == 0
+
+
+def test_overfilled_filter_warns(etl_profile, caplog):
+    data = _rows(3000)
+    etl_profile(data, data, duplicates={"mode": "sketch", "expected_keys": 100})
+    with caplog.at_level("WARNING", logger="app.etl.engine"):
+        detail = _dup_check(engine.run_etl_profile("p"))["detail"]
+    assert "filter overfilled" in detail
+    assert "set duplicates.expected_keys higher" in caplog.text
+
+    caplog.clear()
+    etl_profile(data, data, duplicates={"mode": "sketch"})
+    with caplog.at_level("WARNING", logger="app.etl.engine"):
+        assert "overfilled" not in _dup_check(engine.run_etl_profile("p"))["detail"]
+    assert "expected_keys" not in caplog.text
+
+
+def test_filters_of_different_sizes_do_not_combine():
+    with pytest.raises(ValueError, match="Cannot combine"):
+        BloomFilter(1000, 0.01).combine(BloomFilter(5000, 0.01), int.__or__)
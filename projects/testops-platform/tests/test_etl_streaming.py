@@ -0,0 +1,39 @@
+import pytest
+
+from app.etl import engine
+
+TARGET = (
+    "id,amount,updated_at,note\n"
+    "1,10,2026-01-01T00:00:00Z,a\n"
+    "\n"
+    "2,,2026-01-02T00:00:00+00:00,\"multi\nline\"\n"
+    "2,-5,,x\n"
+    " ,abc,2026-01-01T12:00:00Z,y\n"
+    "3,150\n"
+    "3,99.5,2025-12-31T00:00:00Z,z,extra\n"
+)
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 50_000])
+def test_streaming_report_matches_in_memory_engine(chunk_rows, etl_profile, strip_report):
+    etl_profile("id,amount\n1,1\n2,2\n", TARGET, chunk_rows=chunk_rows)
+    memory = engine.run_etl_profile("p", engine="memory")
+    streaming = engine.run_etl_profile("p")
+    assert strip_report(streaming) == strip_report(memory)
+    assert strip_report(engine.run_etl_profile("p", engine="columnar")) == strip_report(memory)
+    details = {c["name"]: c["detail"] for c in streaming["checks"]}
+    assert details["duplicate_check_target"].startswith("duplicate keys=2")
+    assert streaming["summary"]["target_rows"] == 6
+
+
+def test_streaming_handles_empty_target(etl_profile, strip_report):
+    etl_profile("id,amount\n", "id,amount,updated_at\n")
+    memory = strip_report(engine.run_etl_profile("p", engine="memory"))
+    assert strip_report(engine.run_etl_profile("p")) == memory
+    assert strip_report(engine.run_etl_profile("p", engine="columnar")) == memory
+
+
+def test_unknown_engine_rejected(etl_profile):
+    etl_profile("id\n1\n", "id\n1\n")
+    with pytest.raises(ValueError):
+        engine.run_etl_profile("p", engine="gpu")
@@ -0,0 +1,120 @@
+import contextlib
+import json
+import threading
+import time
+
+import pytest
+
+from app.features.functional import service
+from app.features.functional.worker_pool import BrowserWorkerPool
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.connected = False
+
+
+def test_pool_keeps_browsers_warm_and_relaunches_dead_ones():
+    browsers = []
+
+    def launcher_factory():
+        def launch():
+            browsers.append(FakeBrowser())
+            return browsers[-1]
+        return launch
+
+    def runner(browser, wf):
+        if wf.get('crash'):
+            browser.connected = False
+        return {'ok': True, 'name': wf['name'], 'steps': [{'action': 'goto', 'ok': True, 'ms': 1.0}]}
+
+    pool = BrowserWorkerPool(size=1, launcher_factory=launcher_factory, runner=runner)
+    try:
+        for i in range(5):
+            assert pool.run({'name': f'wf{i}'}, timeout=5)['ok']
+        assert pool.stats()['launches'] == 1
+        pool.run({'name': 'crash', 'crash': True}, timeout=5)
+        pool.run({'name': 'after'}, timeout=5)
+        assert pool.stats() == {'size': 1, 'alive': 1, 'launches': 2, 'runs': 7}
+    finally:
+        pool.close()
+    assert all(not b.connected for b in browsers)
+
+
+def test_run_functional_heals_then_reports_step_timings(tmp_path, monkeypatch):
+    wf = tmp_path / 'login.json'
+    wf.write_text(json.dumps({'name': 'login', 'url': 'https://example.test', 'steps': [{'action': 'click', 'selector': '#bad'}]}))
+    seen = []
+
+    class FakePool:
+        size = 2
+
+        def run(self, workflow, timeout=None):
+            seen.append(workflow['steps'][0]['selector'])
+            if len(seen) == 1:
+                return {'ok': False, 'error': 'locator not found', 'steps': []}
+            return {'ok': True, 'durationMs': 12, 'steps': [{'action': 'goto', 'ok': True, 'ms': 8.0}, {'action': 'click', 'ok': True, 'ms': 4.0}]}
+
+    recorded = []
+    monkeypatch.setattr(service, 'browser_pool', lambda size: contextlib.nullcontext(FakePool()))
+    monkeypatch.setattr(service, '_record_run', lambda r, notify: recorded.append(r['ok']))
+    monkeypatch.setattr(service, 'apply_selector_fallbacks', lambda p: str(tmp_path / 'login-healed.json'))
+    (tmp_path / 'login-healed.json').write_text(json.dumps({'name': 'login', 'url': 'https://example.test', 'steps': [{'action': 'click', 'selector': '#good'}]}))
+
+    f, missing = service.run_functional({'features': {'functional': {'workflows': [str(wf), str(tmp_path / 'missing.json')]}}})
+    assert f.status == 'PASS'
+    assert missing.status == 'ERROR'
+    assert seen == ['#bad', '#good']
+    assert f.details['healed'] is True and f.details['attempts'] == 2
+    assert [s['action'] for s in f.details['steps']] == ['goto', 'click']
+    assert recorded == [False, True]  # every attempt lands in the run history, like main.py --workflow
+
+
+def test_timed_out_run_gets_a_replacement_worker():
+    release = threading.Event()
+
+    def runner(browser, wf):
+        if wf['name'] == 'stuck':
+            release.wait(5)
+        return {'ok': True, 'name': wf['name']}
+
+    pool = BrowserWorkerPool(size=1, launcher_factory=lambda: FakeBrowser, runner=runner)
+    try:
+        with pytest.raises(TimeoutError):
+            pool.run({'name': 'stuck'}, timeout=0.1)
+        assert pool.run({'name': 'next'}, timeout=2)['ok']  # served by the replacement worker
+        release.set()
+        deadline = time.monotonic() + 2
+        while pool.stats()['alive'] != 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert pool.stats()['alive'] == 1
+    finally:
+        release.set()
+        pool.close()
+
+
+def test_replaced_pool_finishes_leased_runs(monkeypatch):
+    from app.features.functional import worker_pool
+
+    made = []
+
+    class Pool(BrowserWorkerPool):
+        def __init__(self, size, headless):
+            super().__init__(size=size, headless=headless, launcher_factory=lambda: FakeBrowser, runner=lambda b, wf: {'ok': True})
+            made.append(self)
+
+    monkeypatch.setattr(worker_pool, 'BrowserWorkerPool', Pool)
+    monkeypatch.setattr(worker_pool, '_POOL', None)
+    with worker_pool.browser_pool(size=1, headless=True) as old:
+        with worker_pool.browser_pool(size=2, headless=True):
+            pass
+        assert old.run({'name': 'still leased'}, timeout=2)['ok']
+    assert old.stats()['alive'] == 0
+    worker_pool.shutdown_browser_pool()
+    assert len(made) == 2
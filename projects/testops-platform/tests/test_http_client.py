@@ -0,0 +1,148 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fastapi.testclient import TestClient
+
+from app.api.server import app
+from app.core.http_client import PooledHttpClient
+
+
+class _Flaky(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    hits = {}
+    peers = set()
+    cookies = []
+
+    def _reply(self):
+        self.peers.add(self.client_address)
+        self.cookies.append(self.headers.get("Cookie"))
+        n = self.hits[self.path] = self.hits.get(self.path, 0) + 1
+        code = 200
+        if self.path == "/throttled" and n < 3:
+            code = 429
+        elif self.path == "/broken":
+            code = 500
+        elif self.path == "/sealed":
+            code = 503
+        elif self.path == "/maintenance" and n < 2:
+            code = 503
+        self.send_response(code)
+        if self.path == "/maintenance" and code == 503:
+            self.send_header("Retry-After", "0")
+        if self.path == "/login":
+            self.send_header("Set-Cookie", "JSESSIONID=abc; Path=/")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def do_GET(self):
+        self._reply()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._reply()
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+def _start():
+    _Flaky.hits, _Flaky.peers, _Flaky.cookies = {}, set(), []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Flaky)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_retries_429_and_keeps_connection_alive():
+    server, base = _start()
+    client = PooledHttpClient(backoff_base_s=0.01)
+    try:
+        r = client.get(base + "/throttled")
+        for _ in range(5):
+            client.get(base + "/ok")
+    finally:
+        server.shutdown()
+        client.close()
+    assert r.status_code == 200
+    assert _Flaky.hits["/throttled"] == 3
+    assert len(_Flaky.peers) == 1
+    m = client.metrics()[base]
+    assert m["requests"] == 8
+    assert m["retries"] == 2
+    assert m["status_counts"]["429"] == 2
+
+
+def test_5xx_retried_only_for_idempotent_methods():
+    server, base = _start()
+    client = PooledHttpClient(max_retries=2, backoff_base_s=0.01)
+    try:
+        assert client.post(base + "/broken", json={}).status_code == 500
+        posts = _Flaky.hits["/broken"]
+        assert client.get(base + "/broken").status_code == 500
+    finally:
+        server.shutdown()
+        client.close()
+    assert posts == 1
+    assert _Flaky.hits["/broken"] == 1 + 3
+
+
+def test_idempotency_key_opts_post_into_5xx_retries():
+    server, base = _start()
+    client = PooledHttpClient(max_retries=2, backoff_base_s=0.01)
+    try:
+        assert client.post(base + "/broken", json={}, headers={"Idempotency-Key": "run-42"}).status_code == 500
+        keyed = _Flaky.hits["/broken"]
+        assert client.post(base + "/broken", json={}, idempotent=True).status_code == 500
+    finally:
+        server.shutdown()
+        client.close()
+    assert keyed == 3
+    assert _Flaky.hits["/broken"] == 6
+
+
+def test_post_retries_429_and_503_with_retry_after_only():
+    server, base = _start()
+    client = PooledHttpClient(backoff_base_s=0.01)
+    try:
+        assert client.post(base + "/throttled", json={}).status_code == 200
+        assert client.post(base + "/maintenance", json={}).status_code == 200
+        assert client.post(base + "/sealed", json={}).status_code == 503  # no Retry-After: may have been processed
+    finally:
+        server.shutdown()
+        client.close()
+    assert _Flaky.hits == {"/throttled": 3, "/maintenance": 2, "/sealed": 1}
+    assert client.metrics()[base]["retries"] == 3
+
+
+def test_probes_are_not_retried():
+    server, base = _start()
+    client = PooledHttpClient(backoff_base_s=0.01)
+    try:
+        assert client.get(base + "/throttled", retry=False).status_code == 429
+        assert client.get(base + "/sealed", retry=False).status_code == 503
+    finally:
+        server.shutdown()
+        client.close()
+    assert _Flaky.hits == {"/throttled": 1, "/sealed": 1}
+    assert client.metrics()[base]["retries"] == 0
+
+
+def test_pooled_session_does_not_share_cookies():
+    server, base = _start()
+    client = PooledHttpClient()
+    try:
+        assert client.get(base + "/login").cookies["JSESSIONID"] == "abc"
+        client.get(base + "/ok")
+        client.get(base + "/ok", cookies={"mine": "1"})
+    finally:
+        server.shutdown()
+        client.close()
+    assert _Flaky.cookies == [None, None, "mine=1"]
+
+
+def test_http_metrics_endpoint():
+    c = TestClient(app)
+    r = c.get("/v3.1/http/metrics", headers={"X-API-Key": "viewer-token"})
+    assert r.status_code == 200
+    assert "hosts" in r.json()
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.server import app
+from app.core import orchestrator
+from app.jobs import JobManager, JobNotCancellable, JobQueueFull, cancellation_requested, jobs, run_subprocess
+
+OP = {'X-API-Key': 'operator-token'}
+V = {'X-API-Key': 'viewer-token'}
+
+
+def test_soak_job_submit_poll_and_stream():
+    c = TestClient(app)
+    r = c.post('/wave4/performance/soak?wait=false', headers=OP, json={'duration_seconds': 1, 'interval_ms': 10, 'jitter_ms': 1})
+    assert r.status_code == 202
+    job_id = r.json()['job_id']
+
+    with c.stream('GET', f'/jobs/{job_id}/events', headers=V) as s:
+        events = [line for line in s.iter_lines() if line.startswith('data: ')]
+    final = json.loads(events[-1][len('data: '):])
+    assert final['status'] == 'SUCCEEDED'
+    assert final['result']['sample_count'] > 0
+
+    got = c.get(f'/jobs/{job_id}', headers=V)
+    assert got.json()['status'] == 'SUCCEEDED'
+    assert any(j['id'] == job_id for j in c.get('/jobs', headers=V).json()['jobs'])
+
+
+def test_running_soak_job_can_be_cancelled():
+    c = TestClient(app)
+    job_id = c.post('/wave4/performance/soak?wait=false', headers=OP, json={'duration_seconds': 30, 'interval_ms': 20}).json()['job_id']
+    c.get(f'/jobs/{job_id}?wait_s=0.3', headers=V)
+    cancel = c.post(f'/jobs/{job_id}/cancel', headers=OP)
+    assert cancel.json()['cancel_requested'] is True
+    done = c.get(f'/jobs/{job_id}?wait_s=5', headers=V).json()
+    assert done['status'] == 'CANCELLED'
+    assert c.get('/jobs/job-missing', headers=V).status_code == 404
+
+
+def test_bounded_pool_and_queue():
+    mgr = JobManager(max_workers=1, max_pending=2)
+    gate = threading.Event()
+    seen = []
+
+    def blocker():
+        gate.wait(5)
+        seen.append(cancellation_requested())
+        return 'done'
+
+    first = mgr.submit('t', blocker)
+    queued = mgr.submit('t', lambda: 'never')
+    with pytest.raises(JobQueueFull):
+        mgr.submit('t', lambda: None)
+
+    assert mgr.cancel(queued.id).status == 'CANCELLED'
+    gate.set()
+    assert mgr.wait(first, timeout=5).status == 'SUCCEEDED'
+    assert first.result == 'done'
+    assert seen == [False]
+
+
+def test_cancel_is_reported_only_when_the_work_stopped():
+    mgr = JobManager(max_workers=2)
+    started = threading.Event()
+    gate = threading.Event()
+
+    def uninterruptible():
+        started.set()
+        gate.wait(5)
+        return 'finished'
+
+    def child():
+        started.set()
+        return run_subprocess([sys.executable, '-c', 'import time; time.sleep(30)']).returncode
+
+    plain = mgr.submit('t', uninterruptible)
+    started.wait(5)
+    mgr.cancel(plain.id)
+    gate.set()
+    assert mgr.wait(plain, timeout=5).status == 'SUCCEEDED'
+    assert plain.result == 'finished' and plain.as_dict()['cancel_requested'] is True
+
+    started.clear()
+    proc = mgr.submit('t', child)
+    started.wait(5)
+    t0 = time.monotonic()
+    mgr.cancel(proc.id)
+    assert mgr.wait(proc, timeout=10).status == 'CANCELLED'
+    assert time.monotonic() - t0 < 5
+    assert proc.result != 0  # killed
+
+
+def test_async_waiters_hold_no_thread_and_are_released():
+    mgr = JobManager(max_workers=1)
+    started, gate = threading.Event(), threading.Event()
+    job = mgr.submit('t', lambda: started.set() or gate.wait(5))
+    started.wait(5)
+
+    async def watch():
+        seen = job.version
+        assert await mgr.next_change(job, seen, timeout=0.05) == seen  # times out quietly
+        waiter = asyncio.create_task(mgr.next_change(job, seen))
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.wait_for(waiter, 5)
+
+    assert asyncio.run(watch()) > 0
+    mgr.wait(job, timeout=5)
+    assert mgr._async_waiters == {}
+
+
+def test_eviction_drops_the_oldest_finished_jobs_only():
+    mgr = JobManager(max_workers=2, max_jobs=3)
+    gate = threading.Event()
+    running = mgr.submit('t', lambda: gate.wait(5))
+    done = [mgr.submit('t', lambda i=i: i) for i in range(3)]
+    for j in done:
+        mgr.wait(j, timeout=5)
+    latest = mgr.submit('t', lambda: 'last')
+    mgr.wait(latest, timeout=5)
+    kept = [j['id'] for j in mgr.list()]
+    assert running.id in kept and latest.id in kept
+    assert done[0].id not in kept and done[1].id not in kept and len(kept) == 3
+    gate.set()
+
+
+def test_non_cancellable_jobs_refuse_cancel_once_running():
+    mgr = JobManager(max_workers=1)
+    started, gate = threading.Event(), threading.Event()
+    running = mgr.submit('etl_run', lambda: started.set() or gate.wait(5) and 'done', cancellable=False)
+    queued = mgr.submit('etl_run', lambda: 'never', cancellable=False)
+    started.wait(5)
+    with pytest.raises(JobNotCancellable):
+        mgr.cancel(running.id)
+    assert running.as_dict()['cancellable'] is False and not running.cancel_event.is_set()
+    assert mgr.cancel(queued.id).status == 'CANCELLED'
+    gate.set()
+    assert mgr.wait(running, timeout=5).status == 'SUCCEEDED'
+
+
+def test_cancel_endpoint_answers_409_for_a_running_single_etl_profile():
+    c = TestClient(app)
+    started, gate = threading.Event(), threading.Event()
+    job = jobs.submit('etl_run', lambda: started.set() or gate.wait(5), cancellable=False)
+    started.wait(5)
+    r = c.post(f'/jobs/{job.id}/cancel', headers=OP)
+    gate.set()
+    assert r.status_code == 409 and 'cannot be stopped' in r.json()['detail']
+    assert c.get(f'/jobs/{job.id}?wait_s=5', headers=V).json()['status'] == 'SUCCEEDED'
+
+
+@pytest.mark.parametrize('parallel', [True, False])
+def test_cancelled_suite_starts_and_waits_for_no_further_domain(monkeypatch, parallel):
+    monkeypatch.setattr(orchestrator, 'CANCEL_POLL_S', 0.02)
+    started, release = [], threading.Event()
+
+    def runner(domain):
+        def run(cfg):
+            started.append(domain)
+            release.wait(10)
+            return [domain]
+        return run
+
+    monkeypatch.setattr(orchestrator, '_domain_runner', runner)
+    cfg = {'features': {d: {'enabled': True} for d in orchestrator.DOMAIN_ORDER},
+           'execution': {'parallel': parallel, 'max_workers': 1}}
+    mgr = JobManager(max_workers=1)
+    job = mgr.submit('suite_run', lambda: orchestrator.run_domains(cfg))
+    while not started:
+        time.sleep(0.01)
+    t0 = time.monotonic()
+    mgr.cancel(job.id)
+    if not parallel:
+        release.set()  # a sequential run stops after the domain in progress
+    assert mgr.wait(job, timeout=5).status == 'CANCELLED'
+    assert time.monotonic() - t0 < 2
+    assert job.result == ({} if parallel else {'functional': ['functional']})
+    release.set()
+    time.sleep(0.05)
+    assert started == ['functional']
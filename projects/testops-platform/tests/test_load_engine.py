@@ -0,0 +1,109 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.core.deadline import DeadlineExceeded, deadline
+from app.features.non_functional.load import LatencyHistogram, LoadProfile, run_load
+from app.features.non_functional.service import run_non_functional
+
+
+class _Stub(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    peers = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.peers.add(self.client_address)
+        code = 500 if self.path.startswith("/fail") else 302 if self.path == "/old" else 200
+        self.send_response(code)
+        if code == 302:
+            self.send_header("Location", "/ok")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args, **kwargs):
+        return
+
+
+def _start():
+    _Stub.peers = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def test_histogram_percentiles_within_error_bound():
+    h = LatencyHistogram(significant_digits=2)
+    for v in range(1, 100_001):
+        h.record(v)
+    assert abs(h.percentile_us(50) - 50_000) / 50_000 < 0.01
+    assert abs(h.percentile_us(99) - 99_000) / 99_000 < 0.01
+    assert h.percentile_us(100) == 100_000
+    assert len(h.counts) < 1500
+
+
+def test_closed_loop_reuses_pooled_connections():
+    server, base = _start()
+    try:
+        result = run_load(LoadProfile(url=base + "/ok", requests=40, concurrency=4))
+    finally:
+        server.shutdown()
+    d = result.as_dict()
+    assert d["requests"] == 40
+    assert d["errors"] == 0
+    assert d["latency_ms"]["p99"] >= d["latency_ms"]["p50"]
+    assert len(_Stub.peers) <= 4
+
+
+def test_light_load_check_uses_rate_and_error_budget():
+    server, base = _start()
+    cfg = {"features": {"non_functional": {"checks": [
+        {"id": "ok_load", "type": "light_load", "url": base + "/ok", "rate_per_s": 50, "duration_s": 0.3, "concurrency": 2, "max_p99_ms": 2000},
+        {"id": "bad_load", "type": "light_load", "url": base + "/fail", "requests": 5},
+    ]}}}
+    try:
+        ok, bad = run_non_functional(cfg)
+    finally:
+        server.shutdown()
+    assert ok.status == "PASS"
+    assert 5 <= ok.details["requests"] <= 20
+    assert bad.status == "FAIL"
+    assert bad.details["error_rate"] == 1.0
+    assert bad.details["status_counts"] == {"500": 5}
+
+
+def test_redirects_are_followed_and_async_callers_are_supported():
+    server, base = _start()
+
+    async def _from_running_loop():
+        return run_load(LoadProfile(url=base + "/old", requests=6, concurrency=2))
+
+    try:
+        d = asyncio.run(_from_running_loop()).as_dict()
+    finally:
+        server.shutdown()
+    assert d["requests"] == 6
+    assert d["errors"] == 0
+    assert d["status_counts"] == {"200": 6}
+
+
+def test_load_run_and_later_checks_stop_at_the_domain_deadline():
+    server, base = _start()
+    cfg = {"features": {"non_functional": {"checks": [
+        {"id": "long_load", "type": "light_load", "url": base + "/ok", "rate_per_s": 20, "duration_s": 30},
+        {"id": "sla", "type": "http_sla", "url": base + "/ok"},
+    ]}}}
+    t0 = time.monotonic()
+    try:
+        with deadline(time.monotonic() + 0.3), pytest.raises(DeadlineExceeded, match="load run"):
+            run_non_functional(cfg)
+        assert time.monotonic() - t0 < 2
+        with deadline(time.monotonic() - 1), pytest.raises(DeadlineExceeded):
+            run_non_functional({"features": {"non_functional": {"checks": cfg["features"]["non_functional"]["checks"][1:]}}})
+    finally:
+        server.shutdown()
@@ -0,0 +1,44 @@
+from fastapi.testclient import TestClient
+
+from app.api.server import app
+from app.state.logbus import logbus
+
+
+def test_ws_logs_pushes_filtered_events():
+    c = TestClient(app)
+    with c.websocket_connect('/ws/logs?level=error&msg=logbus-test') as ws:
+        first = ws.receive_json()
+        assert first['replay'] is True
+        logbus.push('info', 'logbus-test-ignored')
+        ev = logbus.push('error', 'logbus-test-pushed', {'n': 1})
+        got = ws.receive_json()
+        assert [e['seq'] for e in got['events']] == [ev['seq']]
+        assert got['events'][0]['data'] == {'n': 1}
+    assert logbus.subscriber_count == 0
+
+
+def test_ws_logs_resume_from_sequence():
+    start = logbus.push('info', 'resume-a')['seq']
+    logbus.push('info', 'resume-b')
+    logbus.push('warn', 'resume-c')
+    c = TestClient(app)
+    with c.websocket_connect(f'/ws/logs?since={start}&msg=resume-') as ws:
+        first = ws.receive_json()
+    assert [e['msg'] for e in first['events']] == ['resume-b', 'resume-c']
+    assert first['gap'] is False
+
+
+def test_slow_subscriber_drops_oldest_and_counts():
+    import asyncio
+
+    async def run():
+        sub, _ = logbus.subscribe(msg='slow-sub', maxsize=2)
+        with sub:
+            for i in range(4):
+                logbus.push('info', 'slow-sub', {'i': i})
+            await asyncio.sleep(0)
+            return [e['data']['i'] for e in sub.drain()], sub.dropped
+
+    kept, dropped = asyncio.run(run())
+    assert kept == [2, 3]
+    assert dropped == 2
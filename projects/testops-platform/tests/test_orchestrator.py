@@ -0,0 +1,134 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from app.core import orchestrator
+from app.core.deadline import DeadlineExceeded, run_bounded
+from app.core.models import Finding
+
+
+def _cfg(tmp_path, **execution):
+    return {
+        "execution": execution,
+        "features": {
+            "functional": {"enabled": True},
+            "non_functional": {"enabled": True, "checks": [{"type": "http_sla"}]},
+            "security": {"enabled": True},
+        },
+        "reporting": {"out_dir": str(tmp_path)},
+    }
+
+
+def _patch_domains(monkeypatch, delays):
+    def make(domain):
+        def run(cfg):
+            time.sleep(delays[domain])
+            return [Finding(domain, f"{domain}_check", "high", "PASS", "ok")]
+        return run
+
+    monkeypatch.setattr(orchestrator, "run_functional", make("functional"))
+    monkeypatch.setattr(orchestrator, "run_non_functional", make("non_functional"))
+    monkeypatch.setattr(orchestrator, "run_security", make("security"))
+
+
+def test_domains_run_concurrently_in_stable_order(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 0.3, "non_functional": 0.1, "security": 0.2})
+    t0 = time.monotonic()
+    findings, report = orchestrator.run_product_suite(_cfg(tmp_path))
+    elapsed = time.monotonic() - t0
+
+    assert elapsed < 0.55
+    assert [f.domain for f in findings[:3]] == ["functional", "non_functional", "security"]
+    assert all(f.domain == "quality_governance" for f in findings[3:])
+    security_gate = next(f for f in findings if f.check_id == "security_gate")
+    assert security_gate.status == "PASS"
+    assert report["counts"]["fail"] == 0
+
+
+def test_domain_timeout_becomes_error_finding(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 0.0, "non_functional": 0.0, "security": 2.0})
+    cfg = _cfg(tmp_path)
+    cfg["features"]["security"]["timeout_s"] = 0.2
+    t0 = time.monotonic()
+    findings, _ = orchestrator.run_product_suite(cfg)
+
+    assert time.monotonic() - t0 < 1.5
+    sec = [f for f in findings if f.domain == "security"]
+    assert sec[0].check_id == "security_timeout"
+    assert sec[0].status == "ERROR"
+    assert next(f for f in findings if f.check_id == "security_gate").status == "FAIL"
+
+
+def test_timed_out_domain_gives_its_slot_back(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 3.0, "non_functional": 0.0, "security": 0.0})
+    cfg = _cfg(tmp_path, max_workers=1)
+    cfg["features"]["functional"]["timeout_s"] = 0.3
+    t0 = time.monotonic()
+    findings, _ = orchestrator.run_product_suite(cfg)
+
+    # functional ignores its deadline and keeps running, but the others no longer wait for it to end
+    assert time.monotonic() - t0 < 1.5
+    assert [(f.domain, f.status) for f in findings[:3]] == [("functional", "ERROR"), ("non_functional", "PASS"), ("security", "PASS")]
+
+
+def test_sequential_mode_isolates_domain_errors(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 0.0, "non_functional": 0.0, "security": 0.0})
+
+    def boom(cfg):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(orchestrator, "run_non_functional", boom)
+    findings, _ = orchestrator.run_product_suite(_cfg(tmp_path, parallel=False))
+    nf = [f for f in findings if f.domain == "non_functional"]
+    assert nf[0].status == "ERROR"
+    assert "boom" in nf[0].summary
+
+
+@pytest.mark.parametrize("parallel", [True, False])
+def test_timed_out_domain_subprocess_is_killed(monkeypatch, tmp_path, parallel):
+    _patch_domains(monkeypatch, {"functional": 0.0, "non_functional": 0.0, "security": 0.0})
+    stopped = threading.Event()
+
+    def slow_scan(cfg):
+        try:
+            run_bounded([sys.executable, "-c", "import time; time.sleep(30)"])
+        except DeadlineExceeded:
+            stopped.set()
+            raise
+
+    monkeypatch.setattr(orchestrator, "run_security", slow_scan)
+    cfg = _cfg(tmp_path, parallel=parallel)
+    cfg["features"]["security"]["timeout_s"] = 0.3
+    t0 = time.monotonic()
+    findings, _ = orchestrator.run_product_suite(cfg)
+
+    assert stopped.wait(5)
+    assert time.monotonic() - t0 < 5
+    sec = next(f for f in findings if f.domain == "security")
+    assert sec.check_id == "security_timeout"
+    assert "killed" in sec.summary
+
+
+def test_failed_run_leaves_no_partial_report(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 0.0, "non_functional": 0.0, "security": 0.0})
+
+    def broken_governance(cfg, statuses):
+        raise RuntimeError("governance down")
+
+    monkeypatch.setattr(orchestrator, "evaluate_best_practices", broken_governance)
+    with pytest.raises(RuntimeError, match="governance down"):
+        orchestrator.run_product_suite(_cfg(tmp_path, parallel=False))
+    assert not list(tmp_path.iterdir())
+
+
+def test_governance_uses_status_counts_without_collecting(monkeypatch, tmp_path):
+    _patch_domains(monkeypatch, {"functional": 0.0, "non_functional": 0.0, "security": 0.0})
+    monkeypatch.setattr(orchestrator, "run_security", lambda cfg: [Finding("security", "secq", "critical", "FAIL", "leak")] * 3)
+    findings, report = orchestrator.run_product_suite(_cfg(tmp_path, parallel=False), collect=False)
+
+    assert findings == []
+    assert report["counts"] == {"total": 8, "pass": 4, "fail": 4, "error": 0}
+    summary = (tmp_path / "summary.json").read_text()
+    assert '"security_fail_count": 3' in summary
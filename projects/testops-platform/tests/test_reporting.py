@@ -0,0 +1,41 @@
+import gzip
+import json
+from dataclasses import asdict
+
+from app.core.models import Finding
+from app.reporting.reporters import StreamingReportWriter, write_reports
+
+
+def _findings():
+    return [
+        Finding("functional", "wf1", "high", "PASS", "ok", {"attempts": 1}),
+        Finding("security", "secq", "critical", "FAIL", "blocked <b>", {"total": 3}),
+        Finding("non_functional", "sla", "medium", "ERROR", "timeout"),
+        Finding("quality_governance", "nf_sla_present", "medium", "INFO", "note"),
+    ]
+
+
+def test_write_reports_streams_same_json_and_counts(tmp_path):
+    findings = _findings()
+    report = write_reports(findings, str(tmp_path))
+
+    assert (tmp_path / "summary.json").read_text() == json.dumps([asdict(f) for f in findings], indent=2)
+    assert report["counts"] == {"total": 4, "pass": 1, "fail": 1, "error": 1}
+    html = (tmp_path / "summary.html").read_text()
+    assert "<b>Total:</b> 4 | <b>Pass:</b> 1 | <b>Fail:</b> 1 | <b>Error:</b> 1" in html
+    assert html.index("<b>Total:</b>") < html.index("wf1") < html.index("secq")
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_empty_report_and_gzip_ndjson(tmp_path):
+    empty = write_reports([], str(tmp_path / "empty"))
+    assert json.loads((tmp_path / "empty" / "summary.json").read_text()) == []
+    assert empty["counts"]["total"] == 0
+
+    w = StreamingReportWriter(str(tmp_path), gzip_output=True)
+    for f in _findings():
+        w.add(f)
+    report = w.close()
+    with gzip.open(report["ndjson"], "rt") as fh:
+        rows = [json.loads(line) for line in fh]
+    assert [r["check_id"] for r in rows] == ["wf1", "secq", "sla", "nf_sla_present"]
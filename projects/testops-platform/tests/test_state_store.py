@@ -0,0 +1,67 @@
+import json
+import threading
+
+from app.state.store import RunStateStore, import_legacy_json
+
+
+def test_append_latest_and_prune(tmp_path):
+    store = RunStateStore(tmp_path / "state.db")
+    for i in range(5):
+        store.append("reports", {"n": i}, keep=3)
+    assert store.count("reports") == 3
+    assert [r["n"] for r in store.latest("reports", 2)] == [4, 3]
+    assert [r["n"] for r in store.items("reports")] == [2, 3, 4]
+
+
+def test_concurrent_updates_do_not_lose_writes(tmp_path):
+    store = RunStateStore(tmp_path / "state.db")
+
+    def bump(row):
+        row["runs"] += 1
+        return row
+
+    def worker():
+        for _ in range(25):
+            store.update("flaky", "TC-1", bump, default={"runs": 0})
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert store.get("flaky", "TC-1")["runs"] == 100
+    assert store.update("flaky", "missing", bump) is None
+
+
+def test_next_id_and_legacy_import(tmp_path):
+    legacy = tmp_path / "approvals.json"
+    legacy.write_text(json.dumps([{"id": "apr-1", "status": "PENDING"}, {"id": "apr-2", "status": "APPROVED"}]))
+    flaky = tmp_path / "flaky.json"
+    flaky.write_text(json.dumps({"TC-9": {"runs": 5, "fails": 2, "quarantined": True}}))
+    sources = {
+        "wave2.approvals": (str(legacy), "id", "apr"),
+        "wave32.flaky": (str(flaky), "__key__", None),
+        "v31.audit": (str(tmp_path / "absent.json"), None, None),
+    }
+    store = RunStateStore(tmp_path / "state.db")
+
+    out = import_legacy_json(store, sources)
+    assert out["wave2.approvals"] == {"status": "imported", "rows": 2}
+    assert out["v31.audit"]["status"] == "missing"
+    assert store.get("wave2.approvals", "apr-2")["status"] == "APPROVED"
+    assert store.get("wave32.flaky", "TC-9")["runs"] == 5
+    assert store.next_id("wave2.approvals", "apr") == "apr-3"
+
+    again = import_legacy_json(store, sources)
+    assert again["wave2.approvals"]["status"] == "skipped"
+    assert store.count("wave2.approvals") == 2
+
+
+def test_legacy_import_reports_rows_actually_inserted(tmp_path):
+    legacy = tmp_path / "approvals.json"
+    legacy.write_text(json.dumps([{"id": "apr-1", "status": "PENDING"}, {"id": "apr-1", "status": "APPROVED"}, {"id": "apr-2"}]))
+    store = RunStateStore(tmp_path / "state.db")
+    out = import_legacy_json(store, {"wave2.approvals": (str(legacy), "id", "apr")})
+    assert out["wave2.approvals"] == {"status": "imported", "rows": 2, "duplicates_ignored": 1}
+    assert store.count("wave2.approvals") == 2
+    assert store.get("wave2.approvals", "apr-1")["status"] == "PENDING"
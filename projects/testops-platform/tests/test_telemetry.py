@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from app.v3.observability.telemetry import TelemetryRegistry, instrument, snapshot
+from app.v31.observability.exporters import prometheus_text
+
+
+def test_histogram_exposition_has_cumulative_buckets_sum_and_count():
+    reg = TelemetryRegistry()
+    h = reg.histogram("job_ms", "job duration", ["kind"], buckets=(10, 100))
+    c = reg.counter("jobs_total", "jobs", ["kind"])
+    for v in (5, 10, 50, 500):
+        h.observe(v, kind='etl')
+        c.inc(kind='etl')
+
+    text = prometheus_text(reg)
+    assert 'job_ms_bucket{kind="etl",le="10"} 2' in text
+    assert 'job_ms_bucket{kind="etl",le="100"} 3' in text
+    assert 'job_ms_bucket{kind="etl",le="+Inf"} 4' in text
+    assert 'job_ms_sum{kind="etl"} 565' in text
+    assert 'job_ms_count{kind="etl"} 4' in text
+    assert 'jobs_total{kind="etl"} 4' in text
+    assert '# TYPE job_ms histogram' in text
+    [(_, data)] = h.series()
+    assert h.quantile(0.5, data) == 10
+    assert h.quantile(0.99, data) == 100
+
+    with pytest.raises(ValueError):
+        c.inc(other='x')
+
+
+def test_series_are_bounded_and_updates_thread_safe():
+    reg = TelemetryRegistry()
+    h = reg.histogram("h_ms", "h", ["k"], buckets=(1,))
+    h.max_series = 3
+    for i in range(10):
+        h.observe(0.5, k=str(i))
+    assert len(h.series()) == 4  # three real series plus the overflow bucket
+
+    c = reg.counter("c_total", "c")
+    threads = [threading.Thread(target=lambda: [c.inc() for _ in range(1000)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert c.value() == 8000
+
+
+def test_instrument_records_per_name():
+    @instrument("test_telemetry_ok")
+    def ok():
+        return 1
+
+    @instrument("test_telemetry_boom")
+    def boom():
+        raise RuntimeError("x")
+
+    for _ in range(3):
+        ok()
+    with pytest.raises(RuntimeError):
+        boom()
+
+    s = snapshot()
+    assert s['instruments']['test_telemetry_ok']['runs'] == 3
+    assert s['instruments']['test_telemetry_boom']['failures'] == 1
+    assert 'testops_duration_ms_bucket{instrument="test_telemetry_ok",le="5"} 3' in prometheus_text()
@@ -126,8 +126,8 @@ def test_channels_send_native_slack_discord(monkeypatch):
 
         return R()
 
-    monkeypatch.setattr('app.channels.slack.requests.post', fake_post)
-    monkeypatch.setattr('app.channels.discord.requests.post', fake_post)
+    monkeypatch.setattr('app.channels.slack.http.post', fake_post)
+    monkeypatch.setattr('app.channels.discord.http.post', fake_post)
 
     s = c.post('/channels/send', headers=op, json={'channel': 'slack', 'chat_id': 'C1', 'text': 'hello'})
     assert s.status_code == 200
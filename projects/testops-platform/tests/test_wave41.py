@@ -41,7 +41,7 @@ def test_wave41_policy_opa_and_fallback(monkeypatch):
         return _Resp()
 
     monkeypatch.setenv('OPA_POLICY_URL', 'http://opa/v1/data/testops/allow')
-    monkeypatch.setattr('app.wave41.policy.adapter.requests.post', _ok_post)
+    monkeypatch.setattr('app.wave41.policy.adapter.http.post', _ok_post)
     opa = c.post('/wave4.1/policy/evaluate', headers=h, json={'counts': {'fail': 9, 'error': 1}})
     assert opa.status_code == 200
     assert opa.json()['adapter'] == 'opa'
@@ -61,7 +61,7 @@ def test_wave41_queue_and_teams_send(monkeypatch):
         status_code = 200
         text = '1'
 
-    monkeypatch.setattr('app.channels.teams.requests.post', lambda *args, **kwargs: _TeamsResp())
+    monkeypatch.setattr('app.channels.teams.http.post', lambda *args, **kwargs: _TeamsResp())
     monkeypatch.setenv('OPA_POLICY_URL', '')
 
     sent = c.post(
@@ -41,7 +41,7 @@ def test_wave5_alert_test_and_send(monkeypatch):
     class _Resp:
         status_code = 200
 
-    monkeypatch.setattr('app.wave5.alerts.requests.post', lambda *args, **kwargs: _Resp())
+    monkeypatch.setattr('app.wave5.alerts.http.post', lambda *args, **kwargs: _Resp())
     c = TestClient(app)
 
     t = c.post('/wave5/alerts/test', headers={"X-API-Key": "viewer-token"}, json={"channel": "webhook", "webhook_url": "https://example.com/h"})
@@ -57,7 +57,7 @@ def test_gate_block_triggers_wave5_alert(monkeypatch):
     class _Resp:
         status_code = 200
 
-    monkeypatch.setattr('app.wave5.alerts.requests.post', lambda *args, **kwargs: _Resp())
+    monkeypatch.setattr('app.wave5.alerts.http.post', lambda *args, **kwargs: _Resp())
     c = TestClient(app)
     r = c.post('/wave3.2/promotion/evaluate', headers={"X-API-Key": "viewer-token"}, json={"from": "qa", "to": "prod", "counts": {"fail": 1, "error": 0}})
     assert r.status_code == 200
@@ -74,8 +74,8 @@ def test_channels_send_whatsapp_and_signal(monkeypatch):
         def json(self):
             return {"ok": True}
 
-    monkeypatch.setattr('app.channels.whatsapp.requests.post', lambda *args, **kwargs: _Resp())
-    monkeypatch.setattr('app.channels.signal.requests.post', lambda *args, **kwargs: _Resp())
+    monkeypatch.setattr('app.channels.whatsapp.http.post', lambda *args, **kwargs: _Resp())
+    monkeypatch.setattr('app.channels.signal.http.post', lambda *args, **kwargs: _Resp())
 
     c = TestClient(app)
 
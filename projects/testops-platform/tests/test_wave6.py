@@ -52,7 +52,7 @@ def test_wave6_ha_dr_and_cost_governance(monkeypatch):
     class _Resp:
         status_code = 200
 
-    monkeypatch.setattr('app.wave5.alerts.requests.post', lambda *args, **kwargs: _Resp())
+    monkeypatch.setattr('app.wave5.alerts.http.post', lambda *args, **kwargs: _Resp())
 
     c = TestClient(app)
     viewer = {"X-API-Key": "viewer-token"}
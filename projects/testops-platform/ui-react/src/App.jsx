@@ -149,7 +149,7 @@ export default function App() {
     ws.onmessage = (evt) => {
       try {
         const d = JSON.parse(evt.data)
-        setLogs(d.events || [])
+        setLogs((prev) => (d.replay ? d.events || [] : [...prev, ...(d.events || [])]).slice(-50))
       } catch {}
     }
     return () => ws.close()